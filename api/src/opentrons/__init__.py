@@ -1,29 +1,12 @@
 import os
 import sys
 import json
+import threading
+from types import ModuleType
+from typing import Any
 HERE = os.path.abspath(os.path.dirname(__file__))
 from opentrons import config  # noqa(E402)
-from opentrons.data_storage import database_migration  # noqa(E402)
-
-
-if os.environ.get('OT_UPDATE_SERVER') != 'true'\
-   and not config.feature_flags.use_protocol_api_v2():
-    database_migration.check_version_and_perform_full_migration()
-else:
-    database_migration.check_version_and_perform_minimal_migrations()
-
-
-import opentrons.hardware_control.adapters as adapters  # noqa(E402)
-from .protocol_api.back_compat import (build_globals as bcbuild,  # noqa(E402)
-                                       set_globals,
-                                       reset as resetv2)
-from .protocol_api.contexts import ProtocolContext  # noqa(E402)
-from .legacy_api.api import (robot as robotv1,   # noqa(E402)
-                             reset as resetv1,
-                             instruments as instrumentsv1,
-                             containers as containersv1,
-                             labware as labwarev1,
-                             modules as modulesv1)
+from opentrons.config import feature_flags as ff  # noqa(E402)
 
 
 try:
@@ -40,16 +23,38 @@ if version < (3, 5):
             version[0], version[1]))
 
 
+# The global singletons, built by reset_globals when one is first used
+containers: Any
+instruments: Any
+labware: Any
+robot: Any
+reset: Any
+modules: Any
+hardware: Any
+
+
 def build_globals(version=None, loop=None):
+    # Migrates the labware database the globals load their labware from
+    from . import data_storage  # noqa(F401)
     if version is None:
         checked_version =\
-            2 if config.feature_flags.use_protocol_api_v2() else 1
+            2 if ff.use_protocol_api_v2() else 1
     else:
         checked_version = version
     if checked_version == 1:
+        from .legacy_api.api import (robot as robotv1,
+                                     reset as resetv1,
+                                     instruments as instrumentsv1,
+                                     containers as containersv1,
+                                     labware as labwarev1,
+                                     modules as modulesv1)
         return robotv1, resetv1, instrumentsv1, containersv1,\
             labwarev1, modulesv1, robotv1
     elif checked_version == 2:
+        import opentrons.hardware_control.adapters as adapters
+        from .protocol_api.back_compat import (build_globals as bcbuild,
+                                               set_globals,
+                                               reset as resetv2)
         hw = adapters.SingletonAdapter(loop)
         rob, instr, con, lw, mod = bcbuild(hw, loop)
         set_globals(rob, instr, lw, mod)
@@ -77,8 +82,28 @@ def reset_globals(version=None, loop=None):
         = build_globals(version, loop)
 
 
-robot, reset, instruments, containers, labware, modules, hardware\
-        = build_globals()
+_GLOBALS = ('containers', 'instruments', 'labware', 'robot', 'reset',
+            'modules', 'hardware')
+_globals_lock = threading.RLock()
+
+
+class _Package(ModuleType):
+    """ Builds the global singletons the first time one of them is used.
+
+    Building them loads the robot configuration, the labware database and
+    the legacy API, so importing the package alone does not.
+    """
+    def __getattr__(self, name):
+        if name not in _GLOBALS:
+            raise AttributeError(
+                'module {!r} has no attribute {!r}'.format(__name__, name))
+        with _globals_lock:
+            if name not in globals():
+                reset_globals()
+        return globals()[name]
+
+
+sys.modules[__name__].__class__ = _Package
 
 
 __all__ = ['containers', 'instruments', 'labware', 'robot', 'reset',
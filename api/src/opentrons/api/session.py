@@ -1,9 +1,10 @@
 import ast
 import asyncio
 from copy import copy
-from functools import reduce, wraps
+from functools import wraps
 import json
 import logging
+import threading
 from time import time
 from uuid import uuid4
 
@@ -17,8 +18,9 @@ from opentrons.protocols import execute_protocol
 from opentrons.config import feature_flags as ff
 from opentrons.protocol_api import (ProtocolContext,
                                     labware,
-                                    run_protocol)
-from opentrons.hardware_control import adapters, API
+                                    run_protocol,
+                                    simulation_pool)
+from opentrons.hardware_control import adapters
 from opentrons.types import Location, Point
 
 from .models import Container, Instrument, Module
@@ -26,6 +28,14 @@ from .models import Container, Instrument, Module
 log = logging.getLogger(__name__)
 
 VALID_STATES = {'loaded', 'running', 'finished', 'stopped', 'paused', 'error'}
+# Number of simulated commands to send in each streamed simulation update
+SIMULATION_CHUNK_SIZE = 100
+# Seconds to wait for a replaced protocol's simulation to stop
+SIMULATION_CANCEL_TIMEOUT = 10
+
+
+class SimulationCancelled(Exception):
+    pass
 
 
 def _motion_lock(func):
@@ -42,12 +52,48 @@ def _motion_lock(func):
     return decorated
 
 
+class _SimulationRecorder:
+    """ Builds the command tree of a simulation from the commands it
+    publishes, and finds the labware and instruments they use """
+    def __init__(self):
+        self._stack = []
+        self.builder = tree.TreeBuilder()
+        self.count = 0
+        # Ordered sets of the instruments, containers, modules and
+        # interactions used by the protocol
+        self.found = ({}, {}, {}, {})
+
+    def record(self, message):
+        """ Record a command message.
+
+        :returns: The tree node for a new command, or ``None`` for the end
+                  of a command
+        """
+        if message['$'] != 'before':
+            self._stack.pop()
+            return None
+        payload = message['payload']
+        command = {
+            'level': len(self._stack),
+            'description': payload.get('text', '').format(**payload),
+            'id': self.count}
+        self._stack.append(message)
+        for acc, items in zip(self.found, _get_labware(payload)):
+            acc.update((item, None) for item in items)
+        self.count += 1
+        self.builder.add(command)
+        return command
+
+
 class SessionManager(object):
     def __init__(self, hardware, loop=None, broker=None, lock=None):
         self._broker = broker or Broker()
         self._loop = loop or asyncio.get_event_loop()
         self.session = None
         self._session_lock = False
+        self._simulating_session = None
+        self._simulation_done = threading.Event()
+        self._simulation_done.set()
         self._hardware = hardware
         self._command_logger = logging.getLogger(
             'opentrons.server.command_logger')
@@ -59,34 +105,64 @@ class SessionManager(object):
                       adapters.SynchronousAdapter):
             self._hardware.join()
 
-    def create(self, name, text):
-        if self._session_lock:
+    def create(self, name, text, stream_simulation=False):
+        """
+        Create a session for a protocol and simulate it.
+
+        If another protocol is still being simulated, it is being replaced,
+        so its simulation is cancelled.
+
+        :param stream_simulation: Whether to publish the simulated commands
+                                  on :py:attr:`Session.SIMULATION_TOPIC` as
+                                  they are produced.
+        """
+        if self._session_lock and not self._cancel_simulation():
             raise Exception(
                 'Cannot create session while simulation in progress')
 
         self._session_lock = True
+        self._simulation_done.clear()
         try:
             session_short_id = hex(uuid4().fields[0])
             session_logger = self._command_logger.getChild(session_short_id)
             self._broker.set_logger(session_logger)
-            self.session = Session.build_and_prep(
+            session = Session(
                 name=name,
                 text=text,
                 hardware=self._hardware,
                 loop=self._loop,
                 broker=self._broker,
-                motion_lock=self._motion_lock)
+                motion_lock=self._motion_lock,
+                stream_simulation=stream_simulation)
+            self._simulating_session = session
+            session.prepare()
+            if self.session:
+                self.session.close()
+            self.session = session
         finally:
+            self._simulating_session = None
             self._session_lock = False
+            self._simulation_done.set()
 
         return self.session
 
+    def _cancel_simulation(self):
+        """ Cancel the simulation in progress and wait for it to stop.
+
+        :returns: Whether the simulation stopped in time
+        """
+        simulating = self._simulating_session
+        if simulating:
+            simulating.cancel_simulation()
+        return self._simulation_done.wait(SIMULATION_CANCEL_TIMEOUT)
+
     def clear(self):
         if self._session_lock:
             raise Exception(
                 'Cannot clear session while simulation in progress')
 
         if self.session:
+            self.session.close()
             self._hardware.reset()
         self.session = None
         self._broker.set_logger(self._command_logger)
@@ -97,14 +173,18 @@ class SessionManager(object):
 
 class Session(object):
     TOPIC = 'session'
+    SIMULATION_TOPIC = 'simulation'
 
     @classmethod
-    def build_and_prep(cls, name, text, hardware, loop, broker, motion_lock):
-        sess = cls(name, text, hardware, loop, broker, motion_lock)
+    def build_and_prep(cls, name, text, hardware, loop, broker, motion_lock,
+                       stream_simulation=False):
+        sess = cls(name, text, hardware, loop, broker, motion_lock,
+                   stream_simulation)
         sess.prepare()
         return sess
 
-    def __init__(self, name, text, hardware, loop, broker, motion_lock):
+    def __init__(self, name, text, hardware, loop, broker, motion_lock,
+                 stream_simulation=False):
         self._broker = broker
         self._default_logger = self._broker.logger
         self._sim_logger = self._broker.logger.getChild('sim')
@@ -114,8 +194,9 @@ class Session(object):
         self.protocol_text = text
         self._protocol = None
         self._hardware = hardware
-        self._simulating_ctx = ProtocolContext(
-            loop=self._loop, broker=self._broker)
+        # Checked out from the simulation pool when the protocol is
+        # simulated, and kept so that its labware can be calibrated
+        self._simulating_ctx = None
         self.state = None
         self.commands = []
         self.command_log = {}
@@ -134,6 +215,8 @@ class Session(object):
 
         self.startTime = None
         self._motion_lock = motion_lock
+        self._stream_simulation = stream_simulation
+        self._simulation_cancelled = False
 
     def prepare(self):
         self._hardware.discover_modules()
@@ -177,13 +260,49 @@ class Session(object):
         self.command_log.clear()
         self.errors.clear()
 
+    def close(self):
+        """ Give back the context the protocol was simulated with.
+
+        The instruments, labware and modules found by the simulation cannot
+        be calibrated afterwards.
+        """
+        if self._simulating_ctx:
+            simulation_pool.default_pool().checkin(self._simulating_ctx)
+            self._simulating_ctx = None
+
+    def cancel_simulation(self):
+        """ Stop a simulation in progress at its next command """
+        self._simulation_cancelled = True
+
+    def _publish_simulated(self, commands, count, done=False):
+        self._broker.publish(Session.SIMULATION_TOPIC, {
+            'topic': Session.SIMULATION_TOPIC,
+            'payload': {
+                'name': self.name,
+                'commands': commands,
+                'progress': count,
+                'done': done
+            }
+        })
+
+    def _check_simulation_cancelled(self):
+        if self._simulation_cancelled:
+            raise SimulationCancelled()
+
+    def _stream_simulated(self, chunk, command):
+        """ Add a simulated command to the chunk to publish, publishing the
+        chunk once it is full """
+        chunk.append(command)
+        if len(chunk) >= SIMULATION_CHUNK_SIZE:
+            self._publish_simulated(chunk[:], command['id'] + 1)
+            chunk.clear()
+
     @_motion_lock
     def _simulate(self):
         self._reset()
 
-        stack = []
-        res = []
-        commands = []
+        recorder = _SimulationRecorder()
+        chunk = []
 
         self._containers.clear()
         self._instruments.clear()
@@ -191,62 +310,16 @@ class Session(object):
         self._interactions.clear()
 
         def on_command(message):
-            payload = message['payload']
-            description = payload.get('text', '').format(
-                **payload
-            )
-
             if message['$'] == 'before':
-                level = len(stack)
-
-                stack.append(message)
-                commands.append(payload)
-
-                res.append(
-                    {
-                        'level': level,
-                        'description': description,
-                        'id': len(res)})
-            else:
-                stack.pop()
+                self._check_simulation_cancelled()
+            command = recorder.record(message)
+            if command and self._stream_simulation:
+                self._stream_simulated(chunk, command)
 
         unsubscribe = self._broker.subscribe(command_types.COMMAND, on_command)
 
         try:
-            # ensure actual pipettes are cached before driver is disconnected
-            if ff.use_protocol_api_v2():
-                self._hardware.cache_instruments()
-                instrs = {}
-                for mount, pip in self._hardware.attached_instruments.items():
-                    if pip:
-                        instrs[mount] = {'model': pip['model'],
-                                         'id': pip.get('pipette_id', '')}
-                sim = adapters.SynchronousAdapter.build(
-                    API.build_hardware_simulator,
-                    instrs,
-                    [mod.name()
-                     for mod in self._hardware.attached_modules.values()],
-                    strict_attached_instruments=False)
-                sim.home()
-                self._simulating_ctx = ProtocolContext(self._loop,
-                                                       sim,
-                                                       self._broker)
-                if self._is_json_protocol:
-                    run_protocol(protocol_json=self._protocol,
-                                 simulate=True,
-                                 context=self._simulating_ctx)
-                else:
-                    run_protocol(protocol_code=self._protocol,
-                                 simulate=True,
-                                 context=self._simulating_ctx)
-            else:
-                self._hardware.broker = self._broker
-                self._hardware.cache_instrument_models()
-                self._hardware.disconnect()
-                if self._is_json_protocol:
-                    execute_protocol(self._protocol)
-                else:
-                    exec(self._protocol, {})
+            self._run_simulation()
         finally:
             # physically attached pipettes are re-cached during robot.connect()
             # which is important, because during a simulation, the robot could
@@ -255,13 +328,11 @@ class Session(object):
                 self._hardware.connect()
             unsubscribe()
 
-            instruments, containers, modules, interactions = _accumulate(
-                [_get_labware(command) for command in commands])
-
-            self._containers.extend(_dedupe(containers))
-            self._instruments.extend(_dedupe(instruments))
-            self._modules.extend(_dedupe(modules))
-            self._interactions.extend(_dedupe(interactions))
+            instruments, containers, modules, interactions = recorder.found
+            self._containers.extend(containers)
+            self._instruments.extend(instruments)
+            self._modules.extend(modules)
+            self._interactions.extend(interactions)
 
             # Labware calibration happens after simulation and before run, so
             # we have to clear the tips if they are left on after simulation
@@ -270,10 +341,62 @@ class Session(object):
             if not ff.use_protocol_api_v2():
                 self._hardware.clear_tips()
 
-        return res
+        if self._stream_simulation:
+            self._publish_simulated(chunk, recorder.count, done=True)
+        return recorder.builder.tree
+
+    def _run_simulation(self):
+        if not ff.use_protocol_api_v2():
+            self._hardware.broker = self._broker
+            self._hardware.cache_instrument_models()
+            self._hardware.disconnect()
+            if self._is_json_protocol:
+                execute_protocol(self._protocol)
+            else:
+                exec(self._protocol, {})
+            return
+
+        # ensure actual pipettes are cached before driver is disconnected
+        self._hardware.cache_instruments()
+        instrs = {}
+        for mount, pip in self._hardware.attached_instruments.items():
+            if pip:
+                instrs[mount] = {'model': pip['model'],
+                                 'id': pip.get('pipette_id', '')}
+        self.close()
+        self._simulating_ctx = simulation_pool.default_pool().checkout(
+            loop=self._loop,
+            broker=self._broker,
+            attached_instruments=instrs,
+            attached_modules=[
+                mod.name() for mod
+                in self._hardware.attached_modules.values()],
+            strict_attached_instruments=False)
+        if self._is_json_protocol:
+            run_protocol(protocol_json=self._protocol,
+                         simulate=True,
+                         context=self._simulating_ctx)
+        else:
+            run_protocol(protocol_code=self._protocol,
+                         simulate=True,
+                         context=self._simulating_ctx)
 
     def refresh(self):
+        """
+        Simulate the protocol to find the commands it will run and the
+        instruments, labware and modules it uses.
+
+        If the session streams its simulation, the simulated commands are
+        published on :py:attr:`SIMULATION_TOPIC` in chunks as they are
+        produced, as dicts of 'level', 'description' and 'id' in the order of
+        a DFS traversal of the command tree, along with the number of
+        commands simulated so far.
+
+        :raises SimulationCancelled: If :py:meth:`cancel_simulation` was
+                                     called during the simulation
+        """
         self._reset()
+        self._simulation_cancelled = False
         self._is_json_protocol = self.name.endswith('.json')
 
         if self._is_json_protocol:
@@ -302,14 +425,15 @@ class Session(object):
 
         try:
             self._broker.set_logger(self._sim_logger)
-            commands = self._simulate()
+            self.commands = self._simulate()
         except Exception:
+            if self._simulation_cancelled:
+                raise SimulationCancelled(
+                    f'Simulation of {self.name} was cancelled')
             raise
         finally:
             self._broker.set_logger(self._default_logger)
 
-        self.commands = tree.from_list(commands)
-
         self.containers = self.get_containers()
         self.instruments = self.get_instruments()
         self.modules = self.get_modules()
@@ -529,22 +653,6 @@ def infer_version(metadata, parsed):
     return infer_version_from_imports(parsed)
 
 
-def _accumulate(iterable):
-    return reduce(
-        lambda x, y: tuple([x + y for x, y in zip(x, y)]),
-        iterable,
-        ([], [], [], []))
-
-
-def _dedupe(iterable):
-    acc = set()
-
-    for item in iterable:
-        if item not in acc:
-            acc.add(item)
-            yield item
-
-
 def now():
     return int(time() * 1000)
 
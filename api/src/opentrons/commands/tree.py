@@ -1,33 +1,38 @@
+class TreeBuilder:
+    """
+    Builds a command tree one command at a time, from commands given in the
+    order of a DFS traversal of the tree (the order they are published in).
+    """
+    def __init__(self):
+        self.tree = []
+        # The children lists that new commands may be added to, indexed by
+        # the level of the commands they hold
+        self._open = [self.tree]
+
+    def add(self, command):
+        """
+        Add a command of form {'level', 'description', 'id'} to the tree and
+        return its node.
+        """
+        level = min(command['level'], len(self._open) - 1)
+        node = {
+            'description': command['description'],
+            'children': [],
+            'id': command['id']
+        }
+        self._open[level].append(node)
+        del self._open[level + 1:]
+        self._open.append(node['children'])
+        return node
+
+
 def from_list(commands):
     """
     Given a list of tuples of form (depth, text)
     that represents a DFS traversal of a command tree,
     returns a dictionary representing command tree.
     """
-    def subtrees(commands, level):
-        if not commands:
-            return
-
-        acc = []
-        parent, *commands = commands
-
-        for command in commands:
-            if command['level'] > level:
-                acc.append(command)
-            else:
-                yield (parent, acc)
-                parent = command
-                acc.clear()
-        yield (parent, acc)
-
-    def walk(commands, level=0):
-        return [
-            {
-                'description': key['description'],
-                'children': walk(subtree, level + 1),
-                'id': key['id']
-            }
-            for key, subtree in subtrees(commands, level)
-        ]
-
-    return walk(commands)
+    builder = TreeBuilder()
+    for command in commands:
+        builder.add(command)
+    return builder.tree
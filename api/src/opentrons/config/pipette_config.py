@@ -1,10 +1,14 @@
+import bisect
 import copy
+import itertools
 import logging
 import json
 from collections import namedtuple
 from typing import Any, Dict, List, Union, Tuple, Sequence, Optional
 import pkgutil
 
+import numpy as np  # type: ignore
+
 from opentrons.config import feature_flags as ff, CONFIG
 
 
@@ -85,12 +89,13 @@ def name_config() -> Dict[str, Any]:
         or '{}')
 
 
-config_models = list(model_config()['config'].keys())
-configs = model_config()['config']
+_model_config = model_config()
+config_models = list(_model_config['config'].keys())
+configs = _model_config['config']
 #: A list of pipette model names for which we have config entries
-MUTABLE_CONFIGS = model_config()['mutableConfigs']
+MUTABLE_CONFIGS = _model_config['mutableConfigs']
 #: A list of mutable configs for pipettes
-VALID_QUIRKS = model_config()['validQuirks']
+VALID_QUIRKS = _model_config['validQuirks']
 #: A list of valid quirks for pipettes
 
 
@@ -206,6 +211,76 @@ def load(pipette_model: str, pipette_id: str = None) -> pipette_config:
     return res
 
 
+class VolumeConversion:
+    """
+    A piecewise ul/mm function, compiled from the sequence stored in a
+    pipette config so that segments can be looked up by bisection.
+
+    Each sub-list of the sequence contains:
+
+      - the max volume for the piece of the function (minimum implied from the
+        max of the previous item or 0
+      - the slope of the segment
+      - the y-intercept of the segment
+
+    The segment used for a volume is the first one whose max volume is at
+    least the volume, as in :py:func:`piecewise_volume_conversion`.
+    """
+    def __init__(self, sequence: Sequence[Sequence[float]]) -> None:
+        # The first segment that can hold a volume is also the first one
+        # whose running max of the max volumes can hold it, and the running
+        # max is sorted even if the sequence is not
+        self._bounds = list(itertools.accumulate(
+            (seg[0] for seg in sequence), max))
+        self._slopes = [seg[1] for seg in sequence]
+        self._intercepts = [seg[2] for seg in sequence]
+
+    def __call__(self, ul: float) -> float:
+        """
+        :return: the ul/mm value for the specified volume
+        :raises IndexError: if the volume is above every segment
+        """
+        idx = bisect.bisect_left(self._bounds, ul)
+        return self._slopes[idx]*ul + self._intercepts[idx]
+
+    def many(self, volumes: Sequence[float]) -> np.ndarray:
+        """
+        Convert many volumes at once.
+
+        :return: an array of the ul/mm value for each of the volumes
+        :raises IndexError: if any volume is above every segment
+        """
+        volumes = np.asarray(volumes, dtype=float)
+        idx = np.searchsorted(self._bounds, volumes, side='left')
+        if idx.size and idx.max() >= len(self._bounds):
+            raise IndexError('Volume is out of range of the ul/mm function')
+        return np.asarray(self._slopes)[idx] * volumes\
+            + np.asarray(self._intercepts)[idx]
+
+
+# Compiled ul/mm functions, keyed by the segments of the sequence they came
+# from. Sequences only have a handful of segments, so building the key is
+# cheap, and a sequence edited in place gets a new key.
+_volume_conversions: Dict[
+    Tuple[Tuple[float, ...], ...], VolumeConversion] = {}
+_VOLUME_CONVERSION_CACHE_SIZE = 32
+
+
+def volume_conversion(sequence: List[List[float]]) -> VolumeConversion:
+    """
+    Get the compiled ul/mm function for a sequence from a pipette config,
+    compiling it if it has not been used before.
+    """
+    key = tuple(tuple(seg) for seg in sequence)
+    conversion = _volume_conversions.get(key)
+    if conversion is None:
+        if len(_volume_conversions) >= _VOLUME_CONVERSION_CACHE_SIZE:
+            _volume_conversions.clear()
+        conversion = VolumeConversion(key)
+        _volume_conversions[key] = conversion
+    return conversion
+
+
 def piecewise_volume_conversion(
         ul: float, sequence: List[List[float]]) -> float:
     """
@@ -220,11 +295,7 @@ def piecewise_volume_conversion(
 
     :return: the ul/mm value for the specified volume
     """
-    # pick the first item from the seq for which the target is less than
-    # the bracketing element
-    i = list(filter(lambda x: ul <= x[0], sequence))[0]
-    # use that element to calculate the movement distance in mm
-    return i[1]*ul + i[2]
+    return volume_conversion(sequence)(ul)
 
 
 def save_overrides(
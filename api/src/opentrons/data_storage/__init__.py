@@ -0,0 +1,15 @@
+""" The labware database used by the legacy API.
+
+The database is migrated the first time this package is imported.
+"""
+import os
+
+from opentrons.config import feature_flags as ff
+from . import database_migration
+
+
+if os.environ.get('OT_UPDATE_SERVER') != 'true'\
+   and not ff.use_protocol_api_v2():
+    database_migration.check_version_and_perform_full_migration()
+else:
+    database_migration.check_version_and_perform_minimal_migrations()
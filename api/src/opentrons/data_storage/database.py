@@ -1,7 +1,9 @@
 # pylama:ignore=E252
+import contextlib
 import sqlite3
+import threading
 # import warnings
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 from opentrons.legacy_api.containers.placeable\
     import Container, Well, Module, Placeable
 from opentrons.data_storage import database_queries as db_queries
@@ -16,9 +18,48 @@ log = logging.getLogger(__file__)
 database_path = str(CONFIG['labware_database_file'])
 log.debug("Database path: {}".format(database_path))
 
+# The connection to the database at database_path, opened on first use and
+# shared by every thread. Hold _lock() while using it.
+_connection: Optional[sqlite3.Connection] = None
+_connection_lock = threading.RLock()
+# The process that opened _connection. A forked child (like a simulate_batch
+# worker) must not share its parent's connection, so it opens its own.
+_connection_pid: Optional[int] = None
+# The rows of containers loaded from the database, by name. Containers are
+# built from these rather than cached themselves, since callers change them.
+_container_rows: Dict[str, Tuple[tuple, List[tuple]]] = {}
+
 # ======================== Private Functions ======================== #
 
 
+def _lock() -> threading.RLock:
+    """ The lock for the connection, after dropping any inherited one """
+    global _connection, _connection_lock, _connection_pid
+    if _connection_pid is not None and _connection_pid != os.getpid():
+        # Not closed, since the parent may still be using it; the lock may
+        # have been held by a thread that does not exist in this process
+        _connection = None
+        _connection_pid = None
+        _connection_lock = threading.RLock()
+        _container_rows.clear()
+    return _connection_lock
+
+
+@contextlib.contextmanager
+def _db() -> Iterator[sqlite3.Connection]:
+    global _connection, _connection_pid
+    with _lock():
+        if _connection is None:
+            _connection = sqlite3.connect(
+                database_path, check_same_thread=False)
+            _connection_pid = os.getpid()
+            # With a write-ahead log, each transaction appends to one file
+            # and syncs once, rather than writing and deleting a journal
+            _connection.execute('PRAGMA journal_mode=WAL')
+            _connection.execute('PRAGMA synchronous=NORMAL')
+        yield _connection
+
+
 def _parse_container_obj(container: Container):
     # Note: in the new labware system, container coordinates are always (0,0,0)
     return dict(zip('xyz', container._coordinates))
@@ -44,29 +85,44 @@ def _parse_well_obj(well: Well):
 
 
 def _create_container_obj_in_db(db, container: Container, container_name: str):
-    db_queries.create_container(
-        db, container_name, **_parse_container_obj(container)
-    )
+    wells = []
     for well in iter(container):
-        _create_well_obj_in_db(db, container_name, well)
+        well_data = _parse_well_obj(well)
+        wells.append(tuple(
+            well_data[key] for key in (
+                'location', 'x', 'y', 'z', 'depth', 'volume', 'diameter',
+                'length', 'width')))
+    db_queries.create_container_with_wells(
+        db, container_name, wells=wells, **_parse_container_obj(container)
+    )
 
 
-def _load_container_object_from_db(db, container_name: str):
-    db_data = db_queries.get_container_by_name(db, container_name)
-    if not db_data:
+def _load_container_rows_from_db(db, container_name: str):
+    rows = db_queries.get_container_with_wells(db, container_name)
+    if not rows:
         raise ValueError(
             "No container with name {} found in Containers database"
             .format(container_name)
         )
 
-    container_type, *rel_coords = db_data
-    wells = db_queries.get_wells_by_container_name(db, container_name)
+    container_data = rows[0][:4]
+    # Without wells, the join gives one row with no well columns set
+    wells = [row[4:] for row in rows if row[4] is not None]
     if not wells:
         raise ResourceWarning(
             "No wells for container {} found in ContainerWells database"
             .format(container_name)
         )
+    return container_data, wells
 
+
+def _load_container_object_from_db(db, container_name: str):
+    return _container_obj_from_rows(
+        db, container_name, *_load_container_rows_from_db(db, container_name))
+
+
+def _container_obj_from_rows(db, container_name: str, container_data, wells):
+    container_type, *rel_coords = container_data
     if container_name in SUPPORTED_MODULES:
         container: Placeable = Module()
     else:
@@ -92,15 +148,7 @@ def _update_container_object_in_db(db, container: Container):
 
 
 def _delete_container_object_in_db(db, container_name: str):
-    db_queries.delete_wells_by_container_name(db, container_name)
-    db_queries.delete_container(db, container_name)
-
-
-def _create_well_obj_in_db(db, container_name: str, well: Well):
-    well_data = _parse_well_obj(well)
-    db_queries.insert_well_into_db(
-        db_conn=db, container_name=container_name, **well_data
-    )
+    db_queries.delete_container_with_wells(db, container_name)
 
 
 def _load_well_object_from_db(db, well_data):
@@ -147,69 +195,94 @@ def _get_db_version(db):
 
 # ======================== Public Functions ======================== #
 def save_new_container(container: Container, container_name: str) -> bool:
-    db_conn = sqlite3.connect(database_path)
-    _create_container_obj_in_db(db_conn, container, container_name)
+    with _db() as db_conn:
+        _container_rows.pop(container_name, None)
+        _create_container_obj_in_db(db_conn, container, container_name)
     res = True  # old create fn does not return anything
     return res
 
 
 def load_container(container_name: str) -> Container:
-    db_conn = sqlite3.connect(database_path)
-    res = _load_container_object_from_db(db_conn, container_name)
+    with _db() as db_conn:
+        rows = _container_rows.get(container_name)
+        if rows is None:
+            rows = _load_container_rows_from_db(db_conn, container_name)
+            _container_rows[container_name] = rows
+        res = _container_obj_from_rows(db_conn, container_name, *rows)
     return res
 
 
 def overwrite_container(container: Container) -> bool:
     log.debug("Overwriting container definition: {}".format(
         container.get_type()))
-    db_conn = sqlite3.connect(database_path)
-    _update_container_object_in_db(db_conn, container)
+    with _db() as db_conn:
+        _container_rows.pop(container.get_type(), None)
+        _update_container_object_in_db(db_conn, container)
     res = True  # old overwrite fn does not return anything
     return res
 
 
 def delete_container(container_name) -> bool:
-    db_conn = sqlite3.connect(database_path)
-    _delete_container_object_in_db(db_conn, container_name)
+    with _db() as db_conn:
+        _container_rows.pop(container_name, None)
+        _delete_container_object_in_db(db_conn, container_name)
     res = True  # old delete fn does not return anything
     return res
 
 
 def list_all_containers() -> List[str]:
-    db_conn = sqlite3.connect(database_path)
-    res = _list_all_containers_by_name(db_conn)
+    with _db() as db_conn:
+        res = _list_all_containers_by_name(db_conn)
     return res
 
 
 def load_module(module_name: str) -> Container:
-    db_conn = sqlite3.connect(database_path)
-    res = _load_module_dict_from_db(db_conn, module_name)
+    with _db() as db_conn:
+        res = _load_module_dict_from_db(db_conn, module_name)
     return res
 
 
+def close():
+    """ Close the connection to the database.
+
+    It is opened again the next time the database is used.
+    """
+    global _connection, _connection_pid
+    with _lock():
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+            _connection_pid = None
+        _container_rows.clear()
+
+
 def change_database(db_path: str):
     global database_path
-    database_path = db_path
+    with _lock():
+        close()
+        database_path = db_path
 
 
 def get_version():
     '''Get the Opentrons-defined database version'''
-    db_conn = sqlite3.connect(database_path)
-    return _get_db_version(db_conn)
+    with _db() as db_conn:
+        return _get_db_version(db_conn)
 
 
 def set_version(version):
-    db_conn = sqlite3.connect(database_path)
-    db_queries.set_user_version(db_conn, version)
+    with _db() as db_conn:
+        db_queries.set_user_version(db_conn, version)
 
 
 def reset():
     """ Unmount and remove the sqlite database (used in robot reset) """
-    if os.path.exists(database_path):
-        os.remove(database_path)
-    # Not an os.path.join because it is a suffix to the full filename
-    journal_path = database_path + '-journal'
-    if os.path.exists(journal_path):
-        os.remove(journal_path)
+    with _lock():
+        close()
+        if os.path.exists(database_path):
+            os.remove(database_path)
+        # Not os.path.joins because they are suffixes to the full filename
+        for suffix in ('-journal', '-wal', '-shm'):
+            if os.path.exists(database_path + suffix):
+                os.remove(database_path + suffix)
 
 # ======================== END Public Functions ======================== #
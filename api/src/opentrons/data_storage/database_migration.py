@@ -7,7 +7,8 @@ from opentrons.data_storage.old_container_loading import \
     get_persisted_container
 from opentrons.config import CONFIG
 from opentrons.data_storage.schema_changes import \
-    create_table_ContainerWells, create_table_Containers
+    create_table_ContainerWells, create_table_Containers, \
+    create_index_ContainerWells_container_name
 from opentrons.util.vector import Vector
 
 # TODO (SF 7/11/2019): Once we're off balena remove all these prints
@@ -129,6 +130,12 @@ def _do_schema_changes():
                 "Creation of containers failed, robot may have been "
                 "interrupted during last boot")
         database.set_version(1)
+        db_version = 1
+    if db_version == 1:
+        log.info("indexing container wells")
+        execute_schema_change(
+            conn, create_index_ContainerWells_container_name)
+        database.set_version(2)
     return conn
 
 
@@ -33,6 +33,23 @@ def create_container(db_conn, container_name, x, y, z):
         )
 
 
+def create_container_with_wells(db_conn, container_name, x, y, z, wells):
+    """ Insert a container and its wells in one transaction.
+
+    ``wells`` is an iterable of ContainerWells rows without the container
+    name: (location, x, y, z, depth, volume, diameter, length, width)
+    """
+    with db_conn:
+        db_conn.execute(
+            'INSERT INTO Containers VALUES (?, ?, ?, ?)',
+            (container_name, x, y, z,)
+        )
+        db_conn.executemany(
+            'INSERT INTO ContainerWells VALUES (?,?,?,?,?,?,?,?,?,?)',
+            ((container_name, *well) for well in wells)
+        )
+
+
 def get_container_by_name(db_conn, container_name):
     with db_conn:
         cursor = db_conn.cursor()
@@ -65,6 +82,18 @@ def delete_container(db_conn, container_name):
         )
 
 
+def delete_container_with_wells(db_conn, container_name):
+    with db_conn:
+        db_conn.execute(
+            'DELETE FROM ContainerWells WHERE container_name=?',
+            (container_name,)
+        )
+        db_conn.execute(
+            'DELETE FROM Containers WHERE name=?',
+            (container_name,)
+        )
+
+
 # ------------ END Container Functions -----------#
 
 
@@ -98,6 +127,27 @@ def get_wells_by_container_name(db_conn, container_name):
         return cursor.fetchall()
 
 
+def get_container_with_wells(db_conn, container_name):
+    """ The container row followed by each of its well rows.
+
+    Each returned row is a Containers row and a ContainerWells row; if the
+    container has no wells there is one row whose well columns are all None.
+    """
+    with db_conn:
+        cursor = db_conn.cursor()
+        cursor.execute(
+            '''
+            SELECT * from Containers
+            LEFT JOIN ContainerWells
+            ON ContainerWells.container_name = Containers.name
+            WHERE Containers.name=?
+            ORDER BY ContainerWells.rowid
+            ''',
+            (container_name,)
+        )
+        return cursor.fetchall()
+
+
 def delete_wells_by_container_name(db_conn, container_name):
     with db_conn:
         db_conn.execute(
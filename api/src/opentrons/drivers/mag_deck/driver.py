@@ -6,6 +6,7 @@ from typing import Optional
 from serial.serialutil import SerialException  # type: ignore
 
 from opentrons.drivers import serial_communication
+from opentrons.drivers.serial_transport import SerialTransport
 from opentrons.drivers.serial_communication import SerialNoResponse
 
 '''
@@ -152,6 +153,7 @@ class MagDeck:
         self.run_flag.set()
 
         self._connection = None
+        self._transport = SerialTransport(f'magdeck {id(self)}')
         self._config = config
 
         self._plate_height = None
@@ -178,6 +180,7 @@ class MagDeck:
         if self.is_connected():
             self._connection.close()
         self._connection = None
+        self._transport.close()
 
     def is_connected(self) -> bool:
         # Does not detect if the module was physically plugged out
@@ -289,7 +292,7 @@ class MagDeck:
 
     def _recursive_write_and_return(self, cmd, timeout, retries):
         try:
-            return serial_communication.write_and_return(
+            return self._transport.write_and_return(
                 cmd,
                 MAG_DECK_ACK,
                 self._connection,
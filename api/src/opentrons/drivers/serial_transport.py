@@ -0,0 +1,131 @@
+""" Serial commands for one device, sent in order from a worker thread.
+
+Reads and writes with pyserial block until the device answers or the read
+times out. Each driver sends its commands through a :py:class:`SerialTransport`
+that runs them from a worker thread for that device, in the order they were
+submitted. Threads wait for the result as before; coroutines can await it
+without blocking their event loop, and can time out or cancel commands that
+have not been sent yet.
+"""
+import asyncio
+import concurrent.futures
+import functools
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+from . import serial_communication
+
+
+class SerialTransport:
+    def __init__(self, name: str) -> None:
+        """
+        :param name: The device name, used to name the worker thread
+        """
+        self._name = name
+        self._lock = threading.Lock()
+        self._jobs: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """ Stop the worker thread once the commands already queued are done.
+
+        The worker is started again by the next command.
+        """
+        with self._lock:
+            jobs, self._jobs = self._jobs, None
+            self._worker = None
+        if jobs:
+            jobs.put(None)
+
+    @property
+    def in_worker(self) -> bool:
+        """ Whether the caller is running in this transport's worker """
+        return threading.current_thread() is self._worker
+
+    def submit(self,
+               func: Callable[..., Any],
+               *args, **kwargs) -> concurrent.futures.Future:
+        """ Queue a call to ``func`` in the worker thread.
+
+        :returns: A future for the result. Cancelling it before the call
+                  starts removes the call from the queue.
+        """
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        with self._lock:
+            if not self._jobs:
+                self._jobs = queue.Queue()
+                self._worker = threading.Thread(
+                    target=self._work, args=(self._jobs,),
+                    name=f'Serial transport for {self._name}', daemon=True)
+                self._worker.start()
+            self._jobs.put((fut, func, args, kwargs))
+        return fut
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """ Call ``func`` in the worker thread and wait for the result.
+
+        Calls made from the worker thread (for instance, by a function
+        already running there) run immediately.
+        """
+        if self.in_worker:
+            return func(*args, **kwargs)
+        return self.submit(func, *args, **kwargs).result()
+
+    async def call_async(self,
+                         func: Callable[..., Any],
+                         *args,
+                         timeout: float = None,
+                         **kwargs) -> Any:
+        """ Call ``func`` in the worker thread without blocking the loop.
+
+        :param timeout: Seconds to wait for the result before raising
+                        :py:class:`asyncio.TimeoutError`. A call that has
+                        not started by then is not made; one that has
+                        started keeps running, since a serial exchange
+                        cannot be interrupted part way.
+        """
+        fut = asyncio.wrap_future(self.submit(func, *args, **kwargs))
+        return await asyncio.wait_for(fut, timeout)
+
+    def write_and_return(self, *args, **kwargs) -> str:
+        """ :py:func:`.serial_communication.write_and_return`, sent from the
+        worker thread """
+        return self.call(serial_communication.write_and_return,
+                         *args, **kwargs)
+
+    async def write_and_return_async(self, *args,
+                                     timeout: float = None,
+                                     **kwargs) -> str:
+        """ :py:meth:`write_and_return` for coroutines.
+
+        ``timeout`` is the serial timeout, as for
+        :py:func:`.serial_communication.write_and_return`; the coroutine
+        also stops waiting (with :py:class:`asyncio.TimeoutError`) a second
+        after it would have expired.
+        """
+        if timeout is None:
+            timeout = serial_communication.DEFAULT_WRITE_TIMEOUT
+        return await self.call_async(
+            functools.partial(serial_communication.write_and_return,
+                              *args, timeout=timeout, **kwargs),
+            timeout=timeout + 1)
+
+    @staticmethod
+    def _work(jobs: queue.Queue):
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            fut, func, args, kwargs = job
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                res = func(*args, **kwargs)
+            except BaseException as e:
+                fut.set_exception(e)
+            else:
+                fut.set_result(res)
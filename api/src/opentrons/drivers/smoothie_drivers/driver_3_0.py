@@ -3,13 +3,16 @@ from os import environ
 import logging
 from time import sleep
 from threading import Event, RLock
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from numpy import isclose  # type: ignore
 from serial.serialutil import SerialException  # type: ignore
 
 from opentrons.drivers import serial_communication
+from opentrons.drivers.serial_transport import SerialTransport
 from opentrons.drivers.rpi_drivers import gpio
+from opentrons.drivers.smoothie_drivers.kinematics import \
+    estimate_move_duration
 from opentrons.system import smoothie_update
 '''
 - Driver is responsible for providing an interface for motion control
@@ -64,11 +67,22 @@ SEC_PER_MIN = 60
 
 DEFAULT_SMOOTHIE_TIMEOUT = 1
 DEFAULT_MOVEMENT_TIMEOUT = 30
+# A move times out once it has taken this many times longer than its
+# estimated duration (but never sooner than DEFAULT_MOVEMENT_TIMEOUT)
+MOVEMENT_TIMEOUT_FACTOR = 2
+# The time to wait for any other command to complete, since homes, probes and
+# dwells are not estimated
+DEFAULT_WAIT_TIMEOUT = 12000
 SMOOTHIE_BOOT_TIMEOUT = 3
 DEFAULT_STABILIZE_DELAY = 0.1
 
 DEFAULT_COMMAND_RETRIES = 3
 
+# Maximum number of moves that may be queued in Smoothieware's planner
+# (acknowledged but not yet known to be complete) in streaming mode before
+# the driver forces a synchronization with M400
+DEFAULT_STREAMING_WINDOW = 8
+
 GCODES = {'HOME': 'G28.2',
           'MOVE': 'G0',
           'DWELL': 'G4',
@@ -288,6 +302,7 @@ class SmoothieDriver_3_0_0:
 
         self.simulating = True
         self._connection = None
+        self._transport = SerialTransport('smoothie')
         self._config = config
 
         # Current settings:
@@ -356,10 +371,87 @@ class SmoothieDriver_3_0_0:
             self._serial_lock = DummyLock()
         self._is_hard_halting = Event()
 
+        # Streaming mode: moves are not followed by M400, so they queue in
+        # Smoothieware's planner. Commands that have been acknowledged but
+        # not yet synchronized are tracked here for error recovery.
+        self._streaming = False
+        self._streaming_window = DEFAULT_STREAMING_WINDOW
+        self._streamed_commands: List[str] = []
+        self._last_current_command: Optional[str] = None
+        self._streamed_timeout = 0.0
+
+        # Running total of the estimated time spent executing motion, which
+        # is also tracked while simulating
+        self._estimated_motion_time = 0.0
+
     @property
     def homed_position(self):
         return self._homed_position.copy()
 
+    @property
+    def estimated_motion_time(self) -> float:
+        '''
+        Total estimated time (in seconds) of every move and home this driver
+        has executed or simulated
+        '''
+        return self._estimated_motion_time
+
+    def estimate_move_duration(self, target: Dict[str, float]) -> float:
+        '''
+        Estimate how long (in seconds) a move from the current position to
+        `target` will take with the current speed, max speed and
+        acceleration settings
+        '''
+        return estimate_move_duration(
+            self._position, target, self._combined_speed,
+            self._max_speed_settings, self._acceleration)
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming
+
+    @property
+    def streamed_commands(self) -> List[str]:
+        '''
+        Commands acknowledged by Smoothieware in streaming mode that have not
+        yet been confirmed complete by an M400 synchronization
+        '''
+        return self._streamed_commands.copy()
+
+    def set_streaming(self, enabled: bool, window: int = None):
+        '''
+        Enable or disable streaming of moves to Smoothieware.
+
+        When streaming, moves of the gantry are sent without a trailing M400,
+        so that up to `window` of them can sit in Smoothieware's planner and
+        be blended together. Any other command (current changes, plunger
+        moves, homing, probing, position reads, dwells) is a sync point: the
+        queued moves are waited for with M400 before it is sent.
+
+        enabled: boolean
+            Whether moves should be streamed
+        window: int
+            Maximum number of moves to queue before forcing a sync point
+        '''
+        if window is not None:
+            if window < 1:
+                raise ValueError(
+                    'Streaming window must be at least 1, got {}'.format(
+                        window))
+            self._streaming_window = window
+        if not enabled:
+            self.wait_for_moves()
+        self._streaming = enabled
+        log.debug("set_streaming: {} (window {})".format(
+            enabled, self._streaming_window))
+
+    def wait_for_moves(self):
+        '''
+        Block until every streamed move has physically completed
+        '''
+        if self._streamed_commands:
+            self._send_command(GCODES['WAIT'])
+
     def _update_position(self, target):
         self._position.update({
             axis: value
@@ -522,6 +614,7 @@ class SmoothieDriver_3_0_0:
         if self.is_connected():
             self._connection.close()
         self._connection = None
+        self._transport.close()
         self.simulating = True
 
     def is_connected(self):
@@ -552,6 +645,15 @@ class SmoothieDriver_3_0_0:
             return None
         return self._connection.port
 
+    @property
+    def transport(self) -> SerialTransport:
+        """ The transport that sends this driver's serial commands in order.
+
+        Blocking driver methods can be called with its
+        :py:meth:`.SerialTransport.call_async` to keep them off an event loop.
+        """
+        return self._transport
+
     def get_fw_version(self):
         '''
         Queries Smoothieware for it's build version, and returns
@@ -800,7 +902,8 @@ class SmoothieDriver_3_0_0:
         this method to set the axis-current state on the actual Smoothie
         motor-driver.
         '''
-        self._send_command(self._generate_current_command())
+        self._last_current_command = self._generate_current_command()
+        self._send_command(self._last_current_command)
 
     def _generate_current_command(self):
         '''
@@ -898,13 +1001,18 @@ class SmoothieDriver_3_0_0:
         self._send_command(GCODES['RESET_FROM_ERROR'])
         self.update_homed_flags()
 
-    # Potential place for command optimization (buffering, flushing, etc)
-    def _send_command(self, command, timeout=DEFAULT_SMOOTHIE_TIMEOUT):
+    def _send_command(self,
+                      command,
+                      timeout=DEFAULT_SMOOTHIE_TIMEOUT,
+                      stream=False,
+                      wait_timeout=DEFAULT_WAIT_TIMEOUT):
         """
         Submit a GCODE command to the robot, followed by M400 to block until
-        done. This method also ensures that any command on the B or C axis
-        (the axis for plunger control) do current ramp-up and ramp-down, so
-        that plunger motors rest at a low current to prevent burn-out.
+        done. If `stream` is set, the M400 is skipped and the command is left
+        queued in Smoothieware's planner until the next sync point. This
+        method also ensures that any command on the B or C axis (the axis for
+        plunger control) do current ramp-up and ramp-down, so that plunger
+        motors rest at a low current to prevent burn-out.
 
         In the case of a limit-switch alarm during any command other than home,
         the robot should home the axis from the alarm and then raise a
@@ -918,13 +1026,23 @@ class SmoothieDriver_3_0_0:
         :param command: the GCODE to submit to the robot
         :param timeout: the time to wait before returning (indefinite wait if
             this is set to none
+        :param stream: whether the command may be queued without waiting for
+            it to complete
+        :param wait_timeout: the time to wait for the command to complete,
+            for moves whose duration was estimated
         """
         if self.simulating:
             return
         try:
             with self._serial_lock:
-                return self._send_command_unsynchronized(command, timeout)
+                return self._send_command_unsynchronized(
+                    command, timeout, stream, wait_timeout)
         except SmoothieError as se:
+            # Any streamed moves were lost when smoothie errored, so they must
+            # not be waited for while recovering
+            in_flight = self._streamed_commands
+            self._streamed_commands = []
+            self._streamed_timeout = 0.0
             # XXX: This is a reentrancy error because another command could
             # swoop in here. We're already resetting though and errors (should
             # be) rare so it's probably fine, but the actual solution to this
@@ -933,7 +1051,11 @@ class SmoothieDriver_3_0_0:
             error_axis = se.ret_code.strip()[-1]
             log.warning(
                     f"alarm/error: command={command}, resp={se.ret_code}")
-            if GCODES['MOVE'] in command or GCODES['PROBE'] in command:
+            if in_flight:
+                log.warning(
+                    f"alarm/error with streamed commands pending: {in_flight}")
+            if GCODES['MOVE'] in command or GCODES['PROBE'] in command\
+                    or in_flight:
                 if error_axis not in 'XYZABC':
                     error_axis = AXES
                 log.info("Homing after alarm/error")
@@ -942,20 +1064,48 @@ class SmoothieDriver_3_0_0:
 
     def _send_command_unsynchronized(self,
                                      command,
-                                     timeout=DEFAULT_SMOOTHIE_TIMEOUT):
+                                     timeout=DEFAULT_SMOOTHIE_TIMEOUT,
+                                     stream=False,
+                                     wait_timeout=DEFAULT_WAIT_TIMEOUT):
+        if command == GCODES['WAIT']:
+            self._wait_for_streamed_commands()
+            return ''
+        if not stream and self._streamed_commands:
+            # sync point: everything already queued must finish before a
+            # command that is not itself a streamed move is executed
+            self._wait_for_streamed_commands()
         cmd_ret = self._write_with_retries(
             command + SMOOTHIE_COMMAND_TERMINATOR,
             5.0, DEFAULT_COMMAND_RETRIES)
         cmd_ret = self._remove_unwanted_characters(command, cmd_ret)
         self._handle_return(cmd_ret)
-        wait_ret = serial_communication.write_and_return(
+        if stream:
+            self._streamed_commands.append(command)
+            self._streamed_timeout += wait_timeout
+            if len(self._streamed_commands) >= self._streaming_window:
+                self._wait_for_streamed_commands()
+        else:
+            self._wait_for_streamed_commands(wait_timeout)
+        return cmd_ret.strip()
+
+    def _wait_for_streamed_commands(self, timeout=0.0):
+        '''
+        Send M400 and wait for every queued command to complete. The wait
+        times out after the sum of the timeouts of any streamed commands,
+        plus `timeout` for a command sent synchronously; if that is nothing,
+        after DEFAULT_WAIT_TIMEOUT.
+        '''
+        timeout += self._streamed_timeout
+        wait_ret = self._transport.write_and_return(
             GCODES['WAIT'] + SMOOTHIE_COMMAND_TERMINATOR,
-            SMOOTHIE_ACK, self._connection, timeout=12000,
+            SMOOTHIE_ACK, self._connection,
+            timeout=timeout or DEFAULT_WAIT_TIMEOUT,
             tag='smoothie')
         wait_ret = self._remove_unwanted_characters(
             GCODES['WAIT'], wait_ret)
         self._handle_return(wait_ret)
-        return cmd_ret.strip()
+        self._streamed_commands = []
+        self._streamed_timeout = 0.0
 
     def _handle_return(self, ret_code: str):
         """ Check the return string from smoothie for an error condition.
@@ -1007,7 +1157,7 @@ class SmoothieDriver_3_0_0:
     def _write_with_retries(self, cmd: str, timeout: float, retries: int):
         for attempt in range(retries):
             try:
-                ret = serial_communication.write_and_return(
+                ret = self._transport.write_and_return(
                     cmd,
                     SMOOTHIE_ACK,
                     self._connection,
@@ -1233,6 +1383,9 @@ class SmoothieDriver_3_0_0:
             1) Smoothieware boots or resets, 2) if a HALT gcode or signal
             is sent, or 3) a homing/limitswitch error occured.
         '''
+        if not self.run_flag.is_set():
+            # pausing is a sync point for any streamed moves
+            self.wait_for_moves()
         self.run_flag.wait()
 
         def valid_movement(coords, axis):
@@ -1270,31 +1423,65 @@ class SmoothieDriver_3_0_0:
 
             # include the current-setting gcodes within the moving gcode string
             # to reduce latency, since we're setting current so much
-            command = self._generate_current_command()
+            current_command = self._generate_current_command()
+            command = current_command
+            # current changes take effect as soon as they are received rather
+            # than when queued moves finish, so they are sync points, as are
+            # plunger moves (aspirate, dispense, tip handling)
+            current_changed = current_command != self._last_current_command
+            self._last_current_command = current_command
+            plunger_axis_moved = ''.join(set('BC') & set(target.keys()))
 
             if backlash_coords != target_coords:
                 command += ' ' + GCODES['MOVE'] + ''.join(backlash_coords)
             command += ' ' + GCODES['MOVE'] + ''.join(target_coords)
 
+            duration = self._estimate_backlash_move_duration(
+                backlash_target, target)
+
             try:
                 for axis in target.keys():
                     self.engaged_axes[axis] = True
                 if home_flagged_axes:
                     self.home_flagged_axes(''.join(list(target.keys())))
-                log.debug("move: {}".format(command))
-                # TODO (andy) a movement's timeout should be calculated by
-                # how long the movement is expected to take. A default timeout
-                # of 30 seconds prevents any movements that take longer
-                self._send_command(command, timeout=DEFAULT_MOVEMENT_TIMEOUT)
+                log.debug("move: {} (estimated {:.3f}s)".format(
+                    command, duration))
+                self._send_move_command(
+                    command,
+                    timeout=max(duration * MOVEMENT_TIMEOUT_FACTOR,
+                                DEFAULT_MOVEMENT_TIMEOUT),
+                    sync=current_changed,
+                    stream=not plunger_axis_moved)
+                self._estimated_motion_time += duration
             finally:
                 # dwell pipette motors because they get hot
-                plunger_axis_moved = ''.join(set('BC') & set(target.keys()))
                 if plunger_axis_moved:
                     self.dwell_axes(plunger_axis_moved)
                     self._set_saved_current()
 
             self._update_position(target)
 
+    def _estimate_backlash_move_duration(self, backlash_target, target):
+        duration = self.estimate_move_duration(backlash_target)
+        if backlash_target != target:
+            duration += estimate_move_duration(
+                backlash_target, target, self._combined_speed,
+                self._max_speed_settings, self._acceleration)
+        return duration
+
+    def _send_move_command(self, command, timeout, sync, stream):
+        '''
+        Send a move command, queuing it in Smoothieware's planner if
+        streaming is enabled and `stream` is set. If `sync` is set, any moves
+        already queued are waited for first.
+        '''
+        if sync:
+            self.wait_for_moves()
+        if self._streaming and stream:
+            self._send_command(command, stream=True, wait_timeout=timeout)
+        else:
+            self._send_command(command, wait_timeout=timeout)
+
     def home(self, axis=AXES, disabled=DISABLE_AXES):
 
         self.run_flag.wait()
@@ -1360,6 +1547,9 @@ class SmoothieDriver_3_0_0:
             ax: self.homed_position.get(ax)
             for ax in ''.join(home_sequence)
         }
+        for axes in home_sequence:
+            self._estimated_motion_time += self.estimate_move_duration(
+                {ax: homed[ax] for ax in axes})
         log.info(f'Home before update pos {homed}')
         self.update_position(default=homed)
         for axis in ''.join(home_sequence):
@@ -1581,6 +1771,9 @@ class SmoothieDriver_3_0_0:
             pass
         else:
             self._is_hard_halting.set()
+            # halting flushes smoothie's planner, so nothing streamed is left
+            self._streamed_commands = []
+            self._streamed_timeout = 0.0
             gpio.set_low(gpio.OUTPUT_PINS['HALT'])
             sleep(0.25)
             gpio.set_high(gpio.OUTPUT_PINS['HALT'])
@@ -0,0 +1,68 @@
+"""
+Estimates of how long Smoothieware takes to execute motion.
+
+Smoothieware plans each move as a straight line through all moving axes
+with a trapezoidal velocity profile: it accelerates up to a nominal speed,
+cruises, and decelerates to a stop. The nominal speed is the requested
+feed rate, reduced until no single axis exceeds its own maximum speed; the
+acceleration is likewise limited by the slowest-accelerating moving axis.
+"""
+import math
+from typing import Mapping, Optional
+
+
+def estimate_move_duration(start: Mapping[str, float],
+                           target: Mapping[str, Optional[float]],
+                           speed: float,
+                           max_speeds: Mapping[str, float],
+                           accelerations: Mapping[str, float]) -> float:
+    '''
+    Estimate the time in seconds a move from `start` to `target` takes,
+    assuming it starts and ends at rest.
+
+    start: dict
+        The position of every axis before the move (mm)
+    target: dict
+        The destination of each moving axis (mm). Axes that are missing,
+        `None` or unknown in `start` do not move.
+    speed: float
+        The requested combined speed of the move (mm/sec)
+    max_speeds: dict
+        The maximum speed of each axis (mm/sec)
+    accelerations: dict
+        The acceleration of each axis (mm/sec^2)
+    '''
+    deltas = {
+        axis: abs(value - start[axis])
+        for axis, value in target.items()
+        if value is not None and axis in start
+    }
+    distance = math.sqrt(sum(delta ** 2 for delta in deltas.values()))
+    if not distance:
+        return 0.0
+
+    nominal_speed = speed
+    acceleration = math.inf
+    for axis, delta in deltas.items():
+        if not delta:
+            continue
+        # the fraction of the move's path that this axis covers scales how
+        # fast the whole move may go before this axis reaches its limit
+        scale = distance / delta
+        if axis in max_speeds:
+            nominal_speed = min(nominal_speed, max_speeds[axis] * scale)
+        if axis in accelerations:
+            acceleration = min(acceleration, accelerations[axis] * scale)
+
+    if nominal_speed <= 0:
+        raise ValueError(
+            'Cannot estimate a move at speed {}'.format(nominal_speed))
+    if math.isinf(acceleration):
+        return distance / nominal_speed
+
+    ramp_distance = nominal_speed ** 2 / acceleration
+    if distance >= ramp_distance:
+        # trapezoid: ramp up and down, cruise for the rest
+        return distance / nominal_speed + nominal_speed / acceleration
+    # triangle: never reaches the nominal speed
+    return 2 * math.sqrt(distance / acceleration)
@@ -7,6 +7,7 @@ from serial.serialutil import SerialException  # type: ignore
 
 from opentrons.drivers import serial_communication, utils
 from opentrons.drivers.serial_communication import SerialNoResponse
+from opentrons.drivers.serial_transport import SerialTransport
 
 '''
 - Driver is responsible for providing an interface for the temp-deck
@@ -51,6 +52,7 @@ class TempDeck:
         self.run_flag.set()
 
         self._connection = None
+        self._transport = SerialTransport(f'tempdeck {id(self)}')
         self._config = config
 
         self._temperature = {'current': 25, 'target': None}
@@ -71,6 +73,7 @@ class TempDeck:
         if self.is_connected():
             self._connection.close()
         self._connection = None
+        self._transport.close()
 
     def is_connected(self) -> bool:
         if not self._connection:
@@ -225,7 +228,7 @@ class TempDeck:
         if not tag:
             tag = f'tempdeck {id(self)}'
         try:
-            return serial_communication.write_and_return(
+            return self._transport.write_and_return(
                 cmd,
                 TEMP_DECK_ACK,
                 self._connection,
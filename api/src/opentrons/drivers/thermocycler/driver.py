@@ -58,7 +58,6 @@ ERROR_KEYWORD = 'error'
 DEFAULT_TC_TIMEOUT = 40
 DEFAULT_COMMAND_RETRIES = 3
 DEFAULT_STABILIZE_DELAY = 0.1
-POLLING_FREQUENCY_MS = 1000
 TEMP_THRESHOLD = 0.5
 
 
@@ -67,16 +66,12 @@ class ThermocyclerError(Exception):
 
 
 class TCPoller(threading.Thread):
-    def __init__(self, port, interrupt_callback, temp_status_callback,
-                 lid_status_callback, lid_temp_status_callback):
+    def __init__(self, port, interrupt_callback):
         if not select:
             raise RuntimeError("Cannot connect to a Thermocycler from Windows")
         self._port = port
         self._connection = self._connect_to_port()
         self._interrupt_callback = interrupt_callback
-        self._temp_status_callback = temp_status_callback
-        self._lid_status_callback = lid_status_callback
-        self._lid_temp_status_callback = lid_temp_status_callback
         self._lock = threading.Lock()
         self._command_queue = Queue()
 
@@ -123,11 +118,12 @@ class TCPoller(threading.Thread):
 
         Third is an enqueued command to send to the Thermocycler.
 
-        Fourth (if no other work is available) is to query the Thermocycler for
-        its current temp, target temp, and time remaining in its current cycle.
+        The Thermocycler's status is not queried here; it is queried with
+        enqueued commands (see :py:meth:`Thermocycler.update_status`) as often
+        as its state needs.
         """
         while True:
-            _next = dict(self._poller.poll(POLLING_FREQUENCY_MS))
+            _next = dict(self._poller.poll())
             if self._halt_read_file.fileno() in _next:
                 log.debug("Poller [{}]: halt".format(hash(self)))
                 self._halt_read_file.read()
@@ -147,15 +143,6 @@ class TCPoller(threading.Thread):
                 log.debug("Poller [{}]: send {}".format(hash(self), command))
                 res = self._send_command(command)
                 callback(res)
-            else:
-                # Nothing else to do--update device status
-                log.debug("Poller [{}]: updating temp".format(hash(self)))
-                res = self._send_command(GCODES['GET_PLATE_TEMP'])
-                self._temp_status_callback(res)
-                res = self._send_command(GCODES['GET_LID_STATUS'])
-                self._lid_status_callback(res)
-                res = self._send_command(GCODES['GET_LID_TEMP'])
-                self._lid_temp_status_callback(res)
         log.info("Exiting TC poller loop [{}]".format(hash(self)))
 
     def _wait_for_ack(self):
@@ -234,11 +221,7 @@ class Thermocycler:
 
     async def connect(self, port: str) -> 'Thermocycler':
         self.disconnect()
-        self._poller = TCPoller(
-            port, self._interrupt_callback,
-            self._temp_status_update_callback,
-            self._lid_status_update_callback,
-            self._lid_temp_status_callback)
+        self._poller = TCPoller(port, self._interrupt_callback)
 
         # Check initial device lid state
         _lid_status_res = await self._write_and_wait(GCODES['GET_LID_STATUS'])
@@ -282,11 +265,13 @@ class Thermocycler:
         temp_cmd, temp = _build_temp_code(temp, hold_time)
         await self._write_and_wait(temp_cmd)
         retries = 0
+        await self.update_status()
         while (self._target_temp != temp) or (self._hold_time != hold_time):
-            await asyncio.sleep(0.1)    # Wait for the poller to update
+            await asyncio.sleep(0.1)    # Wait for the device to update
             retries += 1
             if retries > TEMP_UPDATE_RETRIES:
                 break
+            await self.update_status()
 
     async def set_lid_temperature(self, temp: float) -> None:
         if temp is None:
@@ -307,6 +292,15 @@ class Thermocycler:
         lid_temp_cmd = '{}'.format(GCODES['DEACTIVATE_LID_HEATING'])
         await self._write_and_wait(lid_temp_cmd)
 
+    async def update_status(self) -> None:
+        """ Query the plate temperature, lid status and lid temperature """
+        self._temp_status_update_callback(
+            await self._write_and_wait(GCODES['GET_PLATE_TEMP']))
+        self._lid_status_update_callback(
+            await self._write_and_wait(GCODES['GET_LID_STATUS']))
+        self._lid_temp_status_callback(
+            await self._write_and_wait(GCODES['GET_LID_TEMP']))
+
     def _lid_status_update_callback(self, lid_response):
         if lid_response:
             self._lid_status = utils.parse_string_value_from_substring(
@@ -416,18 +410,14 @@ class Thermocycler:
             raise ThermocyclerError("Thermocycler did not return device info")
 
     async def _write_and_wait(self, command):
-        ret = None
+        loop = asyncio.get_event_loop()
+        ret = loop.create_future()
 
         def cb(cmd):
-            nonlocal ret
-            ret = cmd
+            loop.call_soon_threadsafe(ret.set_result, cmd)
 
         self._poller.send(command, cb)
-
-        while None is ret:
-            await asyncio.sleep(0.05)
-            pass
-        return ret
+        return await ret
 
     def __del__(self):
         try:
@@ -89,6 +89,8 @@ class API(HardwareAPILike):
         """
         self._log = self.CLS_LOG.getChild(str(id(self)))
         self._config = config or robot_configs.load()
+        # Rebuilt whenever the config's gantry calibration is replaced
+        self._cached_gantry_transform: Optional[linal.CachedTransform] = None
         self._backend = backend
         if None is loop:
             self._loop = asyncio.get_event_loop()
@@ -338,7 +340,7 @@ class API(HardwareAPILike):
                    'aspirate_flow_rate', 'dispense_flow_rate',
                    'pipette_id', 'current_volume', 'display_name',
                    'tip_length', 'model', 'blow_out_flow_rate',
-                   'working_volume']
+                   'working_volume', 'ul_per_mm']
         instruments: Dict[top_types.Mount, Pipette.DictType] = {
             top_types.Mount.LEFT: {},
             top_types.Mount.RIGHT: {}
@@ -501,15 +503,17 @@ class API(HardwareAPILike):
         checked_axes = axes or [ax for ax in Axis]
         gantry = [ax for ax in checked_axes if ax in Axis.gantry_axes()]
         smoothie_gantry = [ax.name.upper() for ax in gantry]
-        smoothie_pos = {}
+        smoothie_pos: Dict[str, float] = {}
         plungers = [ax for ax in checked_axes
                     if ax not in Axis.gantry_axes()]
         smoothie_plungers = [ax.name.upper() for ax in plungers]
         async with self._motion_lock:
             if smoothie_gantry:
-                smoothie_pos.update(self._backend.home(smoothie_gantry))
+                smoothie_pos.update(await self._backend.run(
+                    self._backend.home, smoothie_gantry))
             if smoothie_plungers:
-                smoothie_pos.update(self._backend.home(smoothie_plungers))
+                smoothie_pos.update(await self._backend.run(
+                    self._backend.home, smoothie_plungers))
             self._current_position = self._deck_from_smoothie(smoothie_pos)
 
     async def add_tip(
@@ -537,6 +541,16 @@ class API(HardwareAPILike):
         else:
             mod_log.warning('detach tip called with no tip')
 
+    @property
+    def _gantry_transform(self) -> linal.CachedTransform:
+        """ The deck calibration, prepared for transforming positions """
+        calibration = self._config.gantry_calibration
+        cached = self._cached_gantry_transform
+        if not cached or cached.source is not calibration:
+            cached = linal.CachedTransform(calibration)
+            self._cached_gantry_transform = cached
+        return cached
+
     def _deck_from_smoothie(
             self, smoothie_pos: Dict[str, float]) -> Dict[Axis, float]:
         """ Build a deck-abs position store from the smoothie's position
@@ -567,10 +581,8 @@ class API(HardwareAPILike):
         left = (with_enum[Axis.X],
                 with_enum[Axis.Y],
                 with_enum[Axis.by_mount(top_types.Mount.LEFT)])
-        right_deck = linal.apply_reverse(self._config.gantry_calibration,
-                                         right)
-        left_deck = linal.apply_reverse(self._config.gantry_calibration,
-                                        left)
+        right_deck, left_deck = self._gantry_transform.apply_reverse_many(
+            (right, left))
         deck_pos = {Axis.X: right_deck[0],
                     Axis.Y: right_deck[1],
                     Axis.by_mount(top_types.Mount.RIGHT): right_deck[2],
@@ -602,7 +614,7 @@ class API(HardwareAPILike):
         async with self._motion_lock:
             if refresh:
                 self._current_position = self._deck_from_smoothie(
-                    self._backend.update_position())
+                    await self._backend.run(self._backend.update_position))
             if mount == mount.RIGHT:
                 offset = top_types.Point(0, 0, 0)
             else:
@@ -774,13 +786,10 @@ class API(HardwareAPILike):
             raise ValueError("Moves must specify either exactly an x, y, and "
                              "(z or a) or none of them")
 
-        # Type ignored below because linal.apply_transform (rightly) specifies
-        # Tuple[float, float, float] and the implied type from
-        # target_position.items() is (rightly) Tuple[float, ...] with unbounded
-        # size; unfortunately, mypy can’t quite figure out the length check
-        # above that makes this OK
-        transformed = linal.apply_transform(  # type: ignore
-            self._config.gantry_calibration, to_transform)
+        # Unpacking gives the transform the Tuple[float, float, float] it
+        # needs, which the length check above guarantees
+        x, y, z = to_transform
+        transformed = self._gantry_transform.apply((x, y, z))
 
         # Since target_position is an OrderedDict with the axes ordered by
         # (x, y, z, a, b, c), and we’ll only have one of a or z (as checked
@@ -809,8 +818,9 @@ class API(HardwareAPILike):
                                 bounds[ax.name][0], bounds[ax.name][1]))
         async with self._motion_lock:
             try:
-                self._backend.move(smoothie_pos, speed=speed,
-                                   home_flagged_axes=home_flagged_axes)
+                await self._backend.run(
+                    self._backend.move, smoothie_pos, speed=speed,
+                    home_flagged_axes=home_flagged_axes)
             except Exception:
                 self._log.exception('Move failed')
                 self._current_position.clear()
@@ -836,7 +846,8 @@ class API(HardwareAPILike):
         """
         smoothie_ax = Axis.by_mount(mount).name.upper()
         async with self._motion_lock:
-            smoothie_pos = self._backend.fast_home(smoothie_ax, margin)
+            smoothie_pos = await self._backend.run(
+                self._backend.fast_home, smoothie_ax, margin)
             self._current_position = self._deck_from_smoothie(smoothie_pos)
 
     def _critical_point_for(
@@ -891,6 +902,30 @@ class API(HardwareAPILike):
     async def update_deck_calibration(self, new_transform):
         pass
 
+    @property
+    def estimated_motion_time(self) -> float:
+        """ The total estimated time (in seconds) of all the motion this
+        hardware has executed or simulated.
+
+        Durations are predicted from the distance of each move and the axis
+        speed and acceleration settings, so comparing this value before and
+        after an action estimates how long the action takes on a robot.
+        """
+        return self._backend.estimated_motion_time
+
+    @_log_call
+    async def set_motion_streaming(self, enabled: bool):
+        """ Enable or disable streaming of gantry moves to the motor driver.
+
+        While streaming, gantry moves are queued in the motor controller's
+        planner instead of each one being waited for, so consecutive moves
+        (such as the segments of an arc) blend together. Pipette actions,
+        current changes, homing and probing still wait for all queued motion
+        to finish.
+        """
+        async with self._motion_lock:
+            self._backend.set_motion_streaming(enabled)
+
     @_log_call
     async def head_speed(self, combined_speed=None,
                          x=None, y=None, z=None, a=None, b=None, c=None):
@@ -1188,7 +1223,8 @@ class API(HardwareAPILike):
             if home_after:
                 safety_margin = abs(bottom-droptip)
                 async with self._motion_lock:
-                    smoothie_pos = self._backend.fast_home(
+                    smoothie_pos = await self._backend.run(
+                        self._backend.fast_home,
                         plunger_ax.name.upper(), safety_margin)
                     self._current_position = self._deck_from_smoothie(
                         smoothie_pos)
@@ -1413,7 +1449,8 @@ class API(HardwareAPILike):
             # Probe and retrieve the position afterwards
             async with self._motion_lock:
                 self._current_position = self._deck_from_smoothie(
-                    self._backend.probe(
+                    await self._backend.run(
+                        self._backend.probe,
                         to_probe.name.lower(), hs.probe_distance))
             xyz = await self.gantry_position(mount)
             # Store the upated position.
@@ -4,7 +4,8 @@ import asyncio
 import copy
 import functools
 import threading
-from typing import List, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 
 from . import API
 from .types import Axis, HardwareAPILike
@@ -14,6 +15,12 @@ class SynchronousAdapter(HardwareAPILike, threading.Thread):
     """ A wrapper to make every call into :py:class:`.hardware_control.API`
     synchronous.
 
+    Coroutines of the wrapped object are run on the adapter's event loop. By
+    default this loop runs in a worker thread, and each call is handed to it
+    and waited on. Simulators do no real I/O, so adapters for them instead run
+    the loop on the calling thread for the duration of each call, which
+    avoids the handoff.
+
     Example
     -------
     .. code-block::
@@ -46,27 +53,39 @@ class SynchronousAdapter(HardwareAPILike, threading.Thread):
 
     def __init__(self,
                  api: API,
-                 loop: asyncio.AbstractEventLoop = None) -> None:
+                 loop: asyncio.AbstractEventLoop = None,
+                 run_in_thread: bool = None) -> None:
         """ Build the SynchronousAdapter.
 
         :param api: The API instance to wrap
         :param loop: A specific event loop to use. This is for the use of
                      :py:meth:`build` and should normally not be used; since
-                     this loop will be run in a worker thread it should not
+                     this loop will be run by the adapter it should not
                      be run elsewhere. If not specified (which should be the
-                     normal use case) the adapter will start a new event loop
-                     for the worker thread.
+                     normal use case) the adapter will start a new event loop.
+        :param run_in_thread: `True` to run the event loop in a worker thread;
+                              `False` to run it on the calling thread during
+                              each call. If not specified, the loop is run on
+                              the calling thread for simulators and in a
+                              worker thread for everything else.
         """
+        # Synchronized versions of the coroutine methods of the API, by name
+        self._wrapped: Dict[str, Callable] = {}
         checked_loop = loop or asyncio.new_event_loop()
         api.set_loop(checked_loop)
         self._loop = checked_loop
         self._api = api
+        if run_in_thread is None:
+            run_in_thread = not getattr(api, 'is_simulator_sync', False)
+        self._run_in_thread = run_in_thread
         self._call_lock = threading.Lock()
-        self._cached_sync_mods: Mapping[str, SynchronousAdapter] = {}
+        self._fallback_executor: Optional[ThreadPoolExecutor] = None
+        self._cached_sync_mods: Dict[str, SynchronousAdapter] = {}
         super().__init__(
             target=self._event_loop_in_thread,
             name='SynchAdapter thread for {}'.format(repr(api)))
-        super().start()
+        if run_in_thread:
+            super().start()
 
     def __repr__(self):
         return '<SynchronousAdapter>'
@@ -78,9 +97,23 @@ class SynchronousAdapter(HardwareAPILike, threading.Thread):
 
     def join(self):
         thread_loop = object.__getattribute__(self, '_loop')
-        if thread_loop.is_running():
-            thread_loop.call_soon_threadsafe(lambda: thread_loop.stop())
-        super().join()
+        if object.__getattribute__(self, '_run_in_thread'):
+            if thread_loop.is_running():
+                thread_loop.call_soon_threadsafe(lambda: thread_loop.stop())
+            super().join()
+            return
+        with object.__getattribute__(self, '_call_lock'):
+            executor = object.__getattribute__(self, '_fallback_executor')
+            if executor:
+                executor.shutdown()
+            if not thread_loop.is_closed():
+                thread_loop.close()
+
+    def is_alive(self):
+        """ `True` until the adapter is stopped by :py:meth:`join` """
+        if object.__getattribute__(self, '_run_in_thread'):
+            return super().is_alive()
+        return not object.__getattribute__(self, '_loop').is_closed()
 
     def __del__(self):
         try:
@@ -90,11 +123,13 @@ class SynchronousAdapter(HardwareAPILike, threading.Thread):
         else:
             if thread_loop.is_running():
                 thread_loop.call_soon_threadsafe(lambda: thread_loop.stop())
+            elif not thread_loop.is_closed()\
+                    and not object.__getattribute__(self, '_run_in_thread'):
+                thread_loop.close()
 
     def discover_modules(self):
-        loop = object.__getattribute__(self, '_loop')
         api = object.__getattribute__(self, '_api')
-        discovered_mods = self.call_coroutine_sync(loop, api.discover_modules)
+        discovered_mods = self._run_sync(api.discover_modules())
         async_mods = {mod.port: mod for mod in discovered_mods}
 
         these = set(async_mods.keys())
@@ -115,32 +150,58 @@ class SynchronousAdapter(HardwareAPILike, threading.Thread):
         fut = asyncio.run_coroutine_threadsafe(to_call(*args, **kwargs), loop)
         return fut.result()
 
+    def _call_sync(self, to_call, *args, **kwargs):
+        run_sync = object.__getattribute__(self, '_run_sync')
+        return run_sync(to_call(*args, **kwargs))
+
+    def _run_sync(self, coro):
+        """ Run a coroutine on the adapter's event loop and wait for it """
+        loop = object.__getattribute__(self, '_loop')
+        if object.__getattribute__(self, '_run_in_thread'):
+            return asyncio.run_coroutine_threadsafe(coro, loop).result()
+        with object.__getattribute__(self, '_call_lock'):
+            if asyncio._get_running_loop() is None:
+                return loop.run_until_complete(coro)
+            # The caller is running an event loop of its own, and only one
+            # loop may run in a thread at a time
+            executor = object.__getattribute__(self, '_fallback_executor')
+            if not executor:
+                executor = ThreadPoolExecutor(max_workers=1)
+                self._fallback_executor = executor
+            return executor.submit(loop.run_until_complete, coro).result()
+
     def __getattribute__(self, attr_name):
         """ Retrieve attributes from our API and wrap coroutines """
         # Almost every attribute retrieved from us will be fore people actually
         # looking for an attribute of the hardware API, so check there first.
+        api = object.__getattribute__(self, '_api')
+        wrapped_cache = object.__getattribute__(self, '_wrapped')
+        # Methods of the API don't change, so they are only looked up and
+        # wrapped once; attributes set on the instance are looked up each time
+        cacheable = attr_name not in api.__dict__
+        if cacheable and attr_name in wrapped_cache:
+            return wrapped_cache[attr_name]
+
         if attr_name == 'discover_modules':
             return object.__getattribute__(self, attr_name)
 
-        api = object.__getattribute__(self, '_api')
         try:
             attr = getattr(api, attr_name)
         except AttributeError:
             # Maybe this actually was for us? Let’s find it
             return object.__getattribute__(self, attr_name)
 
-        try:
-            check = attr.__wrapped__
-        except AttributeError:
-            check = attr
-        loop = object.__getattribute__(self, '_loop')
+        check = getattr(attr, '__wrapped__', attr)
         if asyncio.iscoroutinefunction(check):
             # Return a synchronized version of the coroutine
-            return functools.partial(self.call_coroutine_sync, loop, attr)
+            wrapped = functools.partial(
+                object.__getattribute__(self, '_call_sync'), attr)
+            if cacheable:
+                wrapped_cache[attr_name] = wrapped
+            return wrapped
         elif asyncio.iscoroutine(check):
             # Catch awaitable properties and reify the future before returning
-            fut = asyncio.run_coroutine_threadsafe(check, loop)
-            return fut.result()
+            return object.__getattribute__(self, '_run_sync')(check)
 
         return attr
 
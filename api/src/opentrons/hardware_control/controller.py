@@ -49,6 +49,13 @@ class Controller:
             self._smoothie_driver.move(
                 target_position, home_flagged_axes=home_flagged_axes)
 
+    def set_motion_streaming(self, enabled: bool):
+        self._smoothie_driver.set_streaming(enabled)
+
+    @property
+    def estimated_motion_time(self) -> float:
+        return self._smoothie_driver.estimated_motion_time
+
     def home(self, axes: List[str] = None) -> Dict[str, float]:
         if axes:
             args: Tuple[Any, ...] = (''.join(axes),)
@@ -199,6 +206,15 @@ class Controller:
         """
         return self._smoothie_driver.probe_axis(axis, distance)
 
+    async def run(self, func, *args, **kwargs):
+        """ Call a blocking method of this backend without blocking the loop.
+
+        The call is made from the smoothie driver's serial transport, so it
+        keeps its place in order with any other smoothie commands.
+        """
+        return await self._smoothie_driver.transport.call_async(
+            func, *args, **kwargs)
+
     async def delay(self, duration_s: int):
         """ Pause and sleep
         """
@@ -0,0 +1,132 @@
+""" Watch the status of a module from a task on its event loop.
+
+Rather than each module running a thread that polls it at a fixed interval,
+a :py:class:`ModuleMonitor` polls from a task on the module's event loop, as
+often as the module's state calls for: quickly while the module is moving
+towards a target, slowly while it holds one, and not at all while idle.
+Changes to the module's status are published on the monitor's broker and
+wake any coroutines waiting in :py:meth:`ModuleMonitor.wait_for`.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from opentrons.broker import Broker
+
+MODULE_LOG = logging.getLogger(__name__)
+
+#: The topic the monitor's broker publishes the module's live data on
+STATUS_TOPIC = 'status'
+
+#: Seconds between polls while a module is changing towards its target
+FAST_POLL_INTERVAL_SECS = 1.0
+#: Seconds between polls while a module is holding at its target
+SLOW_POLL_INTERVAL_SECS = 5.0
+
+
+class ModuleMonitor:
+    """ Polls a module and publishes changes to its status.
+
+    All methods but :py:meth:`wake` and :py:meth:`set_loop` must be called
+    from the monitor's event loop.
+    """
+    def __init__(self,
+                 loop: asyncio.AbstractEventLoop,
+                 read_status: Callable[[], Dict[str, Any]],
+                 poll_interval: Callable[[], Optional[float]],
+                 update: Callable[[], Awaitable[None]] = None) -> None:
+        """
+        :param loop: The event loop to poll from
+        :param read_status: Returns the module's live data, to compare
+                            between polls
+        :param poll_interval: Returns the seconds to wait before the next
+                              poll, or ``None`` if the module does not need
+                              to be polled
+        :param update: A coroutine function that reads the module's status
+                       from the device. If not specified (for instance, for
+                       simulated modules) the module is never polled, and
+                       the status is only checked when the monitor is woken.
+        """
+        self._loop = loop
+        self._read_status = read_status
+        self._poll_interval = poll_interval
+        self._update = update
+        self._last_status = read_status()
+        self._task: Optional[asyncio.Task] = None
+        self._woken: Optional[asyncio.Event] = None
+        self._next_change: Optional[asyncio.Future] = None
+        self.broker = Broker()
+
+    def set_loop(self, loop: asyncio.AbstractEventLoop):
+        """ Move the monitor to another event loop """
+        self.stop()
+        self._loop = loop
+        self._next_change = None
+
+    def wake(self):
+        """ Check for changes now and start polling if the module needs it.
+
+        Modules should call this after they send a command to their device.
+        This may be called from any thread.
+        """
+        if self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._on_wake)
+
+    def stop(self):
+        """ Stop polling. This may be called from any thread. """
+        task, self._task = self._task, None
+        if task and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(task.cancel)
+
+    async def wait_for(self, predicate: Callable[[], bool]):
+        """ Wait until ``predicate`` returns ``True``.
+
+        The predicate is checked each time the module's status changes.
+        """
+        self._on_wake()
+        while not predicate():
+            if not self._next_change:
+                self._next_change = self._loop.create_future()
+            await self._next_change
+
+    def _on_wake(self):
+        self._check_status()
+        if self._task:
+            self._woken.set()  # type: ignore
+        elif self._update and self._poll_interval() is not None:
+            self._woken = asyncio.Event(loop=self._loop)
+            self._task = self._loop.create_task(self._poll())
+
+    def _check_status(self):
+        status = self._read_status()
+        if status == self._last_status:
+            return
+        self._last_status = status
+        self.broker.publish(STATUS_TOPIC, status)
+        next_change, self._next_change = self._next_change, None
+        if next_change and not next_change.done():
+            next_change.set_result(status)
+
+    async def _poll(self):
+        this_task = self._task
+        woken = self._woken
+        try:
+            while True:
+                interval = self._poll_interval()
+                if interval is None:
+                    break
+                woken.clear()
+                try:
+                    await asyncio.wait_for(
+                        woken.wait(), interval, loop=self._loop)
+                except asyncio.TimeoutError:
+                    pass
+                try:
+                    await self._update()  # type: ignore
+                except Exception:
+                    MODULE_LOG.exception('Exception while polling module')
+                self._check_status()
+        finally:
+            if self._task is this_task:
+                self._task = None
@@ -1,10 +1,7 @@
 import asyncio
-from threading import Thread, Event
-from typing import Union
+from typing import Optional, Union
 from opentrons.drivers.temp_deck import TempDeck as TempDeckDriver
-from . import update, mod_abc
-
-TEMP_POLL_INTERVAL_SECS = 1
+from . import update, mod_abc, monitor
 
 
 class MissingDevicePortError(Exception):
@@ -55,22 +52,6 @@ class SimulatingDriver:
                 'version': 'dummyVersion'}
 
 
-class Poller(Thread):
-    def __init__(self, driver):
-        self._driver_ref = driver
-        self._stop_event = Event()
-        super().__init__(target=self._poll_temperature,
-                         name='Temperature poller for tempdeck')
-
-    def _poll_temperature(self):
-        while not self._stop_event.wait(TEMP_POLL_INTERVAL_SECS):
-            self._driver_ref.update_temperature()
-
-    def join(self):
-        self._stop_event.set()
-        super().join()
-
-
 class TempDeck(mod_abc.AbstractModule):
     """
     Under development. API subject to change without a version bump
@@ -118,7 +99,9 @@ class TempDeck(mod_abc.AbstractModule):
 
         self._port = port
         self._device_info = None
-        self._poller = None
+        self._monitor = monitor.ModuleMonitor(
+            self._loop, lambda: self.live_data, self._poll_interval,
+            None if simulating else self._update_temperature)
 
     def set_temperature(self, celsius):
         """
@@ -128,18 +111,37 @@ class TempDeck(mod_abc.AbstractModule):
         temperature display. Any input outside of this range will be clipped
         to the nearest limit
         """
-        return self._driver.set_temperature(celsius)
+        res = self._driver.set_temperature(celsius)
+        self._monitor.wake()
+        return res
 
     def deactivate(self):
         """ Stop heating/cooling and turn off the fan """
         self._driver.deactivate()
+        self._monitor.wake()
 
     async def wait_for_temp(self):
         """
         This method exits only if set temperature has reached.Subject to change
         """
-        while self.status != 'holding at target':
-            await asyncio.sleep(0.1)
+        await self._monitor.wait_for(
+            lambda: self.status == 'holding at target')
+
+    async def _update_temperature(self):
+        await self._loop.run_in_executor(None, self._driver.update_temperature)
+
+    def _poll_interval(self) -> Optional[float]:
+        if self.status == 'idle':
+            return None
+        elif self.status == 'holding at target':
+            return monitor.SLOW_POLL_INTERVAL_SECS
+        else:
+            return monitor.FAST_POLL_INTERVAL_SECS
+
+    @property
+    def status_monitor(self) -> monitor.ModuleMonitor:
+        """ The monitor that publishes changes to :py:attr:`live_data` """
+        return self._monitor
 
     @property
     def device_info(self):
@@ -185,6 +187,7 @@ class TempDeck(mod_abc.AbstractModule):
 
     def set_loop(self, loop):
         self._loop = loop
+        self._monitor.set_loop(loop)
 
     async def _connect(self):
         """
@@ -192,22 +195,17 @@ class TempDeck(mod_abc.AbstractModule):
         Planned change- will connect to the correct port in case of multiple
         TempDecks
         """
-        if self._poller:
-            self._poller.join()
+        self._monitor.stop()
         self._driver.connect(self._port)
         self._device_info = self._driver.get_device_info()
-        self._poller = Poller(self._driver)
-        self._poller.start()
+        self._monitor.wake()
 
     def __del__(self):
-        if hasattr(self, '_poller') and self._poller:
-            self._poller.join()
+        if hasattr(self, '_monitor'):
+            self._monitor.stop()
 
     async def prep_for_update(self) -> str:
-        if self._poller:
-            self._poller.join()
-        del self._poller
-        self._poller = None
+        self._monitor.stop()
         new_port = await update.enter_bootloader(self._driver,
                                                  self.name())
         return new_port or self.port
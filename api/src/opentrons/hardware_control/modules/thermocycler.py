@@ -1,5 +1,5 @@
 import asyncio
-from . import mod_abc, types
+from . import mod_abc, monitor, types
 from typing import Union, Optional, List, Callable
 from opentrons.drivers.thermocycler.driver import (
     Thermocycler as ThermocyclerDriver)
@@ -76,6 +76,9 @@ class SimulatingDriver:
     def disconnect(self):
         self._port = None
 
+    async def update_status(self):
+        pass
+
     async def set_temperature(self,
                               temp: float,
                               hold_time: float,
@@ -158,7 +161,6 @@ class Thermocycler(mod_abc.AbstractModule):
 
         self._port = port
         self._device_info = None
-        self._poller = None
 
         self._running_flag = asyncio.Event(loop=self._loop)
         self._current_cycle_task: Optional[asyncio.Task] = None
@@ -168,6 +170,10 @@ class Thermocycler(mod_abc.AbstractModule):
         self._total_step_count: Optional[int] = None
         self._current_step_index: Optional[int] = None
 
+        self._monitor = monitor.ModuleMonitor(
+            self._loop, lambda: self.live_data, self._poll_interval,
+            None if simulating else self._driver.update_status)
+
     def pause(self):
         self._loop.call_soon_threadsafe(self._running_flag.clear)
 
@@ -186,14 +192,19 @@ class Thermocycler(mod_abc.AbstractModule):
         self._total_step_count = None
         self._current_step_index = None
         await self._driver.deactivate()
+        self._monitor.wake()
 
     async def open(self) -> str:
         """ Open the lid if it is closed"""
-        return await self._driver.open()
+        res = await self._driver.open()
+        self._monitor.wake()
+        return res
 
     async def close(self) -> str:
         """ Close the lid if it is open"""
-        return await self._driver.close()
+        res = await self._driver.close()
+        self._monitor.wake()
+        return res
 
     async def set_temperature(self, temperature,
                               hold_time_seconds: float = None,
@@ -205,6 +216,7 @@ class Thermocycler(mod_abc.AbstractModule):
         hold_time = total_seconds if total_seconds > 0 else 0
         await self._driver.set_temperature(
             temp=temperature, hold_time=hold_time, ramp_rate=ramp_rate)
+        self._monitor.wake()
         if hold_time:
             await self.wait_for_hold()
         else:
@@ -235,10 +247,13 @@ class Thermocycler(mod_abc.AbstractModule):
     async def set_lid_temperature(self, temp: float):
         """ Set the lid temperature in deg Celsius """
         await self._driver.set_lid_temperature(temp=temp)
+        self._monitor.wake()
         await self.wait_for_lid_temp()
 
     async def stop_lid_heating(self):
-        return await self._driver.stop_lid_heating()
+        res = await self._driver.stop_lid_heating()
+        self._monitor.wake()
+        return res
 
     async def wait_for_lid_temp(self):
         """
@@ -246,8 +261,8 @@ class Thermocycler(mod_abc.AbstractModule):
 
         Subject to change without a version bump.
         """
-        while self._driver.lid_temp_status != 'holding at target':
-            await asyncio.sleep(0.1)
+        await self._monitor.wait_for(
+            lambda: self.lid_temp_status == 'holding at target')
 
     async def wait_for_temp(self):
         """
@@ -255,15 +270,28 @@ class Thermocycler(mod_abc.AbstractModule):
 
         Subject to change without a version bump.
         """
-        while self.status != 'holding at target':
-            await asyncio.sleep(0.1)
+        await self._monitor.wait_for(
+            lambda: self.status == 'holding at target')
 
     async def wait_for_hold(self):
         """
         This method returns only when hold time has elapsed
         """
-        while self.hold_time != 0:
-            await asyncio.sleep(0.1)
+        await self._monitor.wait_for(lambda: self.hold_time == 0)
+
+    def _poll_interval(self) -> Optional[float]:
+        if 'ramping' in (self.status, self.lid_temp_status)\
+                or self.hold_time:
+            return monitor.FAST_POLL_INTERVAL_SECS
+        elif 'holding at target' in (self.status, self.lid_temp_status):
+            return monitor.SLOW_POLL_INTERVAL_SECS
+        else:
+            return None
+
+    @property
+    def status_monitor(self) -> monitor.ModuleMonitor:
+        """ The monitor that publishes changes to :py:attr:`live_data` """
+        return self._monitor
 
     @property
     def lid_target(self):
@@ -360,14 +388,20 @@ class Thermocycler(mod_abc.AbstractModule):
     def set_loop(self, newLoop):
         self._loop = newLoop
         self._running_flag = asyncio.Event(loop=self._loop)
+        self._monitor.set_loop(newLoop)
 
     async def _connect(self):
         await self._driver.connect(self._port)
         self._device_info = await self._driver.get_device_info()
+        self._monitor.wake()
 
     @property
     def port(self):
         return self._port
 
     async def prep_for_update(self):
-        pass
+        self._monitor.stop()
+
+    def __del__(self):
+        if hasattr(self, '_monitor'):
+            self._monitor.stop()
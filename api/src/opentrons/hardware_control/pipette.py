@@ -26,6 +26,8 @@ class Pipette:
                  pipette_id: str = None) -> None:
         self._config = pipette_config.load(model, pipette_id)
         self._name = pipette_config.name_for_model(model)
+        self._volume_conversions: Dict[
+            str, pipette_config.VolumeConversion] = {}
         self._model = model
         self._model_offset = self._config.model_offset
         self._current_volume = 0.0
@@ -59,6 +61,7 @@ class Pipette:
     def update_config_item(self, elem_name: str, elem_val: Any):
         self._log.info("updated config: {}={}".format(elem_name, elem_val))
         self._config = self._config._replace(**{elem_name: elem_val})
+        self._volume_conversions.clear()
 
     @property
     def name(self) -> str:
@@ -197,8 +200,18 @@ class Pipette:
         return self._has_tip
 
     def ul_per_mm(self, ul: float, action: str) -> float:
-        sequence = self._config.ul_per_mm[action]
-        return pipette_config.piecewise_volume_conversion(ul, sequence)
+        return self.volume_conversion(action)(ul)
+
+    def volume_conversion(
+            self, action: str) -> pipette_config.VolumeConversion:
+        """ The compiled ul/mm function for an action ('aspirate' or
+        'dispense') """
+        conversion = self._volume_conversions.get(action)
+        if conversion is None:
+            conversion = pipette_config.volume_conversion(
+                self._config.ul_per_mm[action])
+            self._volume_conversions[action] = conversion
+        return conversion
 
     def __str__(self) -> str:
         return '{} current volume {}ul critical point: {} at {}'\
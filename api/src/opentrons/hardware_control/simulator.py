@@ -5,8 +5,12 @@ from threading import Event
 from typing import Dict, Optional, List, Tuple
 from contextlib import contextmanager
 from opentrons import types
+from opentrons.config import robot_configs
 from opentrons.config.pipette_config import config_models, configs
 from opentrons.drivers.smoothie_drivers import SimulatingDriver
+from opentrons.drivers.smoothie_drivers.driver_3_0 import DEFAULT_AXES_SPEED
+from opentrons.drivers.smoothie_drivers.kinematics import \
+    estimate_move_duration
 from . import modules
 
 
@@ -96,6 +100,8 @@ class Simulator:
         self._run_flag = Event()
         self._log = MODULE_LOG.getChild(repr(self))
         self._strict_attached = bool(strict_attached_instruments)
+        self._motion_streaming = False
+        self._estimated_motion_time = 0.0
 
     def update_position(self) -> Dict[str, float]:
         return self._position
@@ -105,15 +111,37 @@ class Simulator:
         if self._run_flag.is_set():
             self._log.warning("Move to {} would be blocked by pause"
                               .format(target_position))
+        self._estimate_motion(target_position, speed)
         self._position.update(target_position)
         self._engaged_axes.update({ax: True
                                    for ax in target_position})
 
+    def set_motion_streaming(self, enabled: bool):
+        self._motion_streaming = enabled
+
+    @property
+    def estimated_motion_time(self) -> float:
+        return self._estimated_motion_time
+
+    def _estimate_motion(self, target_position: Dict[str, float],
+                         speed: float = None):
+        if self._config:
+            max_speeds = self._config.default_max_speed
+            accelerations = self._config.acceleration
+        else:
+            max_speeds = robot_configs.DEFAULT_MAX_SPEEDS
+            accelerations = robot_configs.DEFAULT_ACCELERATION
+        self._estimated_motion_time += estimate_move_duration(
+            self._position, target_position, speed or DEFAULT_AXES_SPEED,
+            max_speeds, accelerations)
+
     def home(self, axes: List[str] = None) -> Dict[str, float]:
         if self._run_flag.is_set():
             self._log.warning("Home would be blocked by pause")
         # driver_3_0-> HOMED_POSITION
         checked_axes = axes or 'XYZABC'
+        self._estimate_motion({ax: _HOME_POSITION[ax]
+                               for ax in checked_axes})
         self._position.update({ax: _HOME_POSITION[ax]
                                for ax in checked_axes})
         self._engaged_axes.update({ax: True
@@ -184,6 +212,12 @@ class Simulator:
     def set_active_current(self, axis, amp):
         pass
 
+    async def run(self, func, *args, **kwargs):
+        """ Call a method of this backend. The simulator does not block, so
+        it is called directly.
+        """
+        return func(*args, **kwargs)
+
     def get_attached_modules(self) -> List[Tuple[str, str]]:
         return self._attached_modules
 
@@ -19,6 +19,10 @@ from . import API, types, pipette
 
 LOG = logging.getLogger(__name__)
 
+#: The method of the notifications sent for each finished step of a
+#: motion script
+MOTION_SCRIPT_STEP = 'motion_script_step'
+
 
 SerDes = namedtuple('SerDes', ('serializer', 'deserializer'))
 
@@ -172,9 +176,16 @@ class Server:
                  loop: asyncio.AbstractEventLoop):
         self._api = api
         self._methods = build_jrpc_methods(api)
+        self._methods.add(motion_script=self._motion_script)
         self._loop = loop
         self.server: Optional[Any] = None
         self._protocol_instances: Set['JsonRpcProtocol'] = set()
+        self._script_lock = asyncio.Lock(loop=loop)
+        # Guards the two below: other calls wait while a script runs, and a
+        # script waits for the calls already running to finish
+        self._motion_state = asyncio.Condition(loop=loop)
+        self._script_running = False
+        self._running_calls = 0
 
     def _build_protocol(self):
         proto = JsonRpcProtocol(
@@ -189,9 +200,112 @@ class Server:
             LOG.warning('protocol not present on unregister - double call?')
 
     async def _dispatch(self, call_str: str) -> str:
-        result = await jsonrpcserver.async_dispatcher.dispatch(
-            call_str, self._methods, debug=True)
-        return str(result)
+        """ Dispatch a request or a batch of requests.
+
+        The requests of a batch are run one after another, in the order
+        they were sent, and their responses are returned in the same order.
+        """
+        try:
+            calls = json.loads(call_str)
+        except json.JSONDecodeError:
+            calls = None
+        if not isinstance(calls, list) or not calls:
+            result = await self._dispatch_one(call_str, calls)
+            return str(result)
+        responses = []
+        for call in calls:
+            result = await self._dispatch_one(json.dumps(call), call)
+            if result.wanted:
+                responses.append(str(result))
+        if not responses:
+            # A batch of notifications gets no response at all
+            return ''
+        return '[{}]'.format(', '.join(responses))
+
+    async def _dispatch_one(self, call_str: str, call: Any):
+        if isinstance(call, dict) and call.get('method') == 'motion_script':
+            # Scripts wait for the other calls themselves
+            return await jsonrpcserver.async_dispatcher.dispatch(
+                call_str, self._methods, debug=True)
+        async with self._motion_state:
+            await self._motion_state.wait_for(
+                lambda: not self._script_running)
+            self._running_calls += 1
+        try:
+            return await jsonrpcserver.async_dispatcher.dispatch(
+                call_str, self._methods, debug=True)
+        finally:
+            async with self._motion_state:
+                self._running_calls -= 1
+                self._motion_state.notify_all()
+
+    async def _motion_script(self,
+                             steps: List[Dict[str, Any]],
+                             tag: Any = None) -> List[Any]:
+        """ Run a list of hardware calls in order.
+
+        Each step is an object with the ``method`` to call and its
+        ``params``, as for a request. When a step finishes, a
+        :py:data:`MOTION_SCRIPT_STEP` notification with its ``index``,
+        ``method`` and ``result`` (and the ``tag`` passed to the script) is
+        sent to the client that asked for the script. The script stops at
+        the first step that fails.
+
+        Scripts run one at a time, and other calls wait while a script
+        runs, so nothing from other clients runs between its steps. A script
+        starts once the calls already running have finished.
+
+        :returns: The result of each step
+        """
+        notify = self._notifier()
+        async with self._script_lock:
+            try:
+                async with self._motion_state:
+                    self._script_running = True
+                    await self._motion_state.wait_for(
+                        lambda: not self._running_calls)
+                return await self._run_script_steps(steps, tag, notify)
+            finally:
+                async with self._motion_state:
+                    self._script_running = False
+                    self._motion_state.notify_all()
+
+    async def _run_script_steps(
+            self,
+            steps: List[Dict[str, Any]],
+            tag: Any,
+            notify: Callable[[str, Dict[str, Any]], None]) -> List[Any]:
+        results = []
+        for index, step in enumerate(steps):
+            method = step.get('method')
+            if method == 'motion_script'\
+                    or method not in self._methods.items:
+                raise ValueError(
+                    f'Step {index}: {method} is not a hardware method')
+            try:
+                result = await self._methods.items[method](
+                    **step.get('params', {}))
+            except Exception as e:
+                raise RuntimeError(
+                    f'Step {index} ({method}) failed: {e!r}') from e
+            result = _jsonable(result, f'Step {index} ({method})')
+            results.append(result)
+            notify(MOTION_SCRIPT_STEP, {'index': index,
+                                        'method': method,
+                                        'result': result,
+                                        'tag': tag})
+        return results
+
+    def _notifier(self) -> Callable[[str, Dict[str, Any]], None]:
+        """ Get the notify method of the connection whose request is being
+        dispatched by the current task """
+        task = asyncio.Task.current_task(loop=self._loop)
+        if task is None:
+            return lambda method, params: None
+        for proto in self._protocol_instances:
+            if proto.dispatching(task):
+                return proto.notify
+        return lambda method, params: None
 
     async def start(self, sock_path: str):
         assert not self.server, 'Server already running'
@@ -206,6 +320,20 @@ class Server:
         self._protocol_instances.clear()
 
 
+def _jsonable(result: Any, step: str) -> Any:
+    """ The result of a script step, or its repr if it is not serializable.
+
+    The step has already run by the time its result is sent, so failing here
+    would hide that from the client.
+    """
+    try:
+        json.dumps(result)
+    except (TypeError, ValueError):
+        LOG.warning(f'{step} result is not serializable: {result!r}')
+        return repr(result)
+    return result
+
+
 def _build_jrpc_error(message, exc) -> str:
     return json.dumps({'jsonrpc': '2.0', 'id': None,
                        'error': {'code': -32063,  # jsonrpc internal error
@@ -239,6 +367,17 @@ class JsonRpcProtocol(asyncio.Protocol):
             task.cancel()
         self._onclose(self)
 
+    def dispatching(self, task: asyncio.Task) -> bool:
+        """ `True` if ``task`` is dispatching a request from this client """
+        return task in self._inflight
+
+    def notify(self, method: str, params: Dict[str, Any]):
+        """ Send a JSON-RPC notification to the client """
+        if self._transport:
+            self._transport.write(json.dumps(
+                {'jsonrpc': '2.0', 'method': method,
+                 'params': params}).encode())
+
     def pause_writing(self):
         self._log.debug('pause writing')
 
@@ -257,16 +396,19 @@ class JsonRpcProtocol(asyncio.Protocol):
             # we saw was "aaaaaaaa" - this would always be invalid because it's
             # impossible to make it valid json just by adding more data.
             # Since we are only accepting jsonrpc, every message should be an
-            # object and therefore should start with {.
-            if self._buffer[0] != '{':
-                obj_start = self._buffer.find('{')
-                if obj_start == -1:
-                    # There is no '{' character in the buffer, wait for more
-                    # data
+            # object or a batch of them and therefore should start with { or
+            # [.
+            if self._buffer[0] not in '{[':
+                starts = [pos for pos in (self._buffer.find('{'),
+                                          self._buffer.find('['))
+                          if pos != -1]
+                if not starts:
+                    # There is no '{' or '[' character in the buffer, wait
+                    # for more data
                     return
                 else:
                     # Recurse now that we've made the buffer safe
-                    self._buffer = self._buffer[obj_start:]
+                    self._buffer = self._buffer[min(starts):]
                     return self.data_received(b'')
             else:
                 # This is an incomplete json object, we can't dispatch anything
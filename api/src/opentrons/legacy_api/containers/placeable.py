@@ -11,6 +11,9 @@ from opentrons.util.vector import Vector
 
 SUPPORTED_MODULES = ['magdeck', 'tempdeck']
 
+# Well names that give their row and column, as in A1
+GRID_NAME_PATTERN = re.compile(r'^([A-Za-z]+)([0-9]+)$')
+
 
 def unpack_location(location):
     """
@@ -102,6 +105,7 @@ class Placeable(object):
         # by name and by reference
         self.children_by_name = OrderedDict()
         self.children_by_reference = OrderedDict()
+        self._invalidate_children()
         self._coordinates = Vector(0, 0, 0)
 
         self.parent = parent
@@ -134,7 +138,7 @@ class Placeable(object):
         if isinstance(name, slice):
             return self.get_children_from_slice(name)
         elif isinstance(name, int):
-            return self.get_children_list()[name]
+            return self._children()[name]
         elif isinstance(name, str):
             return self.get_child_by_name(name)
         else:
@@ -158,10 +162,10 @@ class Placeable(object):
         )
 
     def __iter__(self):
-        return iter(self.get_children_list())
+        return iter(self._children())
 
     def __len__(self):
-        return len(self.get_children_list())
+        return len(self._children())
 
     def __bool__(self):
         return True
@@ -174,9 +178,9 @@ class Placeable(object):
         if not self.get_parent():
             raise Exception('Must have a parent')
 
-        children = self.parent.get_children_list()
-        my_loc = children.index(self)
-        return children[my_loc + 1]
+        parent = self.parent
+        return parent._children()[
+            parent.get_index_from_name(self.get_name()) + 1]
 
     def iter(self):
         """
@@ -209,7 +213,54 @@ class Placeable(object):
         """
         Returns the list of children in the order they were added
         """
-        return list(self.children_by_reference.keys())
+        return list(self._children())
+
+    def _invalidate_children(self):
+        self._children_list = None
+        self._children_names = None
+        self._children_indices = None
+        self._children_items = None
+
+    def _children(self):
+        """
+        Returns the children in the order they were added. The list is shared
+        and must not be changed.
+        """
+        if self._children_list is None:
+            self._children_list = list(self.children_by_reference.keys())
+        return self._children_list
+
+    def _child_names(self):
+        """
+        Returns the names of the children in the order they were added. The
+        list is shared and must not be changed.
+        """
+        if self._children_names is None:
+            self._children_names = list(self.children_by_name.keys())
+        return self._children_names
+
+    def _child_items(self):
+        """
+        Returns a mapping of names to children. The mapping is shared and
+        must not be changed.
+        """
+        if self._children_items is None:
+            self._children_items = dict(self.children_by_name)
+        return self._children_items
+
+    def _series(self, indices=None):
+        """
+        Returns a :WellSeries: of the children at :indices:, or of all the
+        children if :indices: is *None*
+        """
+        children = self._children()
+        if indices is None:
+            return WellSeries._shared(children, self._child_items())
+        indices = list(indices)
+        names = self._child_names()
+        return WellSeries._shared(
+            [children[index] for index in indices],
+            {names[index]: children[index] for index in indices})
 
     def get_path(self, reference=None):
         """
@@ -264,6 +315,7 @@ class Placeable(object):
         child.parent = self
         self.children_by_name[name] = child
         self.children_by_reference[child] = name
+        self._invalidate_children()
 
     def get_deck(self):
         """
@@ -304,8 +356,14 @@ class Placeable(object):
         """
         Retrieves child's name by index
         """
-        return self.get_children_list().index(
-            self.get_child_by_name(name))
+        if self._children_indices is None:
+            self._children_indices = {
+                child_name: index
+                for index, child_name in enumerate(self._child_names())}
+        try:
+            return self._children_indices[name]
+        except KeyError:
+            raise ValueError(f'{name} is not a child of {self}')
 
     def get_children_from_slice(self, s):
         """
@@ -317,7 +375,7 @@ class Placeable(object):
         if isinstance(s.stop, str):
             s = slice(
                 s.start, self.get_index_from_name(s.stop), s.step)
-        return WellSeries(self.get_children_list()[s])
+        return self._series(range(len(self._children()))[s])
 
     def has_children(self):
         """
@@ -525,6 +583,10 @@ class Container(Placeable):
         self.grid_transposed = None
         self.ordering = None
 
+    def add(self, child, name=None, coordinates=None):
+        super(Container, self).add(child, name, coordinates)
+        self.invalidate_grid()
+
     def invalidate_grid(self):
         """
         Invalidates pre-calcualted grid structure for rows and colums
@@ -536,13 +598,16 @@ class Container(Placeable):
         """
         Calculates and stores grid structure
         """
+        if self.grid is not None and self.grid_transposed is not None:
+            return
+        grid = self.get_grid()
+
         if self.grid is None:
-            self.grid = self.get_wellseries(self.get_grid())
+            self.grid = self.get_wellseries(grid)
 
         if self.grid_transposed is None:
             self.grid_transposed = self.get_wellseries(
-                self.transpose(
-                    self.get_grid()))
+                self.transpose(grid))
 
     def get_grid(self):
         """
@@ -551,9 +616,8 @@ class Container(Placeable):
         """
         columns = OrderedDict()
 
-        index_pattern = r'^([A-Za-z]+)([0-9]+)$'
         for name in self.children_by_name:
-            match = re.match(index_pattern, name)
+            match = GRID_NAME_PATTERN.match(name)
             if match:
                 row, col = match.groups(0)
                 if col not in columns:
@@ -646,7 +710,7 @@ class Container(Placeable):
 
         new_wells = None
         if not args and not kwargs:
-            new_wells = WellSeries(self.get_children_list())
+            new_wells = self._series()
         elif len(args) > 1:
             new_wells = WellSeries([self.well(n) for n in args])
         elif 'x' in kwargs or 'y' in kwargs:
@@ -670,21 +734,16 @@ class Container(Placeable):
         """
         return self.wells(*args, **kwargs)
 
-    def get_children_list(self):
-        return super(Container, self).get_children_list()
-
     def _parse_wells_to_and_length(self, *args, **kwargs):
         start = args[0] if len(args) else 0
         stop = kwargs.get('to', None)
         step = kwargs.get('step', 1)
         length = kwargs.get('length', 1)
 
-        wrapped_wells = [
-            w
-            for i in range(3)
-            for w in self.get_children_list()
-        ]
-        total_kids = len(self.get_children_list())
+        # Indices into the children repeated three times, so that ranges
+        # can wrap around the ends
+        total_kids = len(self._children())
+        wrapped_indices = range(3 * total_kids)
 
         if isinstance(start, str):
             start = self.get_index_from_name(start)
@@ -697,14 +756,16 @@ class Container(Placeable):
             elif stop < start:
                 stop -= 1
                 step = step * -1 if step > 0 else step
-            return WellSeries(
-                wrapped_wells[start + total_kids:stop + total_kids:step])
+            return self._series(
+                index % total_kids for index in
+                wrapped_indices[start + total_kids:stop + total_kids:step])
         else:
             if length < 0:
                 length *= -1
                 step = step * -1 if step > 0 else step
-            return WellSeries(
-                wrapped_wells[start + total_kids::step][:length])
+            return self._series(
+                index % total_kids for index in
+                wrapped_indices[start + total_kids::step][:length])
 
     def _parse_wells_x_y(self, *args, **kwargs):
         x = kwargs.get('x', None)
@@ -740,6 +801,21 @@ class WellSeries(Container):
             self.values = wells
         self.offset = 0
         self.name = name
+        self._positions = None
+
+    @classmethod
+    def _shared(cls, values, items, name=None):
+        """
+        Builds a :WellSeries: from a list of wells and a mapping of their
+        names, which are shared rather than copied and must not be changed
+        """
+        series = cls.__new__(cls)
+        series.items = items
+        series.values = values
+        series.offset = 0
+        series.name = name
+        series._positions = None
+        return series
 
     def set_offset(self, offset):
         """
@@ -779,5 +855,24 @@ class WellSeries(Container):
     def get_children_list(self):
         return list(self.values)
 
+    def _children(self):
+        return self.values
+
+    def _series(self, indices=None):
+        if indices is None:
+            return WellSeries._shared(self.values, self.items)
+        return WellSeries([self.values[index] for index in indices])
+
     def get_child_by_name(self, name):
         return self.items.get(name)
+
+    def get_index_from_name(self, name):
+        if self._positions is None:
+            positions = {}
+            for index, well in enumerate(self.values):
+                positions.setdefault(id(well), index)
+            self._positions = positions
+        try:
+            return self._positions[id(self.items[name])]
+        except KeyError:
+            raise ValueError(f'{name} is not in {self}')
@@ -4,7 +4,7 @@ This package defines classes and functions for access through a protocol to
 control the OT2.
 
 """
-from . import back_compat, labware
+from . import back_compat, labware, simulation_pool
 from .contexts import (ProtocolContext,
                        InstrumentContext,
                        TemperatureModuleContext,
@@ -20,4 +20,5 @@ __all__ = ['run_protocol',
            'MagneticModuleContext',
            'ThermocyclerContext',
            'back_compat',
-           'labware']
+           'labware',
+           'simulation_pool']
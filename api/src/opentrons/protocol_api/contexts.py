@@ -108,7 +108,9 @@ class ProtocolContext(CommandPublisher):
         self._commands: List[str] = []
         self._unsubscribe_commands = None
         self.clear_commands()
+        self._load_fixed_trash()
 
+    def _load_fixed_trash(self):
         if fflags.short_fixed_trash():
             trash_name = 'opentrons_1_trash_850ml_fixed'
         else:
@@ -382,10 +384,17 @@ class ProtocolContext(CommandPublisher):
         - unload all labware
         - unload all instruments
         - clear all location and instrument caches
+        - clear the list of commands run
 
         The only state that will be kept is the position of the robot.
         """
-        raise NotImplementedError
+        self._hw_manager.hardware.reset()
+        self._deck_layout = geometry.Deck()
+        self._instruments = {mount: None for mount in types.Mount}
+        self._last_moved_instrument = None
+        self._location_cache = None
+        self.clear_commands()
+        self._load_fixed_trash()
 
     @cmds.publish.both(command=cmds.pause)
     def pause(self, msg=None):
@@ -1,15 +1,18 @@
+import copy
+import functools
 import inspect
 import json
 import logging
 import pkgutil
 import traceback
 import sys
-from typing import Any, Callable, Dict
+import threading
+from typing import Any, Callable, Dict, Optional
 
 import jsonschema  # type: ignore
 
 from .contexts import ProtocolContext
-from . import execute_v1, execute_v3
+from . import execute_v1, execute_v3, simulation_pool
 from opentrons import config
 
 MODULE_LOG = logging.getLogger(__name__)
@@ -135,37 +138,101 @@ def get_protocol_schema_version(protocol_json: Dict[Any, Any]) -> int:
         'Make sure there is a version number under "schemaVersion"')
 
 
-def get_schema_for_protocol(protocol_json: Dict[Any, Any]) -> Dict[Any, Any]:
-    version_num = get_protocol_schema_version(protocol_json)
+def _load_shared_schema(path: str) -> Optional[Dict[Any, Any]]:
     try:
-        schema = pkgutil.get_data(
-            'opentrons',
-            f'shared_data/protocol/schemas/{version_num}.json')
+        schema = pkgutil.get_data('opentrons', f'shared_data/{path}')
     except FileNotFoundError:
         schema = None
+    if not schema:
+        return None
+    return json.loads(schema)
+
+
+@functools.lru_cache()
+def _load_protocol_schema(version_num: int) -> Dict[Any, Any]:
+    schema = _load_shared_schema(f'protocol/schemas/{version_num}.json')
     if not schema:
         raise RuntimeError('JSON Protocol schema "{}" does not exist'
                            .format(version_num))
-    return json.loads(schema)
+    return schema
+
+
+def get_schema_for_protocol(protocol_json: Dict[Any, Any]) -> Dict[Any, Any]:
+    version_num = get_protocol_schema_version(protocol_json)
+    return copy.deepcopy(_load_protocol_schema(version_num))
+
+
+class _ProtocolValidator:
+    """ A prebuilt validator for one version of the JSON protocol schema.
+
+    The protocol's list of steps (``commands``, or ``procedure`` before
+    schema version 3) is checked one step at a time after the rest of the
+    protocol, so validation stops at the first bad step rather than checking
+    the whole list.
+    """
+    def __init__(self, protocol_schema: Dict[Any, Any]) -> None:
+        validator_cls = jsonschema.validators.validator_for(protocol_schema)
+        validator_cls.check_schema(protocol_schema)
+        # instruct schema how to resolve all $ref's used in protocol schemas
+        resolver = jsonschema.RefResolver(
+            protocol_schema.get('$id', ''),
+            protocol_schema,
+            store={
+                "opentronsLabwareSchemaV2": _load_shared_schema(
+                    'labware/schemas/2.json')
+            })
+        properties = protocol_schema.get('properties', {})
+        self._steps_key: Optional[str] = None
+        for key in ('commands', 'procedure'):
+            if 'items' in properties.get(key, {}):
+                self._steps_key = key
+                break
+        if self._steps_key:
+            steps_schema = properties[self._steps_key]
+            outer_schema = {
+                **protocol_schema,
+                'properties': {
+                    **properties,
+                    self._steps_key: {k: v for k, v in steps_schema.items()
+                                      if k != 'items'}}}
+            self._step = validator_cls(
+                steps_schema['items'], resolver=resolver)
+        else:
+            outer_schema = protocol_schema
+        self._protocol = validator_cls(outer_schema, resolver=resolver)
+        # The resolver tracks the scope of the reference being resolved, so
+        # it cannot be used by several threads at once
+        self._lock = threading.Lock()
+
+    def validate(self, protocol_json: Dict[Any, Any]):
+        with self._lock:
+            self._protocol.validate(protocol_json)
+            if not self._steps_key:
+                return
+            for idx, step in enumerate(protocol_json[self._steps_key]):
+                try:
+                    self._step.validate(step)
+                except jsonschema.ValidationError as e:
+                    e.path.extendleft((idx, self._steps_key))
+                    raise
+
+
+@functools.lru_cache()
+def _validator_for_version(version_num: int) -> _ProtocolValidator:
+    return _ProtocolValidator(_load_protocol_schema(version_num))
 
 
 def validate_protocol(protocol_json: Dict[Any, Any]):
-    protocol_schema = get_schema_for_protocol(protocol_json)
+    """ Validate a JSON protocol against the schema for its version.
 
-    # instruct schema how to resolve all $ref's used in protocol schemas
-    labware_schema_v2 = json.loads(  # type: ignore
-        pkgutil.get_data(
-            'opentrons',
-            'shared_data/labware/schemas/2.json'))
+    Validators are built once per schema version and reused.
 
-    resolver = jsonschema.RefResolver(
-        protocol_schema.get('$id', ''),
-        protocol_schema,
-        store={
-            "opentronsLabwareSchemaV2": labware_schema_v2
-        })
-    # do the validation
-    jsonschema.validate(protocol_json, protocol_schema, resolver=resolver)
+    :raises jsonschema.ValidationError: If the protocol is invalid. The
+                                        error is for the first invalid step
+                                        if the rest of the protocol is valid.
+    """
+    version_num = get_protocol_schema_version(protocol_json)
+    _validator_for_version(version_num).validate(protocol_json)
 
 
 def run_protocol(protocol_code: Any = None,
@@ -181,20 +248,25 @@ def run_protocol(protocol_code: Any = None,
     here.
     :param simulate: True to simulate; False to execute. If this is not an
     OT2, ``simulate`` will be forced ``True``.
-    :param context: The context to use. If ``None``, create a new
-    ProtocolContext.
+    :param context: The context to use. If ``None``, use a blank simulating
+    context from :py:func:`.simulation_pool.default_pool`.
     """
     if not config.IS_ROBOT:
         simulate = True # noqa - will be used later
     if None is context and simulate:
-        true_context = ProtocolContext()
-        true_context.home()
-        MODULE_LOG.info("Generating blank protocol context for simulate")
+        MODULE_LOG.info("Using blank protocol context for simulate")
+        with simulation_pool.default_pool().context() as true_context:
+            _run_protocol(protocol_code, protocol_json, true_context)
     elif context:
-        true_context = context
+        _run_protocol(protocol_code, protocol_json, context)
     else:
         raise RuntimeError(
             'Will not automatically generate hardware controller')
+
+
+def _run_protocol(protocol_code: Any,
+                  protocol_json: Optional[Dict[Any, Any]],
+                  true_context: ProtocolContext):
     if None is not protocol_code:
         _run_python(protocol_code, true_context)
     elif None is not protocol_json:
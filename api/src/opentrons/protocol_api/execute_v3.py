@@ -1,5 +1,6 @@
+import functools
 import logging
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List
 
 from .contexts import ProtocolContext, InstrumentContext
 from . import labware
@@ -30,21 +31,34 @@ def _get_well(loaded_labware: Dict[str, labware.Labware],
     return plate[well]
 
 
+#: A compiled protocol step, ready to run
+Operation = Callable[[], Any]
+
+
 # TODO (Ian 2019-04-05) once Pipette commands allow flow rate as an
 # absolute value (not % value) as an argument in
 # aspirate/dispense/blowout/air_gap fns, remove this
-def _set_flow_rate(pipette, params) -> None:
+class _SetFlowRate:
     """
     Set flow rate in uL/mm, to value obtained from command's params.
     """
+    def __init__(self, pipette: InstrumentContext, flow_rate: float) -> None:
+        self.pipette = pipette
+        self.flow_rate = flow_rate
+
+    def __call__(self) -> None:
+        self.pipette.flow_rate.aspirate = self.flow_rate
+        self.pipette.flow_rate.dispense = self.flow_rate
+        self.pipette.flow_rate.blow_out = self.flow_rate
+
+
+def _set_flow_rate(pipette, params) -> _SetFlowRate:
     flow_rate_param = params['flowRate']
 
     if not (flow_rate_param > 0):
         raise RuntimeError('Positive flowRate param required')
 
-    pipette.flow_rate.aspirate = flow_rate_param
-    pipette.flow_rate.dispense = flow_rate_param
-    pipette.flow_rate.blow_out = flow_rate_param
+    return _SetFlowRate(pipette, flow_rate_param)
 
 
 def load_labware_from_json_defs(
@@ -78,76 +92,84 @@ def _get_location_with_offset(loaded_labware: Dict[str, labware.Labware],
 
 
 def _delay(
-        context, protocol_data, instruments, loaded_labware, params) -> None:
+        context, protocol_data, instruments, loaded_labware, params
+) -> List[Operation]:
     wait = params['wait']
     message = params.get('message')
     if wait is None or wait is False:
         raise ValueError('Delay must be true, or a number')
     elif wait is True:
         message = message or 'Pausing until user resumes'
-        context.pause(msg=message)
+        return [functools.partial(context.pause, msg=message)]
     else:
-        context.delay(seconds=wait, msg=message)
+        return [functools.partial(context.delay, seconds=wait, msg=message)]
 
 
 def _blowout(
-        context, protocol_data, instruments, loaded_labware, params) -> None:
+        context, protocol_data, instruments, loaded_labware, params
+) -> List[Operation]:
     pipette_id = params['pipette']
     pipette = instruments[pipette_id]
     well = _get_well(loaded_labware, params)
-    _set_flow_rate(pipette, params)
-    pipette.blow_out(well)
+    return [_set_flow_rate(pipette, params),
+            functools.partial(pipette.blow_out, well)]
 
 
 def _pick_up_tip(
-        context, protocol_data, instruments, loaded_labware, params) -> None:
+        context, protocol_data, instruments, loaded_labware, params
+) -> List[Operation]:
     pipette_id = params['pipette']
     pipette = instruments[pipette_id]
     well = _get_well(loaded_labware, params)
-    pipette.pick_up_tip(well)
+    return [functools.partial(pipette.pick_up_tip, well)]
 
 
 def _drop_tip(
-        context, protocol_data, instruments, loaded_labware, params) -> None:
+        context, protocol_data, instruments, loaded_labware, params
+) -> List[Operation]:
     pipette_id = params['pipette']
     pipette = instruments[pipette_id]
     well = _get_well(loaded_labware, params)
-    pipette.drop_tip(well)
+    return [functools.partial(pipette.drop_tip, well)]
 
 
 def _aspirate(
-        context, protocol_data, instruments, loaded_labware, params) -> None:
+        context, protocol_data, instruments, loaded_labware, params
+) -> List[Operation]:
     pipette_id = params['pipette']
     pipette = instruments[pipette_id]
     location = _get_location_with_offset(loaded_labware, params)
     volume = params['volume']
-    _set_flow_rate(pipette, params)
-    pipette.aspirate(volume, location)
+    return [_set_flow_rate(pipette, params),
+            functools.partial(pipette.aspirate, volume, location)]
 
 
 def _dispense(
-        context, protocol_data, instruments, loaded_labware, params) -> None:
+        context, protocol_data, instruments, loaded_labware, params
+) -> List[Operation]:
     pipette_id = params['pipette']
     pipette = instruments[pipette_id]
     location = _get_location_with_offset(loaded_labware, params)
     volume = params['volume']
-    _set_flow_rate(pipette, params)
-    pipette.dispense(volume, location)
+    return [_set_flow_rate(pipette, params),
+            functools.partial(pipette.dispense, volume, location)]
 
 
 def _touch_tip(
-        context, protocol_data, instruments, loaded_labware, params) -> None:
+        context, protocol_data, instruments, loaded_labware, params
+) -> List[Operation]:
     pipette_id = params['pipette']
     pipette = instruments[pipette_id]
     location = _get_location_with_offset(loaded_labware, params)
     well = _get_well(loaded_labware, params)
     # convert mmFromBottom to v_offset
     v_offset = location.point.z - well.top().point.z
-    pipette.touch_tip(well, v_offset=v_offset)
+    return [functools.partial(pipette.touch_tip, well, v_offset=v_offset)]
 
 
 def _move_to_slot(
-        context, protocol_data, instruments, loaded_labware, params) -> None:
+        context, protocol_data, instruments, loaded_labware, params
+) -> List[Operation]:
     pipette_id = params['pipette']
     pipette = instruments[pipette_id]
     slot = params['slot']
@@ -162,33 +184,60 @@ def _move_to_slot(
         offset.get('y', 0),
         offset.get('z', 0))
 
-    pipette.move_to(
+    return [functools.partial(
+        pipette.move_to,
         slot_obj.move(offsetPoint),
         force_direct=params.get('forceDirect'),
-        minimum_z_height=params.get('minimumZHeight'))
-
-
-def dispatch_json(context: ProtocolContext,
-                  protocol_data: Dict[Any, Any],
-                  instruments: Dict[str, InstrumentContext],
-                  loaded_labware: Dict[str, labware.Labware]) -> None:
-    commands = protocol_data['commands']
-    dispatcher_map = {
-        "delay": _delay,
-        "blowout": _blowout,
-        "pickUpTip": _pick_up_tip,
-        "dropTip": _drop_tip,
-        "aspirate": _aspirate,
-        "dispense": _dispense,
-        "touchTip": _touch_tip,
-        "moveToSlot": _move_to_slot
-    }
-    for command_item in commands:
+        minimum_z_height=params.get('minimumZHeight'))]
+
+
+dispatcher_map = {
+    "delay": _delay,
+    "blowout": _blowout,
+    "pickUpTip": _pick_up_tip,
+    "dropTip": _drop_tip,
+    "aspirate": _aspirate,
+    "dispense": _dispense,
+    "touchTip": _touch_tip,
+    "moveToSlot": _move_to_slot
+}
+
+
+def compile_json(context: ProtocolContext,
+                 protocol_data: Dict[Any, Any],
+                 instruments: Dict[str, InstrumentContext],
+                 loaded_labware: Dict[str, labware.Labware]
+                 ) -> List[Operation]:
+    """ Turn the commands of a JSON protocol into operations to run.
+
+    Pipettes, wells and locations are looked up once here rather than as
+    each command runs, and flow rates are only set when they change. The
+    operations are bound to ``context``, its instruments and its labware.
+    """
+    operations: List[Operation] = []
+    flow_rates: Dict[int, float] = {}
+    for command_item in protocol_data['commands']:
         command_type = command_item['command']
         params = command_item['params']
 
         if command_type not in dispatcher_map:
             raise RuntimeError(
                 "Unsupported command type {}".format(command_type))
-        dispatcher_map[command_type](
-            context, protocol_data, instruments, loaded_labware, params)
+        for operation in dispatcher_map[command_type](
+                context, protocol_data, instruments, loaded_labware, params):
+            if isinstance(operation, _SetFlowRate):
+                key = id(operation.pipette)
+                if flow_rates.get(key) == operation.flow_rate:
+                    continue
+                flow_rates[key] = operation.flow_rate
+            operations.append(operation)
+    return operations
+
+
+def dispatch_json(context: ProtocolContext,
+                  protocol_data: Dict[Any, Any],
+                  instruments: Dict[str, InstrumentContext],
+                  loaded_labware: Dict[str, labware.Labware]) -> None:
+    for operation in compile_json(
+            context, protocol_data, instruments, loaded_labware):
+        operation()
@@ -130,7 +130,8 @@ class Deck(UserDict):
                                                 idx // 3 * row_offset,
                                                 0)
                            for idx in range(12)}
-        self._highest_z = 0.0
+        # None when an item has changed since the highest z was calculated
+        self._highest_z: Optional[float] = 0.0
         # TODO: support deck loadName as a param
         def_path = 'shared_data/deck/definitions/1/ot2_standard.json'
         self._definition = json.loads(  # type: ignore
@@ -166,6 +167,7 @@ class Deck(UserDict):
         old = self.data[checked_key]
         self.data[checked_key] = None
         if old:
+            old.set_geometry_callback(None)
             self.recalculate_high_z()
 
     def __setitem__(self, key: types.DeckLocation, val: DeckItem) -> None:
@@ -182,7 +184,9 @@ class Deck(UserDict):
                 raise ValueError('Deck location {} already has an item: {}'
                                  .format(key, self.data[key_int]))
         self.data[key_int] = val
-        self._highest_z = max(val.highest_z, self._highest_z)
+        val.set_geometry_callback(self._invalidate_high_z)
+        if self._highest_z is not None:
+            self._highest_z = max(val.highest_z, self._highest_z)
 
     def __contains__(self, key: object) -> bool:
         try:
@@ -200,6 +204,9 @@ class Deck(UserDict):
         for item in [lw for lw in self.data.values() if lw]:
             self._highest_z = max(item.highest_z, self._highest_z)
 
+    def _invalidate_high_z(self):
+        self._highest_z = None
+
     def get_slot_definition(self, slot_name) -> Dict[str, Any]:
         slots: List[Dict] = self._definition['locations']['orderedSlots']
         slot_def = next(
@@ -235,8 +242,14 @@ class Deck(UserDict):
 
     @property
     def highest_z(self) -> float:
-        """ Return the tallest known point on the deck. """
-        return self._highest_z
+        """ Return the tallest known point on the deck.
+
+        This is cached, and recalculated only after an item on the deck has
+        been calibrated or has had labware placed on or removed from it.
+        """
+        if self._highest_z is None:
+            self.recalculate_high_z()
+        return self._highest_z  # type: ignore
 
     @property
     def slots(self) -> List[Dict]:
@@ -7,6 +7,7 @@ and labware calibration offsets. It contains all the code necessary to
 transform from labware symbolic points (such as "well a1 of an opentrons
 tiprack") to points in deck coordinates.
 """
+import copy
 import logging
 import json
 import re
@@ -14,12 +15,15 @@ import time
 import pkgutil
 import shutil
 import sys
+import threading
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from enum import Enum, auto
 from hashlib import sha256
 from itertools import takewhile, dropwhile
-from typing import Any, List, Dict, Optional, Union, Tuple
+from typing import Any, Callable, List, Dict, Optional, Union, Tuple
+
+import numpy as np  # type: ignore
 
 from opentrons.types import Location
 from opentrons.types import Point
@@ -32,6 +36,8 @@ OPENTRONS_NAMESPACE = 'opentrons'
 CUSTOM_NAMESPACE = 'custom_beta'
 STANDARD_DEFS_PATH = Path(sys.modules['opentrons'].__file__).parent /\
     'shared_data' / 'labware' / 'definitions' / '2'
+# The number of parsed labware definitions to keep in memory
+DEFINITION_CACHE_SIZE = 64
 
 
 class OutOfTipsError(Exception):
@@ -49,17 +55,113 @@ well_shapes = {
 }
 
 
+class WellGeometry:
+    """
+    The geometry of a set of wells, stored as arrays with one row per well.
+
+    Positions are the top-center of each well. They are stored both relative
+    to the front-left corner of the parent labware and as absolute deck
+    coordinates. A geometry is not changed once built; use
+    :py:meth:`at_origin` to get one for a different absolute position.
+
+    The absolute top, bottom and center of each well are also kept as
+    :py:class:`.Point` objects, which are built the first time they are
+    needed.
+    """
+    def __init__(self, well_props: List[dict], origin: Point) -> None:
+        """
+        :param well_props: a list of dicts that conform to the json-schema for
+                           a Well
+        :param origin: the absolute position of the front-left corner of the
+                       parent of the wells
+        """
+        self.shapes: List[WellShape] = []
+        sizes: List[Tuple[float, float]] = []
+        for props in well_props:
+            shape = well_shapes.get(props['shape'])
+            if shape is None:
+                raise ValueError(
+                    'Shape "{}" is not a supported well shape'.format(
+                        props['shape']))
+            if shape is WellShape.RECTANGULAR:
+                sizes.append((props['xDimension'], props['yDimension']))
+            else:
+                sizes.append((props['diameter'], props['diameter']))
+            self.shapes.append(shape)
+        self.offsets = np.array(
+            [(props['x'], props['y'], props['z'] + props['depth'])
+             for props in well_props], dtype=float).reshape(-1, 3)
+        self.depths = np.array(
+            [props['depth'] for props in well_props], dtype=float)
+        #: The x and y dimensions of each well, which for circular wells are
+        #: both the diameter
+        self.sizes = np.array(sizes, dtype=float).reshape(-1, 2)
+        self.max_volumes = [props['totalLiquidVolume']
+                            for props in well_props]
+        self._set_origin(origin)
+
+    def at_origin(self, origin: Point) -> 'WellGeometry':
+        """ Get the same geometry for a different absolute position of the
+        front-left corner of the wells' parent """
+        moved = copy.copy(self)
+        moved._set_origin(origin)
+        return moved
+
+    def _set_origin(self, origin: Point):
+        self.tops = self.offsets + np.array(origin, dtype=float)
+        self._top_points = [Point(*top) for top in self.tops.tolist()]
+        self._bottom_points: Optional[List[Point]] = None
+        self._center_points: Optional[List[Point]] = None
+
+    @property
+    def centers(self) -> np.ndarray:
+        """ The absolute center of each well """
+        return self.tops - np.outer(self.depths / 2.0, (0, 0, 1))
+
+    def top_point(self, index: int) -> Point:
+        return self._top_points[index]
+
+    def bottom_point(self, index: int) -> Point:
+        if self._bottom_points is None:
+            self._bottom_points = [
+                Point(x, y, z - depth) for (x, y, z), depth
+                in zip(self.tops.tolist(), self.depths.tolist())]
+        return self._bottom_points[index]
+
+    def center_point(self, index: int) -> Point:
+        if self._center_points is None:
+            self._center_points = [
+                Point(x, y, z - (depth / 2.0)) for (x, y, z), depth
+                in zip(self.tops.tolist(), self.depths.tolist())]
+        return self._center_points[index]
+
+    def depth(self, index: int) -> float:
+        return float(self.depths[index])
+
+    def size(self, index: int) -> Tuple[float, float]:
+        x_size, y_size = self.sizes[index]
+        return float(x_size), float(y_size)
+
+
 class Well:
     """
     The Well class represents a  single well in a :py:class:`Labware`
 
     It provides functions to return positions used in operations on the well
     such as :py:meth:`top`, :py:meth:`bottom`
+
+    Its geometry is a row of a :py:class:`WellGeometry`, which is shared with
+    the other wells of its labware when it is built by a :py:class:`Labware`.
     """
-    def __init__(self, well_props: dict,
+    __slots__ = ('_display_name', '_parent', '_has_tip', '_geometry',
+                 '_index', 'max_volume')
+
+    def __init__(self, well_props: Optional[dict],
                  parent: Location,
                  display_name: str,
-                 has_tip: bool) -> None:
+                 has_tip: bool,
+                 geometry: WellGeometry = None,
+                 index: int = 0) -> None:
         """
         Create a well, and track the Point corresponding to the top-center of
         the well (this Point is in absolute deck coordinates)
@@ -70,36 +172,28 @@ class Well:
             "Well D1 of Biorad 96 PCR Plate on Magnetic Module in Slot 1".
             This is created by the caller and passed in, so here it is just
             saved and made available.
-        :param well_props: a dict that conforms to the json-schema for a Well
+        :param well_props: a dict that conforms to the json-schema for a Well.
+                           Ignored if `geometry` is specified.
         :param parent: a :py:class:`.Location` Point representing the absolute
                        position of the parent of the Well (usually the
                        front-left corner of a labware)
+        :param geometry: a :py:class:`WellGeometry` that already holds this
+                         well's geometry
+        :param index: the row of `geometry` that describes this well
         """
         self._display_name = display_name
-        self._position\
-            = Point(well_props['x'],
-                    well_props['y'],
-                    well_props['z'] + well_props['depth']) + parent.point
-
         if not parent.labware:
             raise ValueError("Wells must have a parent")
         self._parent = parent.labware
         self._has_tip = has_tip
-        self._shape = well_shapes.get(well_props['shape'])
-        if self._shape is WellShape.RECTANGULAR:
-            self._length = well_props['xDimension']
-            self._width = well_props['yDimension']
-            self._diameter = None
-        elif self._shape is WellShape.CIRCULAR:
-            self._length = None
-            self._width = None
-            self._diameter = well_props['diameter']
-        else:
-            raise ValueError(
-                'Shape "{}" is not a supported well shape'.format(
-                    well_props['shape']))
-        self.max_volume = well_props['totalLiquidVolume']
-        self._depth = well_props['depth']
+        if geometry is None:
+            if well_props is None:
+                raise ValueError("Wells must have properties or a geometry")
+            geometry = WellGeometry([well_props], parent.point)
+            index = 0
+        self._geometry = geometry
+        self._index = index
+        self.max_volume = geometry.max_volumes[index]
 
     @property
     def parent(self) -> 'Labware':
@@ -113,6 +207,36 @@ class Well:
     def has_tip(self, value: bool):
         self._has_tip = value
 
+    @property
+    def _position(self) -> Point:
+        return self._geometry.top_point(self._index)
+
+    @property
+    def _shape(self) -> WellShape:
+        return self._geometry.shapes[self._index]
+
+    @property
+    def _depth(self) -> float:
+        return self._geometry.depth(self._index)
+
+    @property
+    def _length(self) -> Optional[float]:
+        if self._shape is WellShape.RECTANGULAR:
+            return self._geometry.size(self._index)[0]
+        return None
+
+    @property
+    def _width(self) -> Optional[float]:
+        if self._shape is WellShape.RECTANGULAR:
+            return self._geometry.size(self._index)[1]
+        return None
+
+    @property
+    def _diameter(self) -> Optional[float]:
+        if self._shape is WellShape.CIRCULAR:
+            return self._geometry.size(self._index)[0]
+        return None
+
     @property
     def diameter(self) -> Optional[float]:
         return self._diameter
@@ -125,7 +249,10 @@ class Well:
                  front-left corner of slot 1 as (0,0,0)). If z is specified,
                  returns a point offset by z mm from top-center
         """
-        return Location(self._position + Point(0, 0, z), self)
+        top = self._position
+        if z:
+            top = top._replace(z=top.z + z)
+        return Location(top, self)
 
     def bottom(self, z: float = 0.0) -> Location:
         """
@@ -135,9 +262,10 @@ class Well:
                  slot 1 as (0,0,0)). If z is specified, returns a point
                  offset by z mm from bottom-center
         """
-        top = self.top()
-        bottom_z = top.point.z - self._depth + z
-        return Location(Point(x=top.point.x, y=top.point.y, z=bottom_z), self)
+        bottom = self._geometry.bottom_point(self._index)
+        if z:
+            bottom = bottom._replace(z=bottom.z + z)
+        return Location(bottom, self)
 
     def center(self) -> Location:
         """
@@ -145,9 +273,7 @@ class Well:
         of the well relative to the deck (with the front-left corner of slot 1
         as (0,0,0))
         """
-        top = self.top()
-        center_z = top.point.z - (self._depth / 2.0)
-        return Location(Point(x=top.point.x, y=top.point.y, z=center_z), self)
+        return Location(self._geometry.center_point(self._index), self)
 
     def _from_center_cartesian(
             self, x: float, y: float, z: float) -> Point:
@@ -171,12 +297,7 @@ class Well:
         coordinates
         """
         center = self.center()
-        if self._shape is WellShape.RECTANGULAR:
-            x_size = self._length
-            y_size = self._width
-        else:
-            x_size = self._diameter
-            y_size = self._diameter
+        x_size, y_size = self._geometry.size(self._index)
         z_size = self._depth
 
         return Point(
@@ -254,7 +375,9 @@ class Labware:
         self._wells: List[Well] = []
         # Directly from definition
         self._well_definition = definition['wells']
-        self._parameters = definition['parameters']
+        # Copied because tip length calibration updates the parameters, and
+        # definitions may be shared with other labware
+        self._parameters = dict(definition['parameters'])
         offset = definition['cornerOffsetFromSlot']
         self._dimensions = definition['dimensions']
         # Inferred from definition
@@ -264,14 +387,27 @@ class Labware:
         self._offset\
             = Point(offset['x'], offset['y'], offset['z']) + parent.point
         self._parent = parent.labware
+        self._pattern = re.compile(r'^([A-Z]+)([1-9][0-9]*)$', re.X)
+        self._well_geometry = WellGeometry(
+            [self._well_definition[well] for well in self._ordering],
+            self._offset)
+        self._row_indices = self._create_indexed_dictionary(group=1)
+        self._column_indices = self._create_indexed_dictionary(group=2)
+        self._row_names = sorted(self._row_indices)
+        self._column_names = sorted(self._column_indices, key=lambda x: int(x))
+        # The index in rows() of the row of each well, by well index
+        self._well_rows: List[Optional[int]] = [None] * len(self._ordering)
+        for row_index, row_name in enumerate(self._row_names):
+            for index in self._row_indices[row_name]:
+                self._well_rows[index] = row_index
+        self._geometry_callback: Optional[Callable[[], None]] = None
         # Applied properties
         self.set_calibration(self._calibrated_offset)
 
-        self._pattern = re.compile(r'^([A-Z]+)([1-9][0-9]*)$', re.X)
         self._definition = definition
 
     def __getitem__(self, key: str) -> Well:
-        return self.wells_by_name()[key]
+        return self._wells_by_name[key]
 
     @property
     def parent(self) -> Union['Labware', 'Well', str, 'ModuleGeometry', None]:
@@ -309,25 +445,34 @@ class Labware:
         """
         return [
             Well(
-                self._well_definition[well],
+                None,
                 Location(self._calibrated_offset, self),
                 "{} of {}".format(well, self._display_name),
-                self.is_tiprack)
-            for well in self._ordering]
+                self.is_tiprack,
+                self._well_geometry,
+                index)
+            for index, well in enumerate(self._ordering)]
 
-    def _create_indexed_dictionary(self, group=0):
+    def _create_indexed_dictionary(self, group=0) -> Dict[str, List[int]]:
         """
-        Creates a dict of lists of Wells. Which way the labware is segmented
-        determines whether this is a dict of rows or dict of columns. If group
-        is 1, then it will collect wells that have the same alphabetic prefix
-        and therefore are considered to be in the same row. If group is 2, it
-        will collect wells that have the same numeric postfix and therefore
-        are considered to be in the same column.
+        Creates a dict of lists of well indices. Which way the labware is
+        segmented determines whether this is a dict of rows or dict of columns.
+        If group is 1, then it will collect wells that have the same alphabetic
+        prefix and therefore are considered to be in the same row. If group is
+        2, it will collect wells that have the same numeric postfix and
+        therefore are considered to be in the same column.
+
+        This is only called when the labware is created; the accessors use
+        the dicts of wells built from it in :py:meth:`set_calibration`.
         """
-        dict_list = defaultdict(list)
-        for index, well_obj in zip(self._ordering, self._wells):
-            dict_list[self._pattern.match(index).group(group)].append(well_obj)
-        return dict_list
+        dict_list: Dict[str, List[int]] = defaultdict(list)
+        for index, name in enumerate(self._ordering):
+            match = self._pattern.match(name)
+            # Wells with names outside the row/column pattern are only
+            # reachable through wells and wells_by_name
+            if match:
+                dict_list[match.group(group)].append(index)
+        return dict(dict_list)
 
     def set_calibration(self, delta: Point):
         """
@@ -336,7 +481,28 @@ class Labware:
         self._calibrated_offset = Point(x=self._offset.x + delta.x,
                                         y=self._offset.y + delta.y,
                                         z=self._offset.z + delta.z)
+        self._well_geometry = self._well_geometry.at_origin(
+            self._calibrated_offset)
         self._wells = self._build_wells()
+        self._wells_by_name = dict(zip(self._ordering, self._wells))
+        self._rows_by_name = {
+            name: [self._wells[idx] for idx in indices]
+            for name, indices in self._row_indices.items()}
+        self._columns_by_name = {
+            name: [self._wells[idx] for idx in indices]
+            for name, indices in self._column_indices.items()}
+        if self._geometry_callback:
+            self._geometry_callback()
+
+    def set_geometry_callback(
+            self, callback: Optional[Callable[[], None]]) -> None:
+        """
+        Set a function to be called whenever the position of this labware
+        changes, so that whatever holds it can update positions it caches
+        (such as :py:attr:`.Deck.highest_z`). Only one callback is kept;
+        passing None removes it.
+        """
+        self._geometry_callback = callback
 
     @property
     def calibrated_offset(self) -> Point:
@@ -347,7 +513,7 @@ class Labware:
         if isinstance(idx, int):
             res = self._wells[idx]
         elif isinstance(idx, str):
-            res = self.wells_by_name()[idx]
+            res = self._wells_by_name[idx]
         else:
             res = NotImplemented
         return res
@@ -374,7 +540,7 @@ class Labware:
         elif isinstance(args[0], int):
             res = [self._wells[idx] for idx in args]
         elif isinstance(args[0], str):
-            res = [self.wells_by_name()[idx] for idx in args]
+            res = [self._wells_by_name[idx] for idx in args]
         else:
             raise TypeError
         return res
@@ -389,8 +555,7 @@ class Labware:
 
         :return: Dictionary of well objects keyed by well name
         """
-        return {well: wellObj
-                for well, wellObj in zip(self._ordering, self._wells)}
+        return dict(self._wells_by_name)
 
     def wells_by_index(self) -> Dict[str, Well]:
         MODULE_LOG.warning(
@@ -414,19 +579,35 @@ class Labware:
 
         :return: A list of row lists
         """
-        row_dict = self._create_indexed_dictionary(group=1)
-        keys = sorted(row_dict)
+        row_dict = self._rows_by_name
+        keys = self._row_names
 
         if not args:
-            res = [row_dict[key] for key in keys]
+            res = [list(row_dict[key]) for key in keys]
         elif isinstance(args[0], int):
-            res = [row_dict[keys[idx]] for idx in args]
+            res = [list(row_dict[keys[idx]]) for idx in args]
         elif isinstance(args[0], str):
-            res = [row_dict[idx] for idx in args]
+            res = [list(row_dict.get(idx, [])) for idx in args]
         else:
             raise TypeError
         return res
 
+    def row_index(self, well: Well) -> Optional[int]:
+        """
+        The index in :py:meth:`rows` of the row that holds a well.
+
+        Wells handed out before the labware was recalibrated are still
+        found, by their place in the labware rather than their position.
+
+        :return: The index of the row, or ``None`` if the well is not one of
+                 this labware's wells or is not in a row
+        """
+        # Recalibrated geometries share their offsets with the original
+        if well.parent is not self\
+                or well._geometry.offsets is not self._well_geometry.offsets:
+            return None
+        return self._well_rows[well._index]
+
     def rows_by_name(self) -> Dict[str, List[Well]]:
         """
         Accessor function used to navigate through a labware by row name.
@@ -437,8 +618,9 @@ class Labware:
 
         :return: Dictionary of Well lists keyed by row name
         """
-        row_dict = self._create_indexed_dictionary(group=1)
-        return row_dict
+        return defaultdict(
+            list,
+            ((name, list(row)) for name, row in self._rows_by_name.items()))
 
     def rows_by_index(self) -> Dict[str, List[Well]]:
         MODULE_LOG.warning(
@@ -463,15 +645,15 @@ class Labware:
 
         :return: A list of column lists
         """
-        col_dict = self._create_indexed_dictionary(group=2)
-        keys = sorted(col_dict, key=lambda x: int(x))
+        col_dict = self._columns_by_name
+        keys = self._column_names
 
         if not args:
-            res = [col_dict[key] for key in keys]
+            res = [list(col_dict[key]) for key in keys]
         elif isinstance(args[0], int):
-            res = [col_dict[keys[idx]] for idx in args]
+            res = [list(col_dict[keys[idx]]) for idx in args]
         elif isinstance(args[0], str):
-            res = [col_dict[idx] for idx in args]
+            res = [list(col_dict.get(idx, [])) for idx in args]
         else:
             raise TypeError
         return res
@@ -487,8 +669,9 @@ class Labware:
 
         :return: Dictionary of Well lists keyed by column name
         """
-        col_dict = self._create_indexed_dictionary(group=2)
-        return col_dict
+        return defaultdict(
+            list,
+            ((name, list(col)) for name, col in self._columns_by_name.items()))
 
     def columns_by_index(self) -> Dict[str, List[Well]]:
         MODULE_LOG.warning(
@@ -736,15 +919,34 @@ class ModuleGeometry:
         self._location = Location(
             point=self._offset + self._parent.point,
             labware=self)
+        self._geometry_callback: Optional[Callable[[], None]] = None
 
     def add_labware(self, labware: Labware) -> Labware:
         assert not self._labware,\
             '{} is already on this module'.format(self._labware)
         self._labware = labware
+        labware.set_geometry_callback(self._geometry_changed)
+        self._geometry_changed()
         return self._labware
 
     def reset_labware(self):
+        if self._labware:
+            self._labware.set_geometry_callback(None)
         self._labware = None
+        self._geometry_changed()
+
+    def set_geometry_callback(
+            self, callback: Optional[Callable[[], None]]) -> None:
+        """
+        Set a function to be called whenever the extent of this module
+        changes, including when its labware is added, removed or calibrated.
+        Only one callback is kept; passing None removes it.
+        """
+        self._geometry_callback = callback
+
+    def _geometry_changed(self):
+        if self._geometry_callback:
+            self._geometry_callback()
 
     @property
     def load_name(self):
@@ -818,7 +1020,7 @@ class ThermocyclerGeometry(ModuleGeometry):
     # NOTE: this func is unused until "semi" configuration
     def labware_accessor(self, labware: Labware) -> Labware:
         # Block first three columns from being accessed
-        definition = labware._definition
+        definition = dict(labware._definition)
         definition['ordering'] = definition['ordering'][3::]
         return Labware(definition, super().location)
 
@@ -827,8 +1029,7 @@ class ThermocyclerGeometry(ModuleGeometry):
             '{} is already on this module'.format(self._labware)
         assert self.lid_status != 'closed', \
             'Cannot place labware in closed module'
-        self._labware = labware
-        return self._labware
+        return super().add_labware(labware)
 
 
 def _get_parent_identifier(
@@ -950,6 +1151,124 @@ def _get_path_to_labware(load_name: str, namespace: str, version: int) -> Path:
     return def_path
 
 
+class _DefinitionStore:
+    """
+    An index of every labware definition file, keyed by (namespace,
+    load_name, version), with a least-recently-used cache of the parsed
+    definitions that is invalidated when a file's modification time changes.
+
+    The index of bundled definitions is built on first use. The index of
+    custom definitions is rebuilt whenever the custom definitions directory
+    changes, and is kept up to date by :py:func:`save_definition` and
+    :py:func:`delete_all_custom_labware`.
+    """
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._bundled: Optional[Dict[Tuple[str, str, int], Path]] = None
+        self._custom: Dict[Tuple[str, str, int], Path] = {}
+        self._custom_dir: Optional[Path] = None
+        self._parsed: 'OrderedDict[Path, Tuple[float, Dict[str, Any]]]'\
+            = OrderedDict()
+
+    @staticmethod
+    def _index_dir(base_path: Path, namespace: str = None)\
+            -> Dict[Tuple[str, str, int], Path]:
+        """ Index definitions laid out as base/[namespace/]load_name/N.json
+        """
+        index: Dict[Tuple[str, str, int], Path] = {}
+        if not base_path.is_dir():
+            return index
+        if namespace:
+            namespace_dirs = [(namespace, base_path)]
+        else:
+            namespace_dirs = [(d.name, d) for d in base_path.iterdir()
+                              if d.is_dir()]
+        for ns, ns_dir in namespace_dirs:
+            for lw_dir in ns_dir.iterdir():
+                if not lw_dir.is_dir():
+                    continue
+                for def_file in lw_dir.glob('*.json'):
+                    try:
+                        version = int(def_file.stem)
+                    except ValueError:
+                        continue
+                    index[(ns, lw_dir.name, version)] = def_file
+        return index
+
+    def _refresh_index(self):
+        if self._bundled is None:
+            self._bundled = self._index_dir(
+                STANDARD_DEFS_PATH, OPENTRONS_NAMESPACE)
+        custom_dir = CONFIG['labware_user_definitions_dir_v2']
+        if custom_dir != self._custom_dir:
+            self._custom = self._index_dir(custom_dir)
+            self._custom_dir = custom_dir
+
+    def find(self, load_name: str, namespace: str, version: int)\
+            -> Optional[Path]:
+        """ Return the path of a definition, or None if it does not exist
+        """
+        key = (namespace, load_name, version)
+        with self._lock:
+            self._refresh_index()
+            if namespace == OPENTRONS_NAMESPACE:
+                return self._bundled.get(key)  # type: ignore
+            path = self._custom.get(key)
+            if path is None:
+                # Custom definitions may have been added by another process
+                candidate = _get_path_to_labware(load_name, namespace, version)
+                if candidate.is_file():
+                    path = self._custom[key] = candidate
+            return path
+
+    def load(self, path: Path) -> Dict[str, Any]:
+        """ Return the parsed definition at path, from the cache if the file
+        has not changed since it was last read
+
+        :raises FileNotFoundError: If the file no longer exists
+        """
+        with self._lock:
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                self._forget(path)
+                raise
+            cached = self._parsed.get(path)
+            if cached and cached[0] == mtime:
+                self._parsed.move_to_end(path)
+                return cached[1]
+            with open(path, 'r') as f:
+                labware_def = json.load(f)
+            self._parsed[path] = (mtime, labware_def)
+            self._parsed.move_to_end(path)
+            while len(self._parsed) > self._max_size:
+                self._parsed.popitem(last=False)
+            return labware_def
+
+    def _forget(self, path: Path):
+        self._parsed.pop(path, None)
+        for key, indexed in list(self._custom.items()):
+            if indexed == path:
+                del self._custom[key]
+
+    def add_custom(self, load_name: str, namespace: str, version: int,
+                   path: Path):
+        with self._lock:
+            self._refresh_index()
+            self._custom[(namespace, load_name, version)] = path
+            self._parsed.pop(path, None)
+
+    def clear_custom(self):
+        with self._lock:
+            for path in self._custom.values():
+                self._parsed.pop(path, None)
+            self._custom = {}
+
+
+_definition_store = _DefinitionStore(DEFINITION_CACHE_SIZE)
+
+
 def save_definition(
     labware_def: Dict[str, Any],
     force: bool = False
@@ -987,12 +1306,14 @@ def save_definition(
     Path(def_path).parent.mkdir(parents=True, exist_ok=True)
     with open(def_path, 'w') as f:
         json.dump(labware_def, f)
+    _definition_store.add_custom(load_name, namespace, version, def_path)
 
 
 def delete_all_custom_labware() -> None:
     custom_def_dir = CONFIG['labware_user_definitions_dir_v2']
     if custom_def_dir.is_dir():
         shutil.rmtree(custom_def_dir)
+    _definition_store.clear_custom()
 
 
 def get_labware_definition(
@@ -1009,34 +1330,38 @@ def get_labware_definition(
         If unspecified, will search 'opentrons' then 'custom_beta'
     :param int version: The version of the labware definition. If unspecified,
         will use version 1.
+
+    Definitions are cached in memory, so the returned dict is shared between
+    callers and must not be modified.
     """
     load_name = load_name.lower()
     if namespace is None:
         for fallback_namespace in [OPENTRONS_NAMESPACE, CUSTOM_NAMESPACE]:
-            try:
-                return get_labware_definition(
-                    load_name, fallback_namespace, version)
-            except (FileNotFoundError):
-                pass
+            def_path = _definition_store.find(
+                load_name, fallback_namespace, version)
+            if def_path:
+                try:
+                    return _definition_store.load(def_path)
+                except FileNotFoundError:
+                    pass
         raise FileNotFoundError(
             f'Labware "{load_name}" not found with version {version}. If ' +
             f'you are using a namespace besides {OPENTRONS_NAMESPACE} or ' +
             f'{CUSTOM_NAMESPACE}, please specify it')
 
     namespace = namespace.lower()
-    def_path = _get_path_to_labware(load_name, namespace, version)
+    def_path = _definition_store.find(load_name, namespace, version)
 
     try:
-        with open(def_path, 'r') as f:
-            labware_def = json.load(f)
+        if not def_path:
+            raise FileNotFoundError
+        return _definition_store.load(def_path)
     except FileNotFoundError:
         raise FileNotFoundError(
             f'Labware "{load_name}" not found with version {version} ' +
             f'in namespace "{namespace}".'
         )
 
-    return labware_def
-
 
 def load(
     load_name: str,
@@ -0,0 +1,181 @@
+""" opentrons.protocol_api.simulation_pool: reusable simulating contexts
+
+Building a simulating :py:class:`.ProtocolContext` means building a hardware
+simulator, which loads the robot and pipette configurations and creates an
+event loop for its adapter, and then building the context's deck. For short
+protocols this is a large part of the time it takes to simulate them, so this
+module keeps simulating contexts that have been used to run a protocol, and
+resets them so that they can run another.
+"""
+import asyncio
+import contextlib
+import logging
+import threading
+import weakref
+from collections import defaultdict
+from typing import (Any, Dict, Hashable, Iterator, List, NamedTuple,
+                    Optional)
+
+from opentrons import types
+from opentrons.broker import Broker
+from opentrons.hardware_control import adapters, API
+from .contexts import ProtocolContext
+
+MODULE_LOG = logging.getLogger(__name__)
+
+# The number of idle contexts kept by a pool by default
+DEFAULT_POOL_SIZE = 4
+
+InstrumentSpec = Dict[types.Mount, Dict[str, Optional[str]]]
+
+
+class _Built(NamedTuple):
+    key: Hashable
+    hardware: Any
+    config: Any
+    #: Stops the hardware; called when the context is dropped or collected
+    finalizer: weakref.finalize
+
+
+class SimulationPool:
+    """ A pool of simulating :py:class:`.ProtocolContext` objects.
+
+    Contexts are checked out with :py:meth:`checkout` (or used for the
+    duration of a ``with`` block with :py:meth:`context`) and given back with
+    :py:meth:`checkin`, which resets and re-homes them so that they are ready
+    for the next protocol. Contexts are only shared between callers that ask
+    for the same simulated instruments and modules on the same event loop.
+
+    The pool may be used from several threads at once.
+    """
+    def __init__(self, size: int = DEFAULT_POOL_SIZE) -> None:
+        """
+        :param size: The most idle contexts to keep. The least recently used
+                     contexts are dropped when more are checked in.
+        """
+        self._size = size
+        self._lock = threading.Lock()
+        self._idle: Dict[Hashable, List[ProtocolContext]] = defaultdict(list)
+        # The order contexts were checked in, for dropping the oldest
+        self._idle_order: List[ProtocolContext] = []
+        # Contexts that were built by this pool and have not been dropped
+        self._built: 'weakref.WeakKeyDictionary[ProtocolContext, _Built]'\
+            = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _key(loop: asyncio.AbstractEventLoop,
+             attached_instruments: InstrumentSpec,
+             attached_modules: List[str],
+             strict_attached_instruments: bool) -> Hashable:
+        instruments = tuple(sorted(
+            (mount.name, tuple(sorted(spec.items())))
+            for mount, spec in attached_instruments.items()))
+        return (id(loop), instruments, tuple(attached_modules),
+                strict_attached_instruments)
+
+    def checkout(self,
+                 loop: asyncio.AbstractEventLoop = None,
+                 broker: Broker = None,
+                 attached_instruments: InstrumentSpec = None,
+                 attached_modules: List[str] = None,
+                 strict_attached_instruments: bool = True
+                 ) -> ProtocolContext:
+        """ Get a homed simulating context with nothing loaded.
+
+        The arguments for the simulated hardware are as those of
+        :py:meth:`.API.build_hardware_simulator`.
+
+        :param loop: The event loop for the context. If not specified, the
+                     event loop of the current thread.
+        :param broker: The broker the context should publish commands to
+        """
+        loop = loop or asyncio.get_event_loop()
+        attached_instruments = attached_instruments or {}
+        attached_modules = attached_modules or []
+        key = self._key(loop, attached_instruments, attached_modules,
+                        strict_attached_instruments)
+        with self._lock:
+            idle = self._idle[key]
+            ctx = idle.pop() if idle else None
+            if ctx:
+                self._idle_order.remove(ctx)
+        if not ctx:
+            hardware = adapters.SynchronousAdapter.build(
+                API.build_hardware_simulator,
+                attached_instruments,
+                attached_modules,
+                strict_attached_instruments=strict_attached_instruments)
+            hardware.home()
+            ctx = ProtocolContext(loop=loop, hardware=hardware)
+            with self._lock:
+                self._built[ctx] = _Built(
+                    key, hardware, hardware.config,
+                    weakref.finalize(ctx, hardware.join))
+        if broker:
+            ctx.broker = broker
+            ctx.clear_commands()
+        return ctx
+
+    def checkin(self, ctx: ProtocolContext):
+        """ Give back a context from :py:meth:`checkout`.
+
+        The context is reset and homed, and should not be used by the caller
+        afterwards. Contexts whose hardware configuration was changed are not
+        reused.
+        """
+        with self._lock:
+            built = self._built.get(ctx)
+        if not built:
+            raise ValueError(f'{ctx} was not checked out from this pool')
+        hardware = built.hardware
+        try:
+            if ctx._hw_manager.hardware is not hardware\
+                    or hardware.config != built.config:
+                raise RuntimeError('Simulated hardware was changed')
+            ctx.broker = Broker()
+            ctx.reset()
+            hardware.home()
+        except Exception:
+            MODULE_LOG.debug('Dropping simulation context', exc_info=True)
+            self._drop(ctx)
+            return
+        with self._lock:
+            self._idle[built.key].append(ctx)
+            self._idle_order.append(ctx)
+            excess = max(len(self._idle_order) - self._size, 0)
+            dropped = self._idle_order[:excess]
+            for old in dropped:
+                self._idle_order.remove(old)
+                self._idle[self._built[old].key].remove(old)
+        for old in dropped:
+            self._drop(old)
+
+    @contextlib.contextmanager
+    def context(self, **kwargs) -> Iterator[ProtocolContext]:
+        """ Use a context for the duration of a ``with`` block.
+
+        The arguments are as those of :py:meth:`checkout`.
+        """
+        ctx = self.checkout(**kwargs)
+        try:
+            yield ctx
+        finally:
+            self.checkin(ctx)
+
+    def _drop(self, ctx: ProtocolContext):
+        with self._lock:
+            built = self._built.pop(ctx)
+        built.finalizer()
+
+
+_default_pool: Optional[SimulationPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def default_pool() -> SimulationPool:
+    """ The pool shared by simulations in this process """
+    global _default_pool
+    with _default_pool_lock:
+        if not _default_pool:
+            _default_pool = SimulationPool()
+        return _default_pool
@@ -1,9 +1,10 @@
 import enum
 from typing import (Any, List, Optional, Union, NamedTuple,
-                    Callable, Generator, Iterator, Tuple,
-                    TYPE_CHECKING)
+                    Callable, Tuple, TYPE_CHECKING)
+import numpy as np  # type: ignore
 from .labware import Well
 from opentrons import types
+from opentrons.config import pipette_config
 
 if TYPE_CHECKING:
     from .contexts import InstrumentContext  #noqa (F501)
@@ -353,6 +354,10 @@ class TransferPlan:
     It handles calculations based on pipette channels, tip management, and all
     the various little commands that can be involved in a transfer. It can be
     iterated to resolve methods to call to execute the plan.
+
+    The volumes of the transfer are planned up front as arrays over the whole
+    set of sources and destinations; the commands themselves are only built
+    as the plan is iterated.
     """
     def __init__(self,
                  volume,
@@ -393,7 +398,6 @@ class TransferPlan:
 
         total_xfers = max(len(sources), len(dests))
 
-        self._volumes = self._create_volume_list(volume, total_xfers)
         self._sources = sources
         self._dests = dests
         self._options = options or TransferOptions()
@@ -404,6 +408,7 @@ class TransferPlan:
         self._mix_before_opts = self._options.mix.mix_before
         self._mix_after_opts = self._options.mix.mix_after
         self._max_volume = max_volume
+        self._volumes = self._create_volume_list(volume, total_xfers)
 
         if not mode:
             if len(sources) < len(dests):
@@ -458,12 +463,15 @@ class TransferPlan:
             -> Touch tip -> Dispense air gap -> Dispense -> Mix if empty ->
             -> Blow out -> Touch tip -> Drop tip*
         """
-        plan_iter = self._expand_for_volume_constraints(
-            self._volumes, zip(self._sources, self._dests),
+        pairs = min(len(self._sources), len(self._dests))
+        step_vols, step_idxs = self._expand_for_volume_constraints(
+            self._volumes[:pairs],
             self._instr.max_volume
             - self._strategy.disposal_volume
             - self._strategy.air_gap)
-        for step_vol, (src, dest) in plan_iter:
+        self._check_step_volumes(step_vols)
+        for step_vol, idx in zip(step_vols.tolist(), step_idxs.tolist()):
+            src, dest = self._sources[idx], self._dests[idx]
             if self._strategy.new_tip == types.TransferTipPolicy.ALWAYS:
                 yield self._format_dict('pick_up_tip', kwargs=self._tip_opts)
             max_vol = self._max_volume - \
@@ -520,52 +528,82 @@ class TransferPlan:
         # recommend users to specify a disposal vol when using distribute.
         # First method keeps distribute consistent with current behavior while
         # the other maintains consistency in default behaviors of all functions
-        plan_iter = self._expand_for_volume_constraints(
-            self._volumes, self._dests,
+        step_vols, step_idxs = self._expand_for_volume_constraints(
+            self._volumes[:len(self._dests)],
             self._instr.max_volume
             - self._strategy.disposal_volume
             - self._strategy.air_gap)
+        self._check_step_volumes(step_vols)
+        vols = step_vols.tolist()
+        dests = [self._dests[idx] for idx in step_idxs.tolist()]
 
-        done = False
-        current_xfer = next(plan_iter)
         if self._strategy.new_tip == types.TransferTipPolicy.ALWAYS:
             yield self._format_dict('pick_up_tip', kwargs=self._tip_opts)
-        while not done:
-            asp_grouped = []
-            try:
-                while (sum(a[0] for a in asp_grouped) +
-                       self._strategy.disposal_volume +
-                       self._strategy.air_gap +
-                       current_xfer[0]) <= self._max_volume:
-                    asp_grouped.append(current_xfer)
-                    current_xfer = next(plan_iter)
-            except StopIteration:
-                done = True
-            yield from self._aspirate_actions(sum(a[0] for a in asp_grouped) +
-                                              self._strategy.disposal_volume,
-                                              self._sources[0])
-            for step in asp_grouped:
-                yield from self._dispense_actions(step[0], step[1],
-                                                  step is not asp_grouped[-1])
+        start = 0
+        while start < len(vols):
+            end, grouped_vol = start, 0
+            while end < len(vols) and (grouped_vol +
+                                       self._strategy.disposal_volume +
+                                       self._strategy.air_gap +
+                                       vols[end]) <= self._max_volume:
+                grouped_vol += vols[end]
+                end += 1
+            yield from self._aspirate_actions(
+                grouped_vol + self._strategy.disposal_volume,
+                self._sources[0])
+            for step in range(start, end):
+                yield from self._dispense_actions(vols[step], dests[step],
+                                                  step != end - 1)
+            start = end
         yield from self._new_tip_action()
 
     @staticmethod
     def _expand_for_volume_constraints(
-            volumes: Iterator[float],
-            targets: Iterator[Well],
-            max_volume: float) -> Generator[Tuple[float, Well], None, None]:
+            volumes: np.ndarray,
+            max_volume: float) -> Tuple[np.ndarray, np.ndarray]:
         """ Split a sequence of proposed transfers if necessary to keep each
         transfer under the given max volume.
-        """
-        for volume, target in zip(volumes, targets):
-            while volume > max_volume * 2:
-                yield max_volume, target
-                volume -= max_volume
 
-            if volume > max_volume:
-                volume /= 2
-                yield volume, target
-            yield volume, target
+        Each transfer is split into as many steps of the max volume as leave
+        less than twice the max volume, which is then split evenly into two
+        steps if it is still over the max volume.
+
+        :returns: The volume of each step, and the index of the proposed
+                  transfer each step belongs to
+        """
+        full_steps = np.maximum(
+            np.ceil(volumes / max_volume) - 2, 0).astype(int)
+        rest = volumes - full_steps * max_volume
+        # Guard against the division rounding down onto a whole number
+        over = rest > max_volume * 2
+        full_steps += over
+        rest -= over * max_volume
+        halved = rest > max_volume
+        counts = full_steps + 1 + halved
+        owners = np.repeat(np.arange(len(volumes)), counts)
+        firsts = np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.arange(len(owners)) - firsts
+        last_vols = np.where(halved, rest / 2, rest)
+        step_vols = np.where(positions < full_steps[owners],
+                             max_volume, last_vols[owners])
+        return step_vols, owners
+
+    def _check_step_volumes(self, volumes: np.ndarray):
+        """ Check that the pipette can aspirate and dispense every step of
+        the plan, before any of them is made.
+
+        The whole plan is converted at once, rather than a step at a time
+        as the pipette moves.
+
+        :raises ValueError: if a step is out of range of the pipette's
+                            ul/mm functions
+        """
+        for action, sequence in self._instr.hw_pipette['ul_per_mm'].items():
+            try:
+                pipette_config.volume_conversion(sequence).many(volumes)
+            except IndexError:
+                raise ValueError(
+                    f'Cannot {action} {volumes.max()} uL with this pipette')
 
     def _plan_consolidate(self):
         """
@@ -604,34 +642,36 @@ class TransferPlan:
                *.. Aspirate -> Air gap -> Touch tip ->..
                .. Aspirate -> .....*
         """
-        plan_iter = self._expand_for_volume_constraints(
-            self._volumes, self._sources, self._instr.max_volume)
-        current_xfer = next(plan_iter)
+        step_vols, step_idxs = self._expand_for_volume_constraints(
+            self._volumes[:len(self._sources)], self._instr.max_volume)
+        self._check_step_volumes(step_vols)
+        vols = step_vols.tolist()
+        sources = [self._sources[idx] for idx in step_idxs.tolist()]
+
         if self._strategy.new_tip == types.TransferTipPolicy.ALWAYS:
             yield self._format_dict('pick_up_tip', kwargs=self._tip_opts)
-        done = False
-        while not done:
-            asp_grouped = []
-            try:
-                while (sum([a[0] for a in asp_grouped]) +
-                       self._strategy.disposal_volume +
-                       self._strategy.air_gap * len(asp_grouped) +
-                       current_xfer[0]) <= self._max_volume:
-                    asp_grouped.append(current_xfer)
-                    current_xfer = next(plan_iter)
-            except StopIteration:
-                done = True
-            if not asp_grouped:
+        start = 0
+        while start < len(vols):
+            end, grouped_vol = start, 0
+            while end < len(vols) and (grouped_vol +
+                                       self._strategy.disposal_volume +
+                                       self._strategy.air_gap * (end - start) +
+                                       vols[end]) <= self._max_volume:
+                grouped_vol += vols[end]
+                end += 1
+            if end == start:
                 break
             # Q: What accounts as disposal volume in a consolidate action?
             # yield self._format_dict('aspirate',
             #                         self._strategy.disposal_volume, loc)
-            for step in asp_grouped:
-                yield from self._aspirate_actions(step[0], step[1])
+            for step in range(start, end):
+                yield from self._aspirate_actions(vols[step], sources[step])
             yield from self._dispense_actions(
-                sum([a[0] + self._strategy.air_gap for a in asp_grouped])
+                sum([vol + self._strategy.air_gap
+                     for vol in vols[start:end]])
                 - self._strategy.air_gap,
                 self._dests[0])
+            start = end
         yield from self._new_tip_action()
 
     def _aspirate_actions(self, vol, loc):
@@ -710,9 +750,9 @@ class TransferPlan:
             args = []
         return {'method': method, 'args': args, 'kwargs': params}
 
-    def _create_volume_list(self, volume, total_xfers):
+    def _create_volume_list(self, volume, total_xfers) -> np.ndarray:
         if isinstance(volume, (float, int)):
-            return [volume] * total_xfers
+            return np.full(total_xfers, volume, dtype=float)
         elif isinstance(volume, tuple):
             return self._create_volume_gradient(
                 volume[0], volume[-1], total_xfers,
@@ -724,19 +764,21 @@ class TransferPlan:
             elif not len(volume) == total_xfers:
                 raise RuntimeError("List of volumes should be equal to number "
                                    "of transfers")
-            return volume
+            return np.array(volume, dtype=float)
 
     def _create_volume_gradient(self, min_v, max_v, total, gradient=None):
 
         diff_vol = max_v - min_v
-
-        def _map_volume(i):
-            nonlocal diff_vol, total
-            rel_x = i / (total - 1)
-            rel_y = gradient(rel_x) if gradient else rel_x
-            return (rel_y * diff_vol) + min_v
-
-        return [_map_volume(i) for i in range(total)]
+        if total == 1:
+            return np.array([min_v], dtype=float)
+        rel_x = np.arange(total) / (total - 1)
+        if gradient:
+            # The gradient function is only specified for single floats
+            rel_y = np.fromiter((gradient(x) for x in rel_x.tolist()),
+                                dtype=float, count=total)
+        else:
+            rel_y = rel_x
+        return (rel_y * diff_vol) + min_v
 
     def _multichannel_transfer(self, s, d):
         # TODO: add a check for container being multi-channel compatible?
@@ -758,24 +800,14 @@ class TransferPlan:
             s = [well for list_elem in s for well in list_elem]
         elif isinstance(s, Well):
             s = [s]
-        new_src = []
-        for well in s:
-            if self._is_first_row(well):
-                # For now, just use wells that are in first row
-                new_src.append(well)
+        # For now, just use wells that are in first row
+        new_src = [well for well in s if well.parent.row_index(well) == 0]
 
         if isinstance(d, List) and isinstance(d[0], List):
             # s is a List[List]]; flatten to 1D list
             d = [well for list_elem in d for well in list_elem]
         elif isinstance(d, Well):
             d = [d]
-        new_dst = []
-        for well in d:
-            if self._is_first_row(well):
-                # For now, just use wells that are in first row
-                new_dst.append(well)
+        new_dst = [well for well in d if well.parent.row_index(well) == 0]
 
         return new_src, new_dst
-
-    def _is_first_row(self, well: Well):
-        return well in well.parent.rows()[0]
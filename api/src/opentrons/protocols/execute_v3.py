@@ -1,5 +1,6 @@
 import time
 import datetime
+import functools
 
 from numpy import add  # type: ignore
 
@@ -95,11 +96,35 @@ def _set_flow_rate(
         blow_out=flow_rate_param)
 
 
+def _delay(params):
+    wait = params.get('wait')
+    message = params.get('message')
+    if wait is None:
+        raise ValueError('Delay cannot be null')
+    elif wait is True:
+        message = message or 'Pausing until user resumes'
+        robot.pause(msg=message)
+    else:
+        text = f'Delaying for {datetime.timedelta(seconds=wait)}'
+        if message:
+            text = f"{text}. {message}"
+        robot.comment(text)
+        _sleep(wait)
+
+
 # C901 code complexity is due to long elif block, ok in this case (Ian+Ben)
-def dispatch_commands(protocol_data, loaded_pipettes, loaded_labware):  # noqa: C901 E501
-    commands = protocol_data['commands']
+def compile_commands(protocol_data, loaded_pipettes, loaded_labware):  # noqa: C901 E501
+    """
+    Turn the commands of a JSON protocol into a list of operations, each a
+    callable taking no arguments.
+
+    Pipettes and locations are looked up once here rather than as each
+    command runs, and a pipette's flow rate is only set when it changes.
+    """
+    operations = []
+    flow_rates = {}
 
-    for command_item in commands:
+    for command_item in protocol_data['commands']:
         command_type = command_item['command']
         params = command_item.get('params', {})
 
@@ -113,43 +138,38 @@ def dispatch_commands(protocol_data, loaded_pipettes, loaded_labware):  # noqa:
             loaded_labware, command_type, params)
         volume = params.get('volume')
 
-        if pipette:
-            # Aspirate/Dispense/Blowout flow rate must be set each time for
+        flow_rate = params.get('flowRate')
+        if pipette and flow_rate\
+                and flow_rates.get(id(pipette)) != flow_rate:
+            # Aspirate/Dispense/Blowout flow rate must be set for
             # commands which use pipettes right now.
             # Flow rate is persisted inside the Pipette object
             # and is settable but not easily gettable
-            _set_flow_rate(
-                pipette_name, pipette, command_type, params)
+            operations.append(functools.partial(
+                _set_flow_rate,
+                pipette_name, pipette, command_type, params))
+            flow_rates[id(pipette)] = flow_rate
 
         if command_type == 'delay':
-            wait = params.get('wait')
-            message = params.get('message')
-            if wait is None:
-                raise ValueError('Delay cannot be null')
-            elif wait is True:
-                message = message or 'Pausing until user resumes'
-                robot.pause(msg=message)
-            else:
-                text = f'Delaying for {datetime.timedelta(seconds=wait)}'
-                if message:
-                    text = f"{text}. {message}"
-                robot.comment(text)
-                _sleep(wait)
+            operations.append(functools.partial(_delay, params))
 
         elif command_type == 'blowout':
-            pipette.blow_out(location)
+            operations.append(functools.partial(pipette.blow_out, location))
 
         elif command_type == 'pickUpTip':
-            pipette.pick_up_tip(location)
+            operations.append(
+                functools.partial(pipette.pick_up_tip, location))
 
         elif command_type == 'dropTip':
-            pipette.drop_tip(location)
+            operations.append(functools.partial(pipette.drop_tip, location))
 
         elif command_type == 'aspirate':
-            pipette.aspirate(volume, location)
+            operations.append(
+                functools.partial(pipette.aspirate, volume, location))
 
         elif command_type == 'dispense':
-            pipette.dispense(volume, location)
+            operations.append(
+                functools.partial(pipette.dispense, volume, location))
 
         elif command_type == 'touchTip':
             # NOTE: if touch_tip can take a location tuple,
@@ -162,7 +182,8 @@ def dispatch_commands(protocol_data, loaded_pipettes, loaded_labware):  # noqa:
             offset_from_top = (
                 well_object.properties['depth'] - z_from_bottom) * -1
 
-            pipette.touch_tip(well_object, v_offset=offset_from_top)
+            operations.append(functools.partial(
+                pipette.touch_tip, well_object, v_offset=offset_from_top))
 
         elif command_type == 'moveToSlot':
             slot = params.get('slot')
@@ -180,7 +201,16 @@ def dispatch_commands(protocol_data, loaded_pipettes, loaded_labware):  # noqa:
             # NOTE: Robot.move_to subtracts the offset from Slot.top()[1],
             # so in order not to translate our desired offset,
             # we have to compensate by adding it here :/
-            pipette.move_to(
+            operations.append(functools.partial(
+                pipette.move_to,
                 (slot_placeable,
                  add(slot_offset, tuple(slot_placeable.top()[1]))),
-                strategy=strategy)
+                strategy=strategy))
+
+    return operations
+
+
+def dispatch_commands(protocol_data, loaded_pipettes, loaded_labware):
+    for operation in compile_commands(
+            protocol_data, loaded_pipettes, loaded_labware):
+        operation()
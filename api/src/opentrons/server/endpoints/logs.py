@@ -1,7 +1,7 @@
 import json
 import logging
 
-from typing import Any, Dict, Mapping
+from typing import Any, AsyncIterator, Dict, Mapping
 
 from aiohttp import web
 
@@ -19,7 +19,8 @@ def _get_options(params: Mapping[str, str],
     """
     response = {
         'format': 'text',
-        'records': default_length
+        'records': default_length,
+        'follow': False
     }
 
     print({k: v for k, v in params.items()})
@@ -30,10 +31,15 @@ def _get_options(params: Mapping[str, str],
         else:
             response['format'] = params['format']
 
+    if 'follow' in params:
+        response['follow'] = params['follow'].lower() in ('true', '1')
+
     if 'records' in params:
+        # Following from now on, without any earlier records, is fine
+        min_records = 0 if response['follow'] else 1
         try:
             records = int(params['records'])
-            if records <= 0 or records > log_control.MAX_RECORDS:
+            if records < min_records or records > log_control.MAX_RECORDS:
                 raise ValueError(records)
         except (ValueError, TypeError):
             LOG.exception(f"Bad records count requested: {params['records']}")
@@ -55,7 +61,32 @@ async def _get_log_response(syslog_selector: str, record_count: int,
         return web.Response(text=text)
 
 
-async def get_logs_by_id(request: web.Request) -> web.Response:
+async def _follow_log_response(request: web.Request, syslog_selector: str,
+                               record_count: int,
+                               record_format: str) -> web.StreamResponse:
+    response = web.StreamResponse()
+    records: AsyncIterator[Any]
+    if record_format == 'json':
+        response.content_type = 'application/x-ndjson'
+        records = log_control.follow_records_serializable(
+            syslog_selector, record_count)
+    else:
+        response.content_type = 'text/plain'
+        records = log_control.follow_records_text(
+            syslog_selector, record_count)
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+    try:
+        async for record in records:
+            line: str = json.dumps(record) if record_format == 'json'\
+                else str(record)
+            await response.write(line.encode() + b'\n')
+    finally:
+        await records.aclose()  # type: ignore
+    return response
+
+
+async def get_logs_by_id(request: web.Request) -> web.StreamResponse:
     """ Get logs from the robot.
 
     GET /logs/:syslog_identifier -> 200 OK, log contents in body
@@ -64,6 +95,11 @@ async def get_logs_by_id(request: web.Request) -> web.Response:
     - ``format``: ``json`` or ``text`` (default: text). Controls log format.
     - ``records``: int. Count of records to limit the dump to. Default: 500000.
       Limit: 1000000
+    - ``follow``: ``true`` or ``false`` (default: false). If true, the
+      response is chunked, and after the last ``records`` records it sends
+      new records as they are logged until the client disconnects. In json
+      format each record is sent as a json object on its own line. When
+      following, ``records`` may be 0 to only get new records.
 
     The syslog identifier is an a string that something has logged to as the
     syslog id. It may not be blank (i.e. GET /logs/ is not allowed). The
@@ -84,6 +120,9 @@ async def get_logs_by_id(request: web.Request) -> web.Response:
     elif ident == 'serial.log':
         ident = 'opentrons-api-serial'
     opts = _get_options(request.query, 500000)
+    if opts['follow']:
+        return await _follow_log_response(
+            request, ident, opts['records'], opts['format'])
     return await _get_log_response(
         ident, opts['records'], opts['format'])
 
@@ -1,5 +1,6 @@
 import asyncio
 import aiohttp
+import collections
 import functools
 import json
 import logging
@@ -7,7 +8,6 @@ import traceback
 
 from aiohttp import web
 from aiohttp import WSCloseCode
-from asyncio import Queue
 from opentrons.server import serialize
 from opentrons.protocol_api.execute import ExceptionInProtocolError
 from concurrent.futures import ThreadPoolExecutor
@@ -17,6 +17,11 @@ log = logging.getLogger(__name__)
 
 # Number of executor threads
 MAX_WORKERS = 2
+# Seconds to wait for more notifications before sending them to a client
+NOTIFICATION_BATCH_WINDOW = 0.02
+# Number of messages that may wait to be sent to a client before the oldest
+# notifications are dropped
+MAX_PENDING_MESSAGES = 256
 
 # Keep these in sync with ES code
 CALL_RESULT_MESSAGE = 0
@@ -27,6 +32,84 @@ CALL_NACK_MESSAGE = 4
 PONG_MESSAGE = 5
 
 
+class Notification:
+    """
+    A broker event to send to clients. It is serialized when it is first
+    sent, so events that are replaced before they are sent are never
+    serialized.
+    """
+    def __init__(self, event, serializer):
+        self.event = event
+        self.topic = event.get('topic') if isinstance(event, dict) else None
+        payload = event.get('payload') if isinstance(event, dict) else None
+        # Events whose payload is an object rather than a dict carry a
+        # snapshot of the whole state of that object (like a session or
+        # calibration manager), so a newer one replaces older ones
+        self.snapshot = self.topic is not None \
+            and payload is not None and not isinstance(payload, dict)
+        self._serializer = serializer
+        self._data = None
+        self._serialized = False
+
+    @property
+    def data(self):
+        if not self._serialized:
+            self._data = self._serializer(lambda: self.event)
+            self._serialized = True
+        return self._data
+
+
+class ClientQueue:
+    """
+    Messages waiting to be sent to one client. Only use this from the event
+    loop thread.
+
+    Snapshot notifications replace any older snapshot on the same topic that
+    has not been sent yet. If more than `maxsize` messages are waiting, the
+    oldest snapshot is dropped. Other messages (such as call results and
+    streamed simulation commands) are never dropped, since each one is only
+    sent once; when there are no snapshots left to drop the queue grows.
+    """
+    def __init__(self, loop, maxsize=MAX_PENDING_MESSAGES):
+        self._messages = collections.deque()
+        self._ready = asyncio.Event(loop=loop)
+        self._maxsize = maxsize
+
+    def __len__(self):
+        return len(self._messages)
+
+    def put(self, message):
+        if isinstance(message, Notification) and message.snapshot:
+            for pending in self._messages:
+                if isinstance(pending, Notification) and pending.snapshot\
+                        and pending.topic == message.topic:
+                    self._messages.remove(pending)
+                    break
+        self._messages.append(message)
+        if len(self._messages) > self._maxsize:
+            self._drop_oldest()
+        self._ready.set()
+
+    def _drop_oldest(self):
+        for pending in self._messages:
+            if isinstance(pending, Notification) and pending.snapshot:
+                self._messages.remove(pending)
+                log.debug('Dropped notification on {}'.format(pending.topic))
+                return
+
+    async def get_batch(self, window=NOTIFICATION_BATCH_WINDOW):
+        """ Wait for messages and return all of them. If only notifications
+        are waiting, wait `window` seconds for more first. """
+        await self._ready.wait()
+        if window and all(
+                isinstance(m, Notification) for m in self._messages):
+            await asyncio.sleep(window)
+        self._ready.clear()
+        batch = list(self._messages)
+        self._messages.clear()
+        return batch
+
+
 class RPCServer(object):
     def __init__(self, app, root=None):
         self.monitor_events_task = None
@@ -41,6 +124,9 @@ class RPCServer(object):
         self.executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
 
         self.clients = {}
+        # The last notification sent for each topic, for each client that
+        # asked to be sent diffs instead of whole notifications
+        self.diff_clients = {}
         self.tasks = []
 
         self.app.router.add_get('/', self.handler)
@@ -90,36 +176,31 @@ class RPCServer(object):
 
         async def send_task(socket, queue):
             while True:
-                payload = await queue.get()
+                batch = await queue.get_batch()
                 if socket.closed:
                     log.debug('Websocket {0} closed'.format(id(_id)))
                     break
+                await self.send_batch(socket, batch)
 
-                # see: http://aiohttp.readthedocs.io/en/stable/web_reference.html#aiohttp.web.StreamResponse.drain # NOQA
-                await socket.drain()
-                await socket.send_json(payload)
-
-        queue = Queue(loop=self.loop)
+        queue = ClientQueue(loop=self.loop)
         task = self.loop.create_task(send_task(socket, queue))
         task.add_done_callback(task_done)
         log.debug('Send task for {0} started'.format(_id))
 
         return (task, queue)
 
+    async def send_batch(self, socket, batch):
+        for message in batch:
+            if isinstance(message, Notification):
+                message = self.notification_payload(socket, message)
+            if message is not None:
+                await socket.send_json(message)
+        # see: http://aiohttp.readthedocs.io/en/stable/web_reference.html#aiohttp.web.StreamResponse.drain # NOQA
+        await socket.drain()
+
     async def monitor_events(self, instance):
         async for event in instance.notifications:
-            try:
-                # Apply notification_max_depth to control object tree depth
-                # during serialization to avoid flooding comms
-                data = self.call_and_serialize(
-                    lambda: event)
-                self.send(
-                    {
-                        '$': {'type': NOTIFICATION_MESSAGE},
-                        'data': data
-                    })
-            except Exception:
-                log.exception('While processing event {0}:'.format(event))
+            self.send_notification(event)
 
     async def handler(self, request):
         """
@@ -157,7 +238,7 @@ class RPCServer(object):
             self.clients[client] = self.send_worker(client)
             # Async receive client data until websocket is closed
             async for msg in client:
-                task = self.loop.create_task(self.process(msg))
+                task = self.loop.create_task(self.process(msg, client))
                 task.add_done_callback(task_done)
                 self.tasks += [task]
         except Exception:
@@ -166,6 +247,7 @@ class RPCServer(object):
             log.info('Closing WebSocket {0}'.format(id(client)))
             await client.close()
             del self.clients[client]
+            self.diff_clients.pop(client, None)
 
         return client
 
@@ -216,7 +298,7 @@ class RPCServer(object):
 
         return [resolve(a) for a in args]
 
-    async def process(self, message):
+    async def process(self, message, client=None):
         try:
             if message.type == aiohttp.WSMsgType.TEXT:
                 data = json.loads(message.data)
@@ -224,8 +306,8 @@ class RPCServer(object):
                 token = meta.get('token')
                 _id = data.get('id')
 
-                if meta.get('ping'):
-                    return self.send_pong()
+                if meta.get('ping') or 'diff' in meta:
+                    return self.process_control(meta, client)
 
                 # if id is missing from payload or explicitely set to null,
                 # use the system object
@@ -324,10 +406,66 @@ class RPCServer(object):
             }
         })
 
+    def process_control(self, meta, client):
+        if meta.get('ping'):
+            self.send_pong()
+        else:
+            self.set_diff_notifications(client, meta['diff'])
+
+    def set_diff_notifications(self, client, enabled):
+        """
+        Choose whether a client is sent notifications whole or as diffs
+        against the last notification on the same topic (see
+        :py:func:`serialize.diff`). Notifications that are unchanged are not
+        sent to clients that receive diffs.
+        """
+        if client is None:
+            return
+        if enabled:
+            self.diff_clients.setdefault(client, {})
+        else:
+            self.diff_clients.pop(client, None)
+
+    def send_notification(self, event):
+        """ Queue a broker event to be sent to every client. Only call this
+        from the event loop thread. """
+        notification = Notification(event, self.call_and_serialize)
+        for _, queue in self.clients.values():
+            queue.put(notification)
+
+    def notification_payload(self, socket, notification):
+        """ Build the message for a notification to one client, or return
+        None if there is nothing to send """
+        try:
+            data = notification.data
+        except Exception:
+            log.exception(
+                'While processing event {0}:'.format(notification.event))
+            return None
+        message = {
+            '$': {'type': NOTIFICATION_MESSAGE},
+            'data': data
+        }
+        last_sent = self.diff_clients.get(socket)
+        if last_sent is None:
+            return message
+        topic = notification.topic
+        previous = last_sent.get(topic)
+        last_sent[topic] = data
+        if previous is None:
+            return message
+        ops = serialize.diff(previous, data)
+        if not ops:
+            return None
+        return {
+            '$': {'type': NOTIFICATION_MESSAGE, 'diff': True},
+            'data': ops
+        }
+
     def send(self, payload):
         for socket, value in self.clients.items():
             task, queue = value
-            asyncio.run_coroutine_threadsafe(queue.put(payload), self.loop)
+            self.loop.call_soon_threadsafe(queue.put, payload)
 
 
 class SystemCalls(object):
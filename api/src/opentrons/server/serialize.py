@@ -1,7 +1,21 @@
 import functools
+from typing import Dict
 
+# Whether instances of a type can be iterated over, by type. Iterating
+# instances of other types raises TypeError, so we don't try.
+_iterable_types: Dict[type, bool] = {}
 
-def _get_object_tree(max_depth, path, refs, depth, obj):  # noqa C901
+
+def _is_iterable(t):
+    try:
+        return _iterable_types[t]
+    except KeyError:
+        iterable = hasattr(t, '__iter__') or hasattr(t, '__getitem__')
+        _iterable_types[t] = iterable
+        return iterable
+
+
+def _get_object_tree(max_depth, visited, refs, depth, obj):  # noqa C901
 
     def object_container(value):
         # Save id of instance of object's type as a reference too
@@ -15,16 +29,16 @@ def _get_object_tree(max_depth, path, refs, depth, obj):  # noqa C901
     if isinstance(obj, (str, int, bool, float, complex)) or obj is None:
         return obj
 
-    # If we have ourself in path, it's a circular reference
-    # we are terminating it with a valid id but a value of None
-    if hasattr(obj, '__dict__') and id(obj) in path:
+    # If we have seen ourself already, it's a circular (or repeated)
+    # reference; we are terminating it with a valid id but a value of None
+    if id(obj) in visited and hasattr(obj, '__dict__'):
         return object_container(None)
 
     # Shorthand for calling ourselves recursively
     object_tree = functools.partial(
-        _get_object_tree, max_depth, path, refs, depth + 1)
+        _get_object_tree, max_depth, visited, refs, depth + 1)
 
-    path += [id(obj)]
+    visited.add(id(obj))
 
     # Cut-off at max_depth
     # If max_depth == 0 (evaluates to False) — keep going
@@ -43,10 +57,11 @@ def _get_object_tree(max_depth, path, refs, depth, obj):  # noqa C901
         items = []
         # If Type is iterable we will iterate generating numeric keys and
         # and merge with the output
-        try:
-            items = [object_tree(o) for o in obj]
-        except TypeError:
-            pass
+        if _is_iterable(type(obj)):
+            try:
+                items = [object_tree(o) for o in obj]
+            except TypeError:
+                pass
         tail = {i: v for i, v in enumerate(items)}
 
         # Filter out private attributes
@@ -59,5 +74,33 @@ def _get_object_tree(max_depth, path, refs, depth, obj):  # noqa C901
 
 def get_object_tree(obj, max_depth=0):
     refs = {}
-    tree = _get_object_tree(max_depth, [], refs, 0, obj)
+    tree = _get_object_tree(max_depth, set(), refs, 0, obj)
     return (tree, refs)
+
+
+def diff(old, new, path=()):
+    """
+    Compare two serialized object trees.
+
+    :returns: A list of operations that turn `old` into `new`, in the style
+              of JSON Patch: dicts with an 'op' of 'add', 'remove' or
+              'replace', a 'path' of the keys and indices leading to the
+              changed value, and the new 'value' for 'add' and 'replace'.
+              Lists that change length are replaced whole.
+    """
+    if type(old) is dict and type(new) is dict:
+        ops = [{'op': 'remove', 'path': [*path, key]}
+               for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({'op': 'add', 'path': [*path, key], 'value': value})
+            else:
+                ops.extend(diff(old[key], value, (*path, key)))
+        return ops
+    if type(old) is list and type(new) is list and len(old) == len(new):
+        return [op
+                for idx, (old_item, new_item) in enumerate(zip(old, new))
+                for op in diff(old_item, new_item, (*path, idx))]
+    if type(old) is not type(new) or old != new:
+        return [{'op': 'replace', 'path': list(path), 'value': new}]
+    return []
@@ -3,11 +3,16 @@ An easy entrypoint for simulating a protocol offline.
 """
 
 import argparse
+import functools
 import json
 import sys
 import logging
+import multiprocessing
 import queue
-from typing import Any, List, Mapping
+import time
+import traceback
+from typing import (Any, Callable, Iterator, List, Mapping, NamedTuple,
+                    Optional, Sequence, Tuple)
 
 import opentrons
 import opentrons.protocols
@@ -39,28 +44,37 @@ class CommandScraper:
     The :py:attr:`commands` property contains the list of commands
     and log messages integrated together. Each element of the list is
     a dict following the pattern in the docs of :py:meth:`simulate`.
+
+    If a ``clock`` is specified, each command is also given the estimated
+    duration it would take on a robot.
     """
     def __init__(self,
                  logger: logging.Logger,
                  level: str,
-                 broker: opentrons.broker.Broker) -> None:
+                 broker: opentrons.broker.Broker,
+                 clock: Callable[[], float] = None) -> None:
         """ Build the scraper.
 
         :param logger: The :py:class:`logging.logger` to scrape
         :param level: The log level to scrape
         :param broker: Which broker to subscribe to
+        :param clock: A function returning the total estimated time in
+                      seconds of the motion executed so far (for instance,
+                      the hardware's ``estimated_motion_time``)
         """
         self._logger = logger
         self._broker = broker
         self._queue = queue.Queue()  # type: ignore
         level = getattr(logging, level.upper(), logging.WARNING)
         self._logger.setLevel(level)
-        logger.addHandler(
-            AccumulatingHandler(
-                level,
-                self._queue))
+        self._handler = AccumulatingHandler(level, self._queue)
+        logger.addHandler(self._handler)
         self._depth = 0
         self._commands: List[Mapping[str, Mapping[str, Any]]] = []
+        self._clock = clock
+        # delays don't move anything, so their time is tracked separately
+        self._delay_time = 0.0
+        self._started: List[Tuple[int, float]] = []
         self._unsub = self._broker.subscribe(
             opentrons.commands.command_types.COMMAND,
             self._command_callback)
@@ -70,11 +84,24 @@ class CommandScraper:
         """ The list of commands. See :py:meth:`simulate` """
         return self._commands
 
-    def __del__(self):
+    def close(self):
+        """ Stop scraping commands and logs.
+
+        The broker subscription keeps the scraper alive, so this should be
+        called once the protocol has run if the process goes on to run more.
+        """
         if hasattr(self, '_handler'):
             self._logger.removeHandler(self._handler)
+            del self._handler
         if hasattr(self, '_unsub'):
             self._unsub()
+            del self._unsub
+
+    def __del__(self):
+        self.close()
+
+    def _elapsed(self) -> float:
+        return self._clock() + self._delay_time  # type: ignore
 
     def _command_callback(self, message):
         """ The callback subscribed to the broker """
@@ -84,10 +111,20 @@ class CommandScraper:
                                    'payload': payload,
                                    'logs': []})
             self._depth += 1
+            if self._clock:
+                self._started.append(
+                    (len(self._commands) - 1, self._elapsed()))
+                if message['name'] == opentrons.commands.command_types.DELAY:
+                    self._delay_time += payload.get('seconds', 0)\
+                        + payload.get('minutes', 0) * 60
         else:
             while not self._queue.empty():
                 self._commands[-1]['logs'].append(self._queue.get())
             self._depth = max(self._depth-1, 0)
+            if self._started:
+                index, started = self._started.pop()
+                self._commands[index]['duration']\
+                    = self._elapsed() - started
 
 
 def simulate(protocol_file,
@@ -120,6 +157,10 @@ def simulate(protocol_file,
                        a payload do ``payload['text'].format(**payload)``.
         - ``logs``: Any log messages that occurred during execution of this
                     command, as a logging.LogRecord
+        - ``duration``: The estimated time in seconds this command (including
+                        any commands nested in it) would take on a robot,
+                        predicted from the distance, speed and acceleration
+                        of its moves plus any delays
 
     :param file-like protocol_file: The protocol file to simulate.
     :param propagate_logs: Whether this function should allow logs from the
@@ -136,32 +177,78 @@ def simulate(protocol_file,
     stack_logger = logging.getLogger('opentrons')
     stack_logger.propagate = propagate_logs
 
-    contents = protocol_file.read()
+    runlog, error = _simulate(protocol_file.read(), log_level)
+    if error:
+        raise error
+    return runlog
+
 
+def _simulate(
+        contents: str,
+        log_level: str) -> Tuple[List[Mapping[str, Any]],
+                                 Optional[Exception]]:
+    """ Simulate a protocol, returning the run log so far and the error that
+    stopped the simulation (if any).
+    """
+    stack_logger = logging.getLogger('opentrons')
+    pool = opentrons.protocol_api.simulation_pool.default_pool()
+    context = None
     if opentrons.config.feature_flags.use_protocol_api_v2():
         try:
             execute_args = {'protocol_json': json.loads(contents)}
         except json.JSONDecodeError:
             execute_args = {'protocol_code': contents}
-        context = opentrons.protocol_api.contexts.ProtocolContext()
+        context = pool.checkout()
         context.home()
-        scraper = CommandScraper(stack_logger, log_level, context.broker)
+        hardware = context._hw_manager.hardware
+        scraper = CommandScraper(
+            stack_logger, log_level, context.broker,
+            lambda: hardware.estimated_motion_time)
         execute_args.update({'simulate': True,
                              'context': context})
-        opentrons.protocol_api.execute.run_protocol(**execute_args)
+        run: Callable[[], Any] = functools.partial(
+            opentrons.protocol_api.execute.run_protocol, **execute_args)
     else:
         try:
             proto = json.loads(contents)
         except json.JSONDecodeError:
             proto = contents
         opentrons.robot.disconnect()
-        scraper = CommandScraper(stack_logger, log_level,
-                                 opentrons.robot.broker)
+        scraper = CommandScraper(
+            stack_logger, log_level, opentrons.robot.broker,
+            lambda: opentrons.robot._driver.estimated_motion_time)
         if isinstance(proto, dict):
-            opentrons.protocols.execute_protocol(proto)
+            run = functools.partial(opentrons.protocols.execute_protocol,
+                                    proto)
         else:
-            exec(proto, {})
-    return scraper.commands
+            run = functools.partial(exec, proto, {})
+    try:
+        run()
+    except Exception as e:
+        return scraper.commands, e
+    else:
+        return scraper.commands, None
+    finally:
+        scraper.close()
+        if context:
+            pool.checkin(context)
+
+
+def estimate_duration(runlog: List[Mapping[str, Any]]) -> float:
+    """
+    Estimate how long (in seconds) a protocol takes to run on a robot from
+    its run log (return value of :py:meth:`simulate`)
+
+    :param runlog: The output of a call to :py:func:`simulate`
+    """
+    return sum(command.get('duration', 0)
+               for command in runlog if command['level'] == 0)
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02d}:{seconds:02d}'
 
 
 def format_runlog(runlog: List[Mapping[str, Any]]) -> str:
@@ -171,20 +258,122 @@ def format_runlog(runlog: List[Mapping[str, Any]]) -> str:
 
     :param runlog: The output of a call to :py:func:`simulate`
     """
+    return _format_text_runlog(_text_runlog(runlog))
+
+
+def _format_text_runlog(runlog: List[Mapping[str, Any]]) -> str:
     to_ret = []
     for command in runlog:
-        to_ret.append(
-            '\t' * command['level']
-            + command['payload'].get('text', '').format(**command['payload']))
+        to_ret.append('\t' * command['level'] + command['text'])
         if command['logs']:
             to_ret.append('\t' * command['level'] + 'Logs from this command:')
             to_ret.extend(
-                ['\t' * command['level']
-                 + f'{l.levelname} ({l.module}): {l.msg}' % l.args
-                 for l in command['logs']])
+                ['\t' * command['level'] + log for log in command['logs']])
     return '\n'.join(to_ret)
 
 
+def _text_runlog(
+        runlog: List[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
+    """ Format the payloads and logs of a run log into text """
+    return [{'level': command['level'],
+             'text': _command_text(command),
+             'logs': [_log_text(record) for record in command['logs']],
+             'duration': command.get('duration', 0)}
+            for command in runlog]
+
+
+def _command_text(command: Mapping[str, Any]) -> str:
+    return command['payload'].get('text', '').format(**command['payload'])
+
+
+def _log_text(record: logging.LogRecord) -> str:
+    return f'{record.levelname} ({record.module}): {record.msg}' % record.args
+
+
+class BatchResult(NamedTuple):
+    """
+    The result of simulating one protocol with :py:func:`simulate_batch`.
+
+    The run log is like the return value of :py:func:`simulate`, except
+    that command payloads and logs are formatted into text, since the
+    objects they hold cannot be sent between processes: each command has a
+    ``text`` key instead of a ``payload``, and each log is a string. It holds
+    the commands run before any error.
+    """
+    path: str
+    runlog: List[Mapping[str, Any]]
+    #: The estimated time in seconds the protocol takes on a robot
+    estimated_duration: float
+    #: The time in seconds it took to simulate the protocol
+    simulation_time: float
+    #: The formatted traceback of the error that stopped the simulation
+    error: Optional[str] = None
+
+
+_batch_log_level = 'warning'
+
+
+def _init_batch_worker(log_level: str):
+    global _batch_log_level
+    _batch_log_level = log_level
+    logging.getLogger('opentrons').propagate = False
+    if opentrons.config.feature_flags.use_protocol_api_v2():
+        # Build the worker's context before the first protocol arrives
+        pool = opentrons.protocol_api.simulation_pool.default_pool()
+        pool.checkin(pool.checkout())
+
+
+def _simulate_batch_job(path: str) -> BatchResult:
+    if not opentrons.config.feature_flags.use_protocol_api_v2():
+        # API v1 protocols load onto the global robot; homing it means
+        # estimates do not depend on where the last protocol left it
+        opentrons.robot.reset()
+        opentrons.robot.home()
+    start = time.perf_counter()
+    try:
+        with open(path) as protocol_file:
+            contents = protocol_file.read()
+        runlog, error = _simulate(contents, _batch_log_level)
+    except Exception as e:
+        runlog, error = [], e
+    simulation_time = time.perf_counter() - start
+    if error:
+        error_text: Optional[str] = ''.join(traceback.format_exception(
+            type(error), error, error.__traceback__))
+    else:
+        error_text = None
+    return BatchResult(
+        path=path,
+        runlog=_text_runlog(runlog),
+        estimated_duration=estimate_duration(runlog),
+        simulation_time=simulation_time,
+        error=error_text)
+
+
+def simulate_batch(protocol_paths: Sequence[str],
+                   workers: int = None,
+                   log_level: str = 'warning') -> Iterator[BatchResult]:
+    """
+    Simulate many protocols in parallel.
+
+    The protocols are spread across a pool of worker processes, each of
+    which reuses its simulating protocol context between protocols. Unlike
+    :py:func:`simulate`, errors in a protocol do not raise; they are
+    recorded in its result.
+
+    :param protocol_paths: The paths of the protocol files to simulate
+    :param workers: The number of worker processes to use. By default, one
+                    per CPU.
+    :param log_level: The level of logs to capture in the runlogs
+    :returns: A :py:class:`BatchResult` for each protocol, in the order of
+              `protocol_paths`, as each becomes available
+    """
+    with multiprocessing.Pool(workers,
+                              initializer=_init_batch_worker,
+                              initargs=(log_level,)) as pool:
+        yield from pool.imap(_simulate_batch_job, protocol_paths)
+
+
 # Note - this script is also set up as a setuptools entrypoint and thus does
 # an absolute minimum of work since setuptools does something odd generating
 # the scripts
@@ -193,9 +382,10 @@ def main():
     parser = argparse.ArgumentParser(prog='opentrons_simulate',
                                      description=__doc__)
     parser.add_argument(
-        'protocol', metavar='PROTOCOL_FILE',
-        type=argparse.FileType('r'),
-        help='The protocol file to simulate (specify - to read from stdin).')
+        'protocol', metavar='PROTOCOL_FILE', nargs='+',
+        help=('The protocol file to simulate (specify - to read from stdin). '
+              'If more than one is given, they are simulated in parallel, '
+              'and none of them may be read from stdin.'))
     parser.add_argument(
         '-v', '--version', action='version',
         version=f'%(prog)s {opentrons.__version__}',
@@ -212,13 +402,47 @@ def main():
         choices=['error', 'warning', 'info', 'debug'],
         default='warning'
     )
+    parser.add_argument(
+        '-e', '--estimate-duration', action='store_true',
+        help='Print how long the protocol is estimated to take on a robot')
+    parser.add_argument(
+        '-j', '--jobs', action='store', type=int,
+        help=('How many processes to simulate multiple protocols with '
+              '(default: one per CPU)'))
     args = parser.parse_args()
 
-    runlog = simulate(args.protocol, log_level=args.log_level)
+    if len(args.protocol) > 1:
+        if '-' in args.protocol:
+            parser.error(
+                'protocols can only be read from stdin when simulating one')
+        return _main_batch(args)
+
+    protocol_file = argparse.FileType('r')(args.protocol[0])
+    runlog = simulate(protocol_file, log_level=args.log_level)
     if args.output == 'runlog':
         print(format_runlog(runlog))
+    if args.estimate_duration:
+        print('Estimated run time: {}'.format(
+            _format_duration(estimate_duration(runlog))))
     return 0
 
 
+def _main_batch(args) -> int:
+    failed = 0
+    for result in simulate_batch(args.protocol, args.jobs, args.log_level):
+        print(f'{result.path} (simulated in {result.simulation_time:.2f}s)')
+        if args.output == 'runlog' and result.runlog:
+            print(_format_text_runlog(result.runlog))
+        if args.estimate_duration:
+            print('Estimated run time: {}'.format(
+                _format_duration(result.estimated_duration)))
+        if result.error:
+            failed += 1
+            print(result.error, file=sys.stderr)
+    print(f'{len(args.protocol) - failed} of {len(args.protocol)} '
+          'protocols simulated successfully')
+    return 1 if failed else 0
+
+
 if __name__ == '__main__':
     sys.exit(main())
@@ -6,10 +6,12 @@ This is the implementation of the endpoints in
 """
 import asyncio
 import collections
+import concurrent.futures
 import datetime
 import logging
 import syslog
-from typing import Any, Deque, Dict, List, Tuple
+from typing import (Any, AsyncIterator, Deque, Dict, List, Sequence,
+                    Tuple)
 
 import systemd.journal as journal  # type: ignore
 
@@ -30,6 +32,43 @@ _SYSLOG_PRIORITY_TO_NAME = {
 }
 
 
+#: Seconds to wait for new records in one go when following the journal
+FOLLOW_WAIT_SECS = 1.0
+
+
+def _open_reader(selector: str) -> journal.Reader:
+    reader = journal.Reader(journal.SYSTEM_ONLY)
+    reader.add_match(SYSLOG_IDENTIFIER=selector)
+    return reader
+
+
+def _read_tail(reader: journal.Reader,
+               record_count: int) -> Deque[Dict[str, Any]]:
+    """ Read the last ``record_count`` records, reading backwards from the
+    end of the journal. Blocking. """
+    log_deque: Deque[Dict[str, Any]] = collections.deque(maxlen=record_count)
+    reader.seek_tail()
+    while len(log_deque) < record_count:
+        record = reader.get_previous()
+        if not record:
+            break
+        log_deque.appendleft(record)
+    return log_deque
+
+
+def _read_new(reader: journal.Reader,
+              timeout: float) -> List[Dict[str, Any]]:
+    """ Wait up to ``timeout`` seconds for records after the reader's
+    position and read them. Blocking. """
+    records: List[Dict[str, Any]] = []
+    reader.wait(timeout)
+    while True:
+        record = reader.get_next()
+        if not record:
+            return records
+        records.append(record)
+
+
 async def get_records(selector: str, record_count: int)\
           -> Deque[Dict[str, Any]]:
     """
@@ -39,20 +78,51 @@ async def get_records(selector: str, record_count: int)\
     by journald's interface (see
     https://www.freedesktop.org/software/systemd/python-systemd/journal.html ).
 
-    :return: deque[dict[str, Any]]: A deque of records
+    Only the most recent ``record_count`` records are read from the journal,
+    from an executor.
+
+    :return: deque[dict[str, Any]]: A deque of records, oldest first
+    """
+    def read():
+        with _open_reader(selector) as reader:
+            return _read_tail(reader, record_count)
+    return await asyncio.get_event_loop().run_in_executor(None, read)
+
+
+async def follow_records(selector: str, record_count: int)\
+        -> AsyncIterator[Dict[str, Any]]:
+    """
+    Get log records up to record count, then records as they are logged.
+
+    The records are as for :py:meth:`get_records`. This does not stop by
+    itself; stop iterating (or close the iterator) to stop following.
     """
     loop = asyncio.get_event_loop()
-    log_deque: Deque[Dict[str, Any]] = collections.deque(maxlen=record_count)
-    with journal.Reader(journal.SYSTEM_ONLY) as r:
-        r.add_match(SYSLOG_IDENTIFIER=selector)
-        last_time = loop.time()
-        for record in r:
-            log_deque.append(record)
-            now = loop.time()
-            if (now-last_time) > 0.1:
-                last_time = now
-                await asyncio.sleep(0.01)
-    return log_deque
+    # The reader is only used from this thread, which closes it after any
+    # read still running when the iterator is closed
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    reader = _open_reader(selector)
+    try:
+        records: Sequence[Dict[str, Any]] = await loop.run_in_executor(
+            executor, _read_tail, reader, record_count)
+        if records:
+            # Continue from the newest record rather than from the tail, so
+            # that nothing logged since it was read is missed
+            await loop.run_in_executor(
+                executor, reader.seek_cursor, records[-1]['__CURSOR'])
+            await loop.run_in_executor(executor, reader.get_next)
+        else:
+            # Step onto the last record, so that the next read starts after
+            # it rather than at it
+            await loop.run_in_executor(executor, reader.get_previous)
+        while True:
+            for record in records:
+                yield record
+            records = await loop.run_in_executor(
+                executor, _read_new, reader, FOLLOW_WAIT_SECS)
+    finally:
+        executor.submit(reader.close)
+        executor.shutdown(wait=False)
 
 
 def _format_record_text(record: Dict[str, Any]) -> str:
@@ -72,6 +142,18 @@ async def get_records_text(selector: str, record_count: int) -> str:
     return '\n'.join([_format_record_text(record) for record in records])
 
 
+async def follow_records_text(selector: str, record_count: int)\
+        -> AsyncIterator[str]:
+    """ Follow log records as with :py:meth:`follow_records`, formatted as
+    for :py:meth:`get_records_text` """
+    records = follow_records(selector, record_count)
+    try:
+        async for record in records:
+            yield _format_record_text(record)
+    finally:
+        await records.aclose()  # type: ignore
+
+
 def _format_record_dict(record: Dict[str, Any]) -> Dict[str, Any]:
     return {
         'logger': record.get('LOGGER', '<unknown>'),
@@ -108,6 +190,18 @@ async def get_records_serializable(
     return [_format_record_dict(rec) for rec in records]
 
 
+async def follow_records_serializable(selector: str, record_count: int)\
+        -> AsyncIterator[Dict[str, Any]]:
+    """ Follow log records as with :py:meth:`follow_records`, formatted as
+    for :py:meth:`get_records_serializable` """
+    records = follow_records(selector, record_count)
+    try:
+        async for record in records:
+            yield _format_record_dict(record)
+    finally:
+        await records.aclose()  # type: ignore
+
+
 async def set_syslog_level(level: str) -> Tuple[int, str, str]:
     """
     Set the minimum level for which logs will be sent upstream via syslog-ng.
@@ -1,7 +1,6 @@
-import functools
-import itertools
-from collections import namedtuple, UserDict
-from typing import Dict, List
+from collections import namedtuple
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Tuple
 
 import numpy as np  # type: ignore
 from numpy.linalg import inv  # type: ignore
@@ -58,74 +57,297 @@ class Node(namedtuple('Node', 'parent children transform')):
             (transform1 == transform2).all()
 
 
-def init():
-    return add({}, ROOT, parent=None)
+class PoseTree(Mapping):
+    """ The poses of tracked objects, each relative to its parent.
+
+    The tree is a mapping from objects to :py:class:`Node` for compatibility
+    with the functions in this module, which update it in place and return
+    it. Nodes are stored by index: the parent and children of each node are
+    kept as indices, and the transforms of all nodes in stacked arrays.
+
+    For each node the tree caches the transforms between it and the root, so
+    that changing the base of a point between nodes whose common ancestor is
+    the root (as :py:func:`absolute` does) only takes the cached transforms
+    of its source and destination. Changing the transform of a node
+    invalidates the cache for its subtree.
+    """
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self) -> None:
+        self._index: Dict[Any, int] = {}
+        self._objs: List[Any] = []
+        self._parents: List[int] = []
+        self._children: List[List[int]] = []
+        self._depths: List[int] = []
+        self._free: List[int] = []
+        capacity = self._INITIAL_CAPACITY
+        self._local = np.empty((capacity, 4, 4))
+        self._local_inv = np.empty((capacity, 4, 4))
+        # The inverse of the product of the transforms from this node up to
+        # the root, and the product from the root down to this node. The
+        # root's own transform never applies to a change of base, and is left
+        # out.
+        self._up_inv = np.empty((capacity, 4, 4))
+        self._down = np.empty((capacity, 4, 4))
+        # If a node is valid, so are all of its ancestors
+        self._valid = np.zeros(capacity, dtype=bool)
+
+    def __getitem__(self, obj) -> Node:
+        idx = self._index[obj]
+        parent = self._parents[idx]
+        return Node(
+            parent=self._objs[parent] if parent >= 0 else None,
+            children=[self._objs[child] for child in self._children[idx]],
+            transform=self._local[idx].copy())
+
+    def __contains__(self, obj) -> bool:
+        return obj in self._index
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {len(self)} nodes>'
+
+    def copy(self) -> 'PoseTree':
+        """ A copy of the tree that can be changed independently """
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new._index = self._index.copy()
+        new._objs = self._objs.copy()
+        new._parents = self._parents.copy()
+        new._children = [children.copy() for children in self._children]
+        new._depths = self._depths.copy()
+        new._free = self._free.copy()
+        for name in ('_local', '_local_inv', '_up_inv', '_down', '_valid'):
+            setattr(new, name, getattr(self, name).copy())
+        return new
+
+    def add(self, obj, parent=ROOT, point=Point(0, 0, 0),
+            transform=np.identity(4)) -> 'PoseTree':
+        """ Chainable :py:func:`add` """
+        return add(self, obj, parent, point, transform)
+
+    def _add(self, obj, parent, transform: np.ndarray):
+        parent_idx = self._index[parent] if parent is not None else -1
+        assert obj not in self._index, 'object is already being tracked'
+        depth = self._depths[parent_idx] + 1 if parent_idx >= 0 else 0
+        if self._free:
+            idx = self._free.pop()
+            self._objs[idx] = obj
+            self._parents[idx] = parent_idx
+            self._depths[idx] = depth
+        else:
+            idx = len(self._objs)
+            if idx == len(self._valid):
+                self._grow()
+            self._objs.append(obj)
+            self._parents.append(parent_idx)
+            self._children.append([])
+            self._depths.append(depth)
+        self._index[obj] = idx
+        if parent_idx >= 0:
+            self._children[parent_idx].append(idx)
+        self._local[idx] = transform
+        self._local_inv[idx] = inv(transform)
+        self._valid[idx] = False
+
+    def _grow(self):
+        for name in ('_local', '_local_inv', '_up_inv', '_down', '_valid'):
+            old = getattr(self, name)
+            new = np.empty((len(old) * 2,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            if name == '_valid':
+                new[len(old):] = False
+            setattr(self, name, new)
+
+    def _update(self, obj, transform: np.ndarray):
+        idx = self._index[obj]
+        self._local[idx] = transform
+        self._local_inv[idx] = inv(transform)
+        self._invalidate(idx)
+
+    def _remove(self, obj):
+        idx = self._index[obj]
+        parent = self._parents[idx]
+        if parent >= 0:
+            self._children[parent].remove(idx)
+        for removed in [idx] + self._subtree(idx):
+            del self._index[self._objs[removed]]
+            self._objs[removed] = None
+            self._children[removed] = []
+            self._valid[removed] = False
+            self._free.append(removed)
+
+    def _subtree(self, idx: int) -> List[int]:
+        """ The indices of the descendants of a node, depth first """
+        found: List[int] = []
+        stack = list(reversed(self._children[idx]))
+        while stack:
+            node = stack.pop()
+            found.append(node)
+            stack.extend(reversed(self._children[node]))
+        return found
+
+    def _descendants(self, obj, level: int) -> List[Tuple[Any, int]]:
+        found: List[Tuple[Any, int]] = []
+        idx = self._index[obj]
+        stack = [(child, level) for child in reversed(self._children[idx])]
+        while stack:
+            node, depth = stack.pop()
+            found.append((self._objs[node], depth))
+            stack.extend((child, depth + 1)
+                         for child in reversed(self._children[node]))
+        return found
+
+    def _invalidate(self, idx: int):
+        stack = [idx]
+        while stack:
+            node = stack.pop()
+            # The subtree of an invalid node is already invalid
+            if self._valid[node]:
+                self._valid[node] = False
+                stack.extend(self._children[node])
+
+    def _validate(self, idx: int):
+        path = []
+        while idx >= 0 and not self._valid[idx]:
+            path.append(idx)
+            idx = self._parents[idx]
+        for node in reversed(path):
+            parent = self._parents[node]
+            local, local_inv = self._local[node], self._local_inv[node]
+            if parent < 0:
+                self._up_inv[node] = self._down[node] = np.identity(4)
+            else:
+                self._up_inv[node] = self._up_inv[parent].dot(local_inv)
+                self._down[node] = self._down[parent].dot(local)
+            self._valid[node] = True
+
+    def _common_ancestor(self, first: int, second: int) -> int:
+        while self._depths[first] > self._depths[second]:
+            first = self._parents[first]
+        while self._depths[second] > self._depths[first]:
+            second = self._parents[second]
+        while first != second:
+            first, second = self._parents[first], self._parents[second]
+            if first < 0 or second < 0:
+                raise ValueError('Objects are not in the same tree')
+        return first
+
+    def _change_base(self, point, src, dst) -> np.ndarray:
+        src_idx, dst_idx = self._index[src], self._index[dst]
+        root = self._common_ancestor(src_idx, dst_idx)
+        in_root = np.array((*point, 1))
+        if self._parents[root] < 0:
+            self._validate(src_idx)
+            self._validate(dst_idx)
+            return self._down[dst_idx].dot(
+                self._up_inv[src_idx].dot(in_root))[:-1]
+
+        # Below the root, folding the path between the nodes is as fast as
+        # combining their cached transforms, and more precise
+        node = src_idx
+        while node != root:
+            in_root = self._local_inv[node].dot(in_root)
+            node = self._parents[node]
+        node = dst_idx
+        while node != root:
+            in_root = self._local[node].dot(in_root)
+            node = self._parents[node]
+        return in_root[:-1]
+
+    def _max_z(self, obj) -> float:
+        # The transforms of the subtree relative to obj are built a level at
+        # a time rather than taken from the cached transforms, so that the
+        # heights do not lose precision to the position of obj itself
+        level = self._children[self._index[obj]]
+        relative_inv = self._local_inv[level]
+        highest = relative_inv[:, 2, 3].max()
+        while True:
+            parents = [(pos, child)
+                       for pos, node in enumerate(level)
+                       for child in self._children[node]]
+            if not parents:
+                return highest
+            positions, level = zip(*parents)  # type: ignore
+            relative_inv = np.matmul(
+                relative_inv[list(positions)], self._local_inv[list(level)])
+            highest = max(highest, relative_inv[:, 2, 3].max())
+
+
+def _tree(state) -> PoseTree:
+    """ The state as a :py:class:`PoseTree`, converting it if it is a
+    mapping of objects to :py:class:`Node` """
+    if isinstance(state, PoseTree):
+        return state
+    tree = PoseTree()
+    remaining = dict(state)
+    while remaining:
+        ready = [obj for obj, node in remaining.items()
+                 if node.parent is None or node.parent in tree]
+        if not ready:
+            raise KeyError(next(iter(remaining.values())).parent)
+        for obj in ready:
+            node = remaining.pop(obj)
+            tree._add(obj, node.parent, np.asarray(node.transform))
+    return tree
+
+
+def init() -> PoseTree:
+    return add(PoseTree(), ROOT, parent=None)
 
 
 def add(
-        state: Dict[object, Node],
+        state,
         obj,
         parent=ROOT,
         point=Point(0, 0, 0),
-        transform=np.identity(4)) -> Dict[object, Node]:
-
+        transform=np.identity(4)) -> PoseTree:
+    """ Track an object, updating and returning the state """
     if isinstance(transform, list):
         transform = np.array(transform)
 
-    state = bind(state)
-
-    if parent is not None:
-        state[parent] = state[parent].add(obj)
-
-    assert obj not in state, 'object is already being tracked'
-
-    state[obj] = Node(
-        parent=parent,
-        children=[],
-        transform=transform.dot(inv(translate(point)))
-    )
-
+    state = _tree(state)
+    state._add(obj, parent, transform.dot(inv(translate(point))))
     return state
 
 
-def remove(state, obj):
-    state = state.copy()
-    nodes = descendants(state, obj) + [(obj, 0)]
-
-    # remove object references from their parent's children
-    for child, *_ in nodes:
-        parent = state[child].parent
-        if parent in state:
-            state[parent] = state[parent].remove(child)
-        del state[child]
+def remove(state, obj) -> PoseTree:
+    """ Stop tracking an object and its descendants, updating and returning
+    the state """
+    state = _tree(state)
+    state._remove(obj)
     return state
 
 
-def update(state, obj, point: Point, transform=np.identity(4)):
-    state = state.copy()
-    state[obj] = state[obj].update(
-        transform.dot(inv(translate(point)))
-    )
+def update(state, obj, point: Point, transform=np.identity(4)) -> PoseTree:
+    """ Move an object relative to its parent, updating and returning the
+    state """
+    state = _tree(state)
+    state._update(obj, transform.dot(inv(translate(point))))
     return state
 
 
 def descendants(state, obj, level=0):
     """ Returns a flattened list tuples of DFS traversal of subtree
     from object that contains descendant object and it's depth """
-    return sum([
-        [(child, level)] + descendants(state, child, level + 1)
-        for child in state[obj].children
-    ], [])
+    return _tree(state)._descendants(obj, level)
 
 
 def has_children(state, obj):
-    return True if len(descendants(state, obj)) > 0 else False
+    state = _tree(state)
+    return bool(state._children[state._index[obj]])
 
 
 def ascend(state, start, finish=ROOT) -> List[Node]:
-    if start is finish:
-        return [finish]
-    return [start] + ascend(state, start=state[start].parent, finish=finish)
+    path = [start]
+    while path[-1] is not finish:
+        path.append(state[path[-1]].parent)
+    return path
 
 
 def change_base(state, point=Point(0, 0, 0), src=ROOT, dst=ROOT):
@@ -133,29 +355,7 @@ def change_base(state, point=Point(0, 0, 0), src=ROOT, dst=ROOT):
     Transforms point from source coordinate system to destination.
     Point(0, 0, 0) means the origin of the source.
     """
-    def fold(objects):
-        return functools.reduce(
-            lambda a, b: a.dot(b),
-            [state[key].transform for key in objects],
-            np.identity(4)
-        )
-
-    up, down = ascend(state, src), list(reversed(ascend(state, dst)))
-
-    # Find common prefix. Last item is common root
-    root = [n1 for n1, n2 in zip(reversed(up), down) if n1 is n2].pop()
-
-    # Nodes up to root, EXCLUDING root
-    up = list(itertools.takewhile(lambda node: node is not root, up))
-
-    # Nodes down from root, EXCLUDING root
-    down = list(itertools.dropwhile(lambda node: node is not root, down))[1:]
-
-    # Point in root's coordinate system
-    point_in_root = inv(fold(up)).dot((*point, 1))
-
-    # Return point in destination's coordinate system
-    return fold(down).dot(point_in_root)[:-1]
+    return _tree(state)._change_base(point, src, dst)
 
 
 def absolute(state, obj):
@@ -166,15 +366,9 @@ def absolute(state, obj):
 
 
 def max_z(state, root):
-    test = [
-        (obj, Point(*change_base(state, src=obj, dst=root)).z)
-        for obj, _ in descendants(state, root)
-    ]
-
-    # from pprint import pprint
-    # pprint(test, indent=2)
-    m = max([i[1] for i in test])
-    return m
+    """ The greatest height of the origins of the descendants of ``root``,
+    in the coordinate system of ``root`` """
+    return _tree(state)._max_z(root)
 
 
 def stringify(state, root=None):
@@ -191,9 +385,6 @@ def stringify(state, root=None):
     ])
 
 
-def bind(state):
-    state = UserDict(state.copy())
-    # add syntax sugar for chaining add operations
-    state.add = functools.partial(add, state)
-
-    return state
+def bind(state) -> PoseTree:
+    """ The state, with syntax sugar for chaining add operations """
+    return _tree(state)
@@ -1,7 +1,7 @@
 import numpy as np  # type: ignore
 from numpy import insert, dot  # type: ignore
 from numpy.linalg import inv  # type: ignore
-from typing import List, Tuple, Union
+from typing import List, Sequence, Tuple, Union
 
 
 def identity_deck_transform():
@@ -145,3 +145,71 @@ def apply_reverse(
     """ Like apply_transform but inverts the transform first
     """
     return apply_transform(inv(t), pos)
+
+
+class CachedTransform:
+    """ A transform matrix prepared for applying to many points.
+
+    The matrix and its inverse are built once, so applying the transform
+    costs a single matrix-vector product. Use :py:meth:`apply_many` and
+    :py:meth:`apply_reverse_many` to transform a list of points (such as the
+    waypoints of a move) with one product instead of one per point.
+    """
+    def __init__(self, t: Union[List[List[float]], np.ndarray]) -> None:
+        """
+        :param t: A transformation matrix from one 3D space [A] to another [B]
+        """
+        #: The matrix this was built from
+        self.source = t
+        self._forward = np.array(t, dtype=float)
+        self._reverse = inv(self._forward)
+
+    @staticmethod
+    def _apply(t: np.ndarray,
+               pos: Tuple[float, float, float],
+               with_offsets: bool) -> Tuple[float, float, float]:
+        extended = 1.0 if with_offsets else 0.0
+        return tuple(  # type: ignore
+            t.dot((pos[0], pos[1], pos[2], extended))[:3].tolist())
+
+    @staticmethod
+    def _apply_many(t: np.ndarray,
+                    positions: Sequence[Tuple[float, float, float]]
+                    ) -> List[Tuple[float, float, float]]:
+        extended = np.ones((len(positions), 4))
+        extended[:, :3] = positions
+        return [tuple(row)  # type: ignore
+                for row in extended.dot(t.T)[:, :3].tolist()]
+
+    def apply(self,
+              pos: Tuple[float, float, float],
+              with_offsets=True) -> Tuple[float, float, float]:
+        """ As :py:func:`apply_transform`
+
+        :param pos: XYZ point in space A
+        :return: corresponding XYZ point in space B
+        """
+        return self._apply(self._forward, pos, with_offsets)
+
+    def apply_reverse(self,
+                      pos: Tuple[float, float, float],
+                      with_offsets=True) -> Tuple[float, float, float]:
+        """ As :py:func:`apply_reverse`
+
+        :param pos: XYZ point in space B
+        :return: corresponding XYZ point in space A
+        """
+        return self._apply(self._reverse, pos, with_offsets)
+
+    def apply_many(self,
+                   positions: Sequence[Tuple[float, float, float]]
+                   ) -> List[Tuple[float, float, float]]:
+        """ Apply the transform to each of a list of XYZ points in space A """
+        return self._apply_many(self._forward, positions)
+
+    def apply_reverse_many(self,
+                           positions: Sequence[Tuple[float, float, float]]
+                           ) -> List[Tuple[float, float, float]]:
+        """ Apply the inverse transform to each of a list of XYZ points in
+        space B """
+        return self._apply_many(self._reverse, positions)
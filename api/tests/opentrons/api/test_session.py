@@ -3,8 +3,11 @@ import itertools
 import pytest
 import ast
 
+from opentrons.api import session as session_module
 from opentrons.api.session import (
-    _accumulate, _get_labware, _dedupe, extract_metadata, infer_version)
+    _get_labware, _SimulationRecorder, extract_metadata, infer_version,
+    Session, SimulationCancelled)
+from opentrons.commands import tree, types as command_types
 from tests.opentrons.conftest import state
 from opentrons.legacy_api.robot.robot import Robot
 from functools import partial
@@ -141,6 +144,41 @@ async def test_load_and_run_v2(
         "Clears command log on the next run"
 
 
+@pytest.mark.api2_only
+@pytest.mark.parametrize('protocol_file', ['testosaur_v2.py'])
+def test_stream_simulation(main_router, protocol, protocol_file,
+                           monkeypatch):
+    monkeypatch.setattr(session_module, 'SIMULATION_CHUNK_SIZE', 2)
+    updates = []
+    main_router.broker.subscribe(
+        Session.SIMULATION_TOPIC, lambda msg: updates.append(msg['payload']))
+    session = main_router.session_manager.create(
+        name='<blank>', text=protocol.text, stream_simulation=True)
+
+    assert len(updates) == 3
+    assert [update['progress'] for update in updates] == [2, 4, 4]
+    assert [update['done'] for update in updates] == [False, False, True]
+    streamed = [command
+                for update in updates for command in update['commands']]
+    assert tree.from_list(streamed) == session.commands
+
+
+@pytest.mark.api2_only
+@pytest.mark.parametrize('protocol_file', ['testosaur_v2.py'])
+def test_cancel_simulation(main_router, protocol, protocol_file):
+    manager = main_router.session_manager
+
+    def replace_protocol(message):
+        # Replacing the protocol from another thread cancels this simulation
+        manager._simulating_session.cancel_simulation()
+
+    main_router.broker.subscribe(command_types.COMMAND, replace_protocol)
+    with pytest.raises(SimulationCancelled):
+        manager.create(name='<blank>', text=protocol.text)
+    assert manager.session is None
+    assert not manager._session_lock
+
+
 @pytest.mark.api1_only
 @pytest.mark.parametrize('protocol_file', ['testosaur.py'])
 async def test_load_and_run(
@@ -227,16 +265,19 @@ async def test_get_instruments_and_containers(labware_setup,
     instruments, tip_racks, plates, commands = labware_setup
     p50, p1000 = instruments
 
-    instruments, containers, modules, interactions = \
-        _accumulate([_get_labware(command) for command in commands])
+    recorder = _SimulationRecorder()
+    for command in commands:
+        recorder.record({'$': 'before', 'payload': command})
+        recorder.record({'$': 'after', 'payload': command})
+    instruments, containers, modules, interactions = recorder.found
 
     session = session_manager.create(name='', text='')
-    # We are calling dedupe directly for testing purposes.
-    # Normally it is called from within a session
-    session._instruments.extend(_dedupe(instruments))
-    session._containers.extend(_dedupe(containers))
-    session._modules.extend(_dedupe(modules))
-    session._interactions.extend(_dedupe(interactions))
+    # We are adding what the recorder found directly for testing purposes.
+    # Normally it is added from within a session
+    session._instruments.extend(instruments)
+    session._containers.extend(containers)
+    session._modules.extend(modules)
+    session._interactions.extend(interactions)
 
     instruments = session.get_instruments()
     containers = session.get_containers()
@@ -259,19 +300,13 @@ async def test_get_instruments_and_containers(labware_setup,
     assert modules == []
 
 
-def test_accumulate():
-    res = \
-        _accumulate([
-            (['a'], ['d'], ['g', 'h']),
-            (['b', 'c'], ['e', 'f'], ['i'])
-        ])
-
-    assert res == (['a', 'b', 'c'], ['d', 'e', 'f'], ['g', 'h', 'i'])
-    assert _accumulate([]) == ([], [], [], [])
-
-
-def test_dedupe():
-    assert ''.join(_dedupe('aaaaabbbbcbbbbcccaa')) == 'abc'
+def test_recorder_dedupes_labware():
+    recorder = _SimulationRecorder()
+    for name in 'aaaaabbbbcbbbbcccaa':
+        recorder.record({'$': 'before', 'payload': {'instrument': name}})
+        recorder.record({'$': 'after', 'payload': {'instrument': name}})
+    assert ''.join(recorder.found[0]) == 'abc'
+    assert recorder.count == 19
 
 
 @pytest.mark.api1_only
@@ -291,16 +326,12 @@ def test_get_labware(labware_setup):
          [],
          [(p1000, plates[0]), (p1000, plates[1])])
 
-    instruments, containers, modules, interactions = \
-        _accumulate([_get_labware(command) for command in commands])
+    recorder = _SimulationRecorder()
+    for command in commands:
+        recorder.record({'$': 'before', 'payload': command})
+        recorder.record({'$': 'after', 'payload': command})
 
-    assert \
-        [
-            list(_dedupe(instruments)),
-            list(_dedupe(containers)),
-            list(_dedupe(modules)),
-            list(_dedupe(interactions))
-        ] == \
+    assert [list(found) for found in recorder.found] == \
         [
             [p100, p1000],
             [plates[0], plates[1]],
@@ -1,5 +1,6 @@
 from math import pi, sin, cos
-from opentrons.util.linal import solve, add_z, apply_transform
+from opentrons.util.linal import (solve, add_z, apply_transform,
+                                  apply_reverse, CachedTransform)
 from numpy.linalg import inv
 import numpy as np
 
@@ -68,3 +69,22 @@ def test_apply_transform():
 
     result = apply_transform(inv(transform), (x, y, z))
     assert result == expected
+
+
+def test_cached_transform():
+    t = [[1.0, 0.01, 0.0, -30.1],
+         [-0.02, 1.0, 0.0, 4.2],
+         [0.0, 0.0, 1.0, 2.5],
+         [0.0, 0.0, 0.0, 1.0]]
+    cached = CachedTransform(t)
+    points = [(100.0, 200.0, 50.0), (0.0, 0.0, 0.0), (-5.5, 12.25, 80.0)]
+    for point in points:
+        assert cached.apply(point) == apply_transform(t, point)
+        assert cached.apply(point, with_offsets=False)\
+            == apply_transform(t, point, with_offsets=False)
+        assert cached.apply_reverse(point) == apply_reverse(t, point)
+        assert np.allclose(cached.apply_reverse(cached.apply(point)), point)
+    assert np.allclose(cached.apply_many(points),
+                       [cached.apply(point) for point in points])
+    assert np.allclose(cached.apply_reverse_many(points),
+                       [cached.apply_reverse(point) for point in points])
@@ -53,3 +53,17 @@ def test_command_tree():
             'children': []
         }
     ]
+
+
+def test_tree_builder():
+    builder = tree.TreeBuilder()
+    a = builder.add({'level': 0, 'description': 'A', 'id': 0})
+    b = builder.add({'level': 1, 'description': 'B', 'id': 1})
+    assert builder.tree == [a]
+    assert a['children'] == [b]
+
+    # Skipped levels nest under the deepest open command
+    c = builder.add({'level': 3, 'description': 'C', 'id': 2})
+    assert b['children'] == [c]
+    d = builder.add({'level': 1, 'description': 'D', 'id': 3})
+    assert a['children'] == [b, d]
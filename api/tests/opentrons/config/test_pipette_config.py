@@ -184,3 +184,36 @@ def test_mutable_configs_only(monkeypatch):
         set(pipette_config.MUTABLE_CONFIGS)
     # ensure empty
     assert bool(difference) is False
+
+
+@pytest.mark.parametrize('pipette_model', pipette_config.config_models)
+def test_volume_conversion(pipette_model):
+    config = pipette_config.load(pipette_model)
+    for sequence in config.ul_per_mm.values():
+        conversion = pipette_config.volume_conversion(sequence)
+        assert pipette_config.volume_conversion(sequence) is conversion
+        volumes = [0, 0.5, config.min_volume, config.max_volume / 2,
+                   config.max_volume] + [seg[0] for seg in sequence]
+        for volume in volumes:
+            segment = [seg for seg in sequence if volume <= seg[0]][0]
+            expected = segment[1]*volume + segment[2]
+            assert conversion(volume) == expected
+            assert pipette_config.piecewise_volume_conversion(
+                volume, sequence) == expected
+        assert list(conversion.many(volumes)) == [
+            conversion(volume) for volume in volumes]
+
+
+def test_volume_conversion_changes():
+    sequence = [[10, 1, 0], [5, 2, 0], [20, 3, 0]]
+    # The first segment that can hold the volume wins, even if it is not
+    # the tightest one
+    assert pipette_config.piecewise_volume_conversion(4, sequence) == 4
+    assert pipette_config.piecewise_volume_conversion(15, sequence) == 45
+    with pytest.raises(IndexError):
+        pipette_config.piecewise_volume_conversion(25, sequence)
+    with pytest.raises(IndexError):
+        pipette_config.volume_conversion(sequence).many([1, 25])
+
+    sequence[0][1] = 2
+    assert pipette_config.piecewise_volume_conversion(4, sequence) == 8
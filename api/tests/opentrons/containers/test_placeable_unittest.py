@@ -77,6 +77,24 @@ def test_int_index():
     assert c[1] == c.get_child_by_name('B1')
 
 
+def test_indices_follow_added_wells():
+    c = generate_plate(4, 2, (5, 5), (0, 0), 5)
+    assert c.get_index_from_name('B2') == 3
+    assert len(c.rows['A']) == 2
+    with pytest.raises(ValueError):
+        c.get_index_from_name('A3')
+
+    well = Well(properties={'radius': 5, 'height': 0})
+    c.add(well, 'A3', (0, 10, 0))
+    assert c.get_index_from_name('A3') == 4
+    assert c[4] is well
+    assert len(c) == 5
+    assert c.wells('A3') is well
+    assert c.rows['A']['3'] is well
+    assert c.wells()[-1] is well
+    assert c['A2':'A3'].get_children_list() == [c['A2'], c['B2']]
+
+
 def test_add_placeables():
     a = generate_plate(4, 2, (5, 5), (0, 0), 5)
     b = generate_plate(4, 2, (5, 5), (0, 0), 5)
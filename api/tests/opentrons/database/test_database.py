@@ -1,3 +1,5 @@
+import os
+
 import pytest
 
 from opentrons.legacy_api.containers import load as containers_load
@@ -59,3 +61,48 @@ def test_invalid_container_name():
     error_type = ValueError
     with pytest.raises(error_type):
         database.load_container("fake_container")
+
+
+def test_loaded_containers_follow_changes():
+    robot.reset()
+    plate = containers_load(robot, '96-flat', '1')
+    database.save_new_container(plate, 'copied-96-flat')
+
+    first = database.load_container('copied-96-flat')
+    second = database.load_container('copied-96-flat')
+    assert first is not second
+    assert [w.get_name() for w in first] == [w.get_name() for w in plate]
+    assert first['H12'].coordinates() == second['H12'].coordinates()
+    first['A1'].properties['diameter'] = 1
+    assert second['A1'].properties['diameter'] == 6.4
+
+    first.properties['type'] = 'copied-96-flat'
+    first._coordinates = Vector(1, 2, 3)
+    database.overwrite_container(first)
+    assert database.load_container('copied-96-flat')._coordinates \
+        == Vector(1, 2, 3)
+
+    database.delete_container('copied-96-flat')
+    assert 'copied-96-flat' not in database.list_all_containers()
+    with pytest.raises(ValueError):
+        database.load_container('copied-96-flat')
+
+
+def test_forked_process_opens_own_connection():
+    database.get_version()
+    parent_connection = database._connection
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            database.get_version()
+            fresh = database._connection is not parent_connection
+            os.write(write, b'1' if fresh else b'0')
+        finally:
+            os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    assert os.read(read, 1) == b'1'
+    os.close(read)
+    assert database._connection is parent_connection
+    database.get_version()
@@ -304,6 +304,204 @@ def test_plunger_commands(smoothie, monkeypatch):
     fuzzy_assert(result=command_log, expected=expected)
 
 
+def test_streaming_moves(smoothie, monkeypatch):
+    from opentrons.drivers import serial_communication
+    from opentrons.drivers.smoothie_drivers import driver_3_0
+    command_log = []
+    smoothie._setup()
+    smoothie.home()
+    smoothie.simulating = False
+
+    def write_with_log(command, ack, connection, timeout, tag=None):
+        command_log.append(command.strip())
+        return driver_3_0.SMOOTHIE_ACK
+
+    def _parse_position_response(arg):
+        return smoothie.position
+
+    monkeypatch.setattr(
+        serial_communication, 'write_and_return', write_with_log)
+    monkeypatch.setattr(
+        driver_3_0, '_parse_position_response', _parse_position_response)
+
+    smoothie.set_streaming(True, window=3)
+    assert smoothie.streaming
+
+    # gantry moves with unchanged currents are queued without M400
+    smoothie.move({'X': 10, 'Y': 10})
+    smoothie.move({'X': 20, 'Y': 20})
+    expected = [
+        ['M907 A0.1 B0.05 C0.05 X1.25 Y1.25 Z0.1 G4P0.005 G0X10Y10'],
+        ['M907 A0.1 B0.05 C0.05 X1.25 Y1.25 Z0.1 G4P0.005 G0X20Y20'],
+    ]
+    fuzzy_assert(result=command_log, expected=expected)
+    assert len(smoothie.streamed_commands) == 2
+    command_log = []
+
+    # filling the window forces a sync
+    smoothie.move({'X': 30, 'Y': 30})
+    expected = [
+        ['M907 A0.1 B0.05 C0.05 X1.25 Y1.25 Z0.1 G4P0.005 G0X30Y30'],
+        ['M400'],
+    ]
+    fuzzy_assert(result=command_log, expected=expected)
+    assert smoothie.streamed_commands == []
+    command_log = []
+
+    # plunger moves are sync points
+    smoothie.move({'X': 40, 'Y': 40})
+    smoothie.move({'B': 2})
+    expected = [
+        ['M907 A0.1 B0.05 C0.05 X1.25 Y1.25 Z0.1 G4P0.005 G0X40Y40'],
+        ['M400'],
+        ['M907 A0.1 B0.5 C0.05 X0.3 Y0.3 Z0.1 G4P0.005 G0B2'],
+        ['M400'],
+        ['M907 A0.1 B0.05 C0.05 X0.3 Y0.3 Z0.1 G4P0.005'],
+        ['M400'],
+    ]
+    fuzzy_assert(result=command_log, expected=expected)
+    command_log = []
+
+    # so are other commands, such as reading the position
+    smoothie.move({'X': 50})
+    smoothie.update_position()
+    expected = [
+        ['M907 A0.1 B0.05 C0.05 X1.25 Y0.3 Z0.1 G4P0.005 G0X50'],
+        ['M400'],
+        ['M114.2'],
+        ['M400'],
+    ]
+    fuzzy_assert(result=command_log, expected=expected)
+    command_log = []
+
+    # disabling streaming waits for anything still queued
+    smoothie.move({'X': 60})
+    smoothie.set_streaming(False)
+    assert not smoothie.streaming
+    smoothie.move({'X': 70})
+    expected = [
+        ['M907 A0.1 B0.05 C0.05 X1.25 Y0.3 Z0.1 G4P0.005 G0X60'],
+        ['M400'],
+        ['M907 A0.1 B0.05 C0.05 X1.25 Y0.3 Z0.1 G4P0.005 G0X70'],
+        ['M400'],
+    ]
+    fuzzy_assert(result=command_log, expected=expected)
+
+    with pytest.raises(ValueError):
+        smoothie.set_streaming(True, window=0)
+
+
+def test_streaming_error_clears_pending(smoothie, monkeypatch):
+    from opentrons.drivers import serial_communication
+    from opentrons.drivers.smoothie_drivers import driver_3_0
+    smoothie._setup()
+    smoothie.home()
+    smoothie.simulating = False
+    homed = []
+
+    def write_and_return(command, ack, connection, timeout, tag=None):
+        if command.strip() == 'M400':
+            return 'error:Alarm lock\r\n'
+        return driver_3_0.SMOOTHIE_ACK
+
+    def _parse_position_response(arg):
+        return smoothie.position
+
+    monkeypatch.setattr(
+        serial_communication, 'write_and_return', write_and_return)
+    monkeypatch.setattr(
+        driver_3_0, '_parse_position_response', _parse_position_response)
+    monkeypatch.setattr(smoothie, '_reset_from_error', lambda: None)
+    monkeypatch.setattr(smoothie, 'home', lambda axes: homed.append(axes))
+
+    smoothie.set_streaming(True)
+    smoothie.move({'X': 10})
+    assert len(smoothie.streamed_commands) == 1
+
+    with pytest.raises(driver_3_0.SmoothieError):
+        smoothie.wait_for_moves()
+    assert smoothie.streamed_commands == []
+    assert homed
+
+
+def test_estimate_move_duration():
+    from opentrons.drivers.smoothie_drivers.kinematics import \
+        estimate_move_duration
+    max_speeds = {'X': 600, 'Y': 400, 'B': 40}
+    accelerations = {'X': 3000, 'Y': 2000, 'B': 200}
+
+    # no movement
+    assert estimate_move_duration(
+        {'X': 0, 'Y': 0}, {'X': 0}, 400, max_speeds, accelerations) == 0
+
+    # long enough to reach speed: accelerate, cruise and decelerate
+    assert estimate_move_duration(
+        {'X': 0, 'Y': 0}, {'X': 100}, 400, max_speeds, accelerations)\
+        == pytest.approx(100 / 400 + 400 / 3000)
+
+    # too short to reach speed: triangular profile
+    assert estimate_move_duration(
+        {'X': 0, 'Y': 0}, {'X': 10}, 400, max_speeds, accelerations)\
+        == pytest.approx(2 * (10 / 3000) ** 0.5)
+
+    # the axis max speed limits the requested speed
+    assert estimate_move_duration(
+        {'B': 0}, {'B': 100}, 400, max_speeds, accelerations)\
+        == pytest.approx(100 / 40 + 40 / 200)
+
+    # a diagonal move is limited by its slowest axis
+    diagonal = estimate_move_duration(
+        {'X': 0, 'Y': 0}, {'X': 300, 'Y': 300}, 600,
+        max_speeds, accelerations)
+    distance = (2 * 300 ** 2) ** 0.5
+    speed = 400 * distance / 300
+    acceleration = 2000 * distance / 300
+    assert diagonal == pytest.approx(
+        distance / speed + speed / acceleration)
+
+
+def test_move_timeout_from_estimate(smoothie, monkeypatch):
+    from opentrons.drivers import serial_communication
+    from opentrons.drivers.smoothie_drivers import driver_3_0
+    smoothie.home()
+    smoothie.simulating = False
+    timeouts = []
+
+    def write_with_log(command, ack, connection, timeout, tag=None):
+        timeouts.append((command.strip(), timeout))
+        if 'M114.2' in command:
+            return 'ok MCS: X:0.00 Y:0.00 Z:0.00 A:0.00 B:0.00 C:0.00'
+        return driver_3_0.SMOOTHIE_ACK
+
+    monkeypatch.setattr(
+        serial_communication, 'write_and_return', write_with_log)
+
+    start_time = smoothie.estimated_motion_time
+    smoothie.set_speed(1)
+    timeouts.clear()
+    # a slow move takes longer than the default movement timeout
+    smoothie.move({'X': smoothie.position['X'] - 100})
+    expected = smoothie.estimated_motion_time - start_time
+    assert expected > driver_3_0.DEFAULT_MOVEMENT_TIMEOUT
+    assert timeouts[-1] == (
+        'M400', expected * driver_3_0.MOVEMENT_TIMEOUT_FACTOR)
+
+    # but short moves never get less than the default
+    smoothie.set_speed(400)
+    timeouts.clear()
+    smoothie.move({'X': smoothie.position['X'] - 1})
+    assert timeouts[-1] == ('M400', driver_3_0.DEFAULT_MOVEMENT_TIMEOUT)
+
+    # commands without an estimate, like homes and dwells, wait as long as
+    # they need to
+    timeouts.clear()
+    smoothie.home('X')
+    smoothie.delay(0.5)
+    assert timeouts
+    assert all(timeout == driver_3_0.DEFAULT_WAIT_TIMEOUT
+               for command, timeout in timeouts if command == 'M400')
+
+
 def test_set_active_current(smoothie, monkeypatch):
     from opentrons.drivers import serial_communication
     from opentrons.drivers.smoothie_drivers import driver_3_0
@@ -931,7 +1129,7 @@ def test_unstick_axes(model):
 
     current_log = []
 
-    def send_command_mock(self, command, timeout=None):
+    def send_command_mock(self, command, timeout=None, **kwargs):
         nonlocal current_log
         current_log.append(command)
         if 'M119' in command:
@@ -969,7 +1167,7 @@ def test_unstick_axes(model):
     # pprint(current_log)
     assert current_log == expected
 
-    def send_command_mock(self, command, timeout=None):
+    def send_command_mock(self, command, timeout=None, **kwargs):
         nonlocal current_log
         current_log.append(command)
         if 'M119' in command:
@@ -997,7 +1195,7 @@ def test_unstick_axes(model):
     # pprint(current_log)
     assert current_log == expected
 
-    def send_command_mock(self, command, timeout=None):
+    def send_command_mock(self, command, timeout=None, **kwargs):
         nonlocal current_log
         current_log.append(command)
         if 'M119' in command:
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pytest
+
+from opentrons.drivers import serial_communication
+from opentrons.drivers.serial_transport import SerialTransport
+
+
+def test_calls_in_order_from_worker():
+    transport = SerialTransport('test')
+    calls = []
+
+    def record(value):
+        calls.append((value, threading.current_thread()))
+        if value == 'outer':
+            # calls made from the worker run immediately
+            transport.call(record, 'inner')
+        return value
+
+    futs = [transport.submit(record, value) for value in ('a', 'b')]
+    assert transport.call(record, 'outer') == 'outer'
+    assert [fut.result() for fut in futs] == ['a', 'b']
+    assert [value for value, _ in calls] == ['a', 'b', 'outer', 'inner']
+    worker = calls[0][1]
+    assert worker is not threading.current_thread()
+    assert all(thread is worker for _, thread in calls)
+    transport.close()
+
+
+async def test_call_async(loop, monkeypatch):
+    transport = SerialTransport('test')
+    release = threading.Event()
+    calls = []
+
+    def write_and_return(command, ack, connection, timeout, tag=None):
+        calls.append((command, timeout))
+        release.wait()
+        return command.upper()
+
+    monkeypatch.setattr(
+        serial_communication, 'write_and_return', write_and_return)
+
+    # The loop keeps running while the worker waits for the device
+    slow = loop.create_task(
+        transport.write_and_return_async('slow', 'ok', None, timeout=2))
+    await asyncio.sleep(0.05)
+    assert calls == [('slow', 2)]
+
+    # Commands that time out before they are sent are never sent
+    with pytest.raises(asyncio.TimeoutError):
+        await transport.call_async(calls.append, 'late', timeout=0.01)
+    # let the cancellation reach the queued call
+    await asyncio.sleep(0.01)
+
+    release.set()
+    assert await slow == 'SLOW'
+    assert await transport.write_and_return_async(
+        'next', 'ok', None) == 'NEXT'
+    assert calls == [('slow', 2),
+                     ('next', serial_communication.DEFAULT_WRITE_TIMEOUT)]
+    transport.close()
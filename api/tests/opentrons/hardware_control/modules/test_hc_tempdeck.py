@@ -1,6 +1,6 @@
 import asyncio
 from opentrons.hardware_control import modules
-from opentrons.hardware_control.modules import tempdeck
+from opentrons.hardware_control.modules import monitor
 
 
 async def test_sim_initialization():
@@ -35,16 +35,42 @@ async def test_sim_update():
     assert temp.status == 'idle'
 
 
-async def test_poller(monkeypatch):
+async def test_status_published():
     temp = modules.tempdeck.TempDeck('', True)
-    hit = False
+    await temp._connect()
+    published = []
+    temp.status_monitor.broker.subscribe(
+        monitor.STATUS_TOPIC, published.append)
+    temp.set_temperature(10)
+    await asyncio.wait_for(temp.wait_for_temp(), timeout=0.2)
+    assert published == [temp.live_data]
+    assert published[0]['status'] == 'holding at target'
 
-    def update_called():
-        nonlocal hit
-        hit = True
 
-    monkeypatch.setattr(temp._driver, 'update_temperature', update_called)
-    await temp._connect()
-    assert temp._poller.is_alive()
-    await asyncio.sleep(tempdeck.TEMP_POLL_INTERVAL_SECS * 1.1)
-    assert hit
+async def test_monitor_polls(loop):
+    state = {'status': 'heating', 'polls': 0}
+
+    async def update():
+        state['polls'] += 1
+        if state['polls'] == 3:
+            state['status'] = 'holding at target'
+
+    def poll_interval():
+        return None if state['status'] == 'idle' else 0.01
+
+    mon = monitor.ModuleMonitor(
+        loop, lambda: dict(state), poll_interval, update)
+    # Nothing is polled until the monitor is woken
+    await asyncio.sleep(0.05)
+    assert state['polls'] == 0
+    await asyncio.wait_for(
+        mon.wait_for(lambda: state['status'] == 'holding at target'),
+        timeout=1)
+    assert state['polls'] == 3
+
+    # Idle modules are not polled
+    state['status'] = 'idle'
+    await asyncio.sleep(0.05)
+    polls = state['polls']
+    await asyncio.sleep(0.05)
+    assert state['polls'] == polls
@@ -1,3 +1,5 @@
+import threading
+
 from opentrons.types import Mount
 from opentrons.hardware_control import adapters, API
 
@@ -9,3 +11,45 @@ def test_synch_adapter(loop):
     assert synch.attached_instruments[Mount.LEFT]['name']\
                 .startswith('p10_single')
     synch.join()
+
+
+def test_synch_adapter_simulator_runs_on_caller(loop):
+    api = API.build_hardware_simulator(loop=loop)
+    synch = adapters.SynchronousAdapter(api)
+    threads = []
+
+    async def which_thread():
+        threads.append(threading.current_thread())
+
+    api.which_thread = which_thread
+    synch.which_thread()
+    assert threads == [threading.current_thread()]
+    assert synch.home is synch.home
+    synch.home()
+    assert synch.current_position(Mount.RIGHT)
+    assert synch.is_alive()
+    synch.join()
+    assert not synch.is_alive()
+
+
+def test_synch_adapter_in_thread(loop):
+    api = API.build_hardware_simulator(loop=loop)
+    synch = adapters.SynchronousAdapter(api, run_in_thread=True)
+    threads = []
+
+    async def which_thread():
+        threads.append(threading.current_thread())
+
+    api.which_thread = which_thread
+    synch.which_thread()
+    assert threads == [synch]
+    synch.join()
+
+
+async def test_synch_adapter_from_running_loop(loop):
+    api = API.build_hardware_simulator(loop=loop)
+    synch = adapters.SynchronousAdapter(api)
+    # Called from a coroutine, so another loop is already running here
+    synch.home()
+    assert synch.current_position(Mount.RIGHT)
+    synch.join()
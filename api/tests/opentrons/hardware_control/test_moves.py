@@ -111,6 +111,22 @@ async def test_move(hardware_api):
     assert hardware_api._current_position == target_position2
 
 
+async def test_estimated_motion_time(hardware_api):
+    await hardware_api.home()
+    homed = hardware_api.estimated_motion_time
+    mount = types.Mount.RIGHT
+    await hardware_api.move_rel(mount, types.Point(0, 0, -10))
+    short = hardware_api.estimated_motion_time - homed
+    assert short > 0
+    await hardware_api.move_rel(mount, types.Point(-300, 0, 0))
+    long = hardware_api.estimated_motion_time - homed - short
+    assert long > short
+    # moving nowhere takes no time
+    before = hardware_api.estimated_motion_time
+    await hardware_api.move_rel(mount, types.Point(0, 0, 0))
+    assert hardware_api.estimated_motion_time == before
+
+
 async def test_mount_offset_applied(hardware_api):
     await hardware_api.home()
     abs_position = types.Point(30, 20, 10)
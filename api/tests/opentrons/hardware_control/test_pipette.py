@@ -82,6 +82,20 @@ def test_config_update():
         assert pip.config.top == sample_plunger_pos.get('top')
 
 
+def test_volume_conversion_follows_config():
+    pip = pipette.Pipette('p10_single_v1',
+                          {'single': [0, 0, 0], 'multi': [0, 0, 0]},
+                          'testID')
+    conversion = pip.volume_conversion('aspirate')
+    assert pip.volume_conversion('aspirate') is conversion
+    assert pip.ul_per_mm(5, 'aspirate') == conversion(5)
+
+    pip.update_config_item(
+        'ul_per_mm', {'aspirate': [[10, 0, 2]], 'dispense': [[10, 0, 3]]})
+    assert pip.ul_per_mm(5, 'aspirate') == 2
+    assert pip.ul_per_mm(5, 'dispense') == 3
+
+
 def test_smoothie_config_update(monkeypatch):
     for config in pipette_config.config_models:
         assert config == config
@@ -242,3 +242,121 @@ def test_serializers(paramtype, native, serializable, config_tempdir):
     serdes = sockserv._SERDES[paramtype]
     assert serdes.serializer(native) == serializable
     assert serdes.deserializer(serializable) == native
+
+
+async def test_batch(hc_stream_server, loop):
+    sock, server = hc_stream_server
+    reader, writer = await asyncio.open_unix_connection(sock)
+    decoder = sockserv.JsonStreamDecoder(reader)
+    writer.write(json.dumps([
+        {'jsonrpc': '2.0', 'method': 'home', 'params': {}, 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'move_to',
+         'params': {'mount': 'right', 'abs_position': [50, 50, 100]}},
+        {'jsonrpc': '2.0', 'method': 'gantry_position',
+         'params': {'mount': 'right'}, 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'aouhsoashdas', 'params': {}, 'id': 3},
+    ]).encode())
+    resp = await decoder.read_object()
+    # Notifications get no response, and the rest come back in order
+    assert [r['id'] for r in resp] == [1, 2, 3]
+    assert resp[1]['result'] == [50, 50, 100]
+    assert resp[2]['error']['code'] == -32601
+
+
+async def test_motion_script(hc_stream_server, loop):
+    sock, server = hc_stream_server
+    reader, writer = await asyncio.open_unix_connection(sock)
+    decoder = sockserv.JsonStreamDecoder(reader)
+    steps = [
+        {'method': 'home'},
+        {'method': 'move_to',
+         'params': {'mount': 'right', 'abs_position': [50, 50, 100]}},
+        {'method': 'gantry_position', 'params': {'mount': 'right'}},
+    ]
+    writer.write(json.dumps(
+        {'jsonrpc': '2.0', 'method': 'motion_script',
+         'params': {'steps': steps, 'tag': 'first'}, 'id': 1}).encode())
+    for index, step in enumerate(steps):
+        notification = await decoder.read_object()
+        assert notification['method'] == sockserv.MOTION_SCRIPT_STEP
+        assert notification['params']['index'] == index
+        assert notification['params']['method'] == step['method']
+        assert notification['params']['tag'] == 'first'
+    assert notification['params']['result'] == [50, 50, 100]
+    resp = await decoder.read_object()
+    assert resp == {'jsonrpc': '2.0', 'result': [None, None, [50, 50, 100]],
+                    'id': 1}
+
+    # Scripts stop at the first step that fails
+    steps = [{'method': 'gantry_position', 'params': {'mount': 'right'}},
+             {'method': 'aouhsoashdas'},
+             {'method': 'home'}]
+    writer.write(json.dumps(
+        {'jsonrpc': '2.0', 'method': 'motion_script',
+         'params': {'steps': steps}, 'id': 2}).encode())
+    notification = await decoder.read_object()
+    assert notification['params']['index'] == 0
+    resp = await decoder.read_object()
+    assert resp['id'] == 2
+    assert 'Step 1' in resp['error']['data']
+
+    # Results that are not serializable are sent as their repr
+    async def opaque():
+        return Mount.LEFT
+
+    server._methods.items['opaque'] = opaque
+    writer.write(json.dumps(
+        {'jsonrpc': '2.0', 'method': 'motion_script',
+         'params': {'steps': [{'method': 'opaque'}]}, 'id': 3}).encode())
+    notification = await decoder.read_object()
+    assert notification['params']['result'] == repr(Mount.LEFT)
+    resp = await decoder.read_object()
+    assert resp == {'jsonrpc': '2.0', 'result': [repr(Mount.LEFT)], 'id': 3}
+
+
+async def test_motion_script_holds_off_other_calls(hc_stream_server, loop):
+    sock, server = hc_stream_server
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def wait_for_release():
+        started.set()
+        await release.wait()
+
+    server._methods.items['wait_for_release'] = wait_for_release
+
+    script_reader, script_writer = await asyncio.open_unix_connection(sock)
+    script_decoder = sockserv.JsonStreamDecoder(script_reader)
+    other_reader, other_writer = await asyncio.open_unix_connection(sock)
+    other_decoder = sockserv.JsonStreamDecoder(other_reader)
+
+    await server._dispatch(json.dumps(
+        {'jsonrpc': '2.0', 'method': 'home', 'params': {}, 'id': 0}))
+    script_writer.write(json.dumps(
+        {'jsonrpc': '2.0', 'method': 'motion_script',
+         'params': {'steps': [
+             {'method': 'move_to',
+              'params': {'mount': 'right', 'abs_position': [50, 50, 100]}},
+             {'method': 'wait_for_release'},
+             {'method': 'gantry_position', 'params': {'mount': 'right'}}]},
+         'id': 1}).encode())
+    await started.wait()
+    # A call from another client while the script runs waits for it
+    other_writer.write(json.dumps(
+        {'jsonrpc': '2.0', 'method': 'move_to',
+         'params': {'mount': 'right', 'abs_position': [60, 60, 100]},
+         'id': 2}).encode())
+    await asyncio.sleep(0.1)
+    release.set()
+
+    for _ in range(3):
+        notification = await script_decoder.read_object()
+        assert notification['method'] == sockserv.MOTION_SCRIPT_STEP
+    resp = await script_decoder.read_object()
+    assert resp['result'][2] == [50, 50, 100]
+    resp = await other_decoder.read_object()
+    assert resp == {'jsonrpc': '2.0', 'result': None, 'id': 2}
+    assert await server._dispatch(json.dumps(
+        {'jsonrpc': '2.0', 'method': 'gantry_position',
+         'params': {'mount': 'right'}, 'id': 3}))\
+        == json.dumps({'jsonrpc': '2.0', 'result': [60, 60, 100], 'id': 3})
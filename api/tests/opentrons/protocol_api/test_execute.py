@@ -1,4 +1,9 @@
+import json
+import pathlib
+
+import jsonschema
 import pytest
+
 from opentrons.protocol_api import execute, ProtocolContext
 
 
@@ -100,3 +105,25 @@ def test_get_protocol_schema_version():
         get_protocol_schema_version({})
     with pytest.raises(RuntimeError):
         get_protocol_schema_version({'protocol-schema': '1.2.3'})
+
+
+def test_validate_protocol():
+    protocol_path = (pathlib.Path(__file__).parent/'..'/'..'/'..'/'..' /
+                     'shared-data'/'protocol'/'fixtures'/'3' /
+                     'testAllAtomicSingleV3.json')
+    protocol = json.loads(protocol_path.read_text())
+    execute.validate_protocol(protocol)
+    # validators are built once per schema version
+    assert execute._validator_for_version(3)\
+        is execute._validator_for_version(3)
+
+    protocol['commands'][2]['command'] = 'notACommand'
+    del protocol['commands'][5]['params']
+    with pytest.raises(jsonschema.ValidationError) as e:
+        execute.validate_protocol(protocol)
+    assert list(e.value.path)[:2] == ['commands', 2]
+
+    del protocol['robot']
+    with pytest.raises(jsonschema.ValidationError) as e:
+        execute.validate_protocol(protocol)
+    assert 'robot' in e.value.message
@@ -152,3 +152,49 @@ def test_dispatch_commands(monkeypatch, loop):
             {"force_direct": None, "minimum_z_height": None}),
         ("drop_tip", (ctx.fixed_trash['A1'],))
     ]
+
+
+def test_compile_json_flow_rates(loop):
+    command_log = []
+    mock_pipette = MockPipette(command_log)
+    ctx = ProtocolContext(loop=loop)
+    plate = ctx.load_labware('corning_96_wellplate_360ul_flat', '1')
+
+    def liquid_command(command, well, flow_rate):
+        return {
+            'command': command,
+            'params': {
+                'pipette': 'pipetteId',
+                'labware': 'plateId',
+                'well': well,
+                'volume': 5,
+                'flowRate': flow_rate,
+                'offsetFromBottomMm': 1
+            }
+        }
+
+    protocol_data = {
+        'commands': [
+            liquid_command('aspirate', 'A1', 3),
+            liquid_command('dispense', 'B1', 3),
+            liquid_command('aspirate', 'C1', 4),
+        ]
+    }
+    operations = execute_v3.compile_json(
+        ctx, protocol_data, {'pipetteId': mock_pipette}, {'plateId': plate})
+    # compiling does not run anything
+    assert command_log == []
+
+    for operation in operations:
+        operation()
+    assert command_log == [
+        ("set: flow_rate.aspirate", (3,)),
+        ("set: flow_rate.dispense", (3,)),
+        ("set: flow_rate.blow_out", (3,)),
+        ("aspirate", (5, plate['A1'].bottom(1),)),
+        ("dispense", (5, plate['B1'].bottom(1),)),
+        ("set: flow_rate.aspirate", (4,)),
+        ("set: flow_rate.dispense", (4,)),
+        ("set: flow_rate.blow_out", (4,)),
+        ("aspirate", (5, plate['C1'].bottom(1),)),
+    ]
@@ -244,3 +244,28 @@ def test_direct_cp():
     assert to_normal[0][1] == CriticalPoint.XY_CENTER
     assert to_normal[1][1] is None
     assert to_normal[2][1] is None
+
+
+def test_highest_z_invalidation():
+    deck = Deck()
+    lw = labware.load(labware_name, deck.position_for(1))
+    deck[1] = lw
+    lw.set_calibration(Point(0, 0, 10))
+    assert deck.highest_z == pytest.approx(lw.wells()[0].top().point.z)
+    lw.set_calibration(Point(0, 0, 0))
+    assert deck.highest_z == pytest.approx(lw.wells()[0].top().point.z)
+
+    mod = labware.load_module('tempdeck', deck.position_for(8))
+    deck[8] = mod
+    mod_lw = labware.load(labware_name, mod.location)
+    mod.add_labware(mod_lw)
+    assert deck.highest_z == mod.highest_z
+    mod_lw.set_calibration(Point(0, 0, 5))
+    assert deck.highest_z == mod.highest_z
+    mod.reset_labware()
+    assert deck.highest_z == mod.highest_z
+
+    # Items removed from the deck no longer affect it
+    del deck[1]
+    lw.set_calibration(Point(0, 0, 100))
+    assert deck.highest_z == mod.highest_z
@@ -179,6 +179,42 @@ def test_well_parent():
     assert well.center().labware.parent is lw
 
 
+def test_well_geometry():
+    labware_name = 'corning_384_wellplate_112ul_flat'
+    labware_def = labware.get_labware_definition(labware_name)
+    lw = labware.Labware(labware_def, Location(Point(1, 2, 3), 'Test Slot'))
+    geometry = lw._well_geometry
+    assert geometry.tops.shape == (384, 3)
+    for idx, well in enumerate(lw.wells()):
+        assert not hasattr(well, '__dict__')
+        assert Point(*geometry.tops[idx]) == well.top().point
+        assert Point(*geometry.centers[idx]) == well.center().point
+        assert geometry.sizes[idx][0] == well._length
+
+    # Accessors are built once, but callers get their own lists
+    rows = lw.rows()
+    assert len(rows) == 16
+    assert rows[0][1] is lw['A2']
+    rows[0].pop()
+    assert len(lw.rows()[0]) == 24
+    assert lw.columns_by_name()['24'][15] is lw['P24']
+    assert lw.rows_by_name()['Z'] == []
+    assert lw.columns_by_name()['25'] == []
+
+    # Recalibrating moves new wells, but not ones already handed out
+    a1 = lw['A1']
+    lw.set_calibration(Point(1, 1, 1))
+    assert lw['A1'].top().point == a1.top().point + Point(1, 1, 1)
+    assert lw.rows()[0][0] is lw['A1']
+    assert lw.row_index(a1) == lw.row_index(lw['A1']) == 0
+    assert lw.row_index(lw['P24']) == 15
+    other = labware.Labware(labware_def, Location(Point(1, 2, 3), 'Slot'))
+    assert other.row_index(a1) is None
+    assert a1.center().point == a1.bottom(a1._depth / 2.0).point
+    assert lw['A1'].bottom(1).point.z == pytest.approx(
+        lw['A1'].top(1 - lw['A1']._depth).point.z)
+
+
 def test_tip_tracking_init():
     labware_name = 'opentrons_96_tiprack_300ul'
     labware_def = labware.get_labware_definition(labware_name)
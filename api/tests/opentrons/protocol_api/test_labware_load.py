@@ -1,3 +1,6 @@
+import json
+import os
+
 import pytest
 from opentrons import protocol_api as papi, types
 
@@ -40,3 +43,52 @@ def test_deprecated_load(loop):
     ctx = papi.ProtocolContext(loop=loop)
     labware = ctx.load_labware_by_name(labware_name, '1', 'my cool labware')
     assert 'my cool labware' in str(labware)
+
+
+def test_definitions_cached():
+    first = papi.labware.get_labware_definition(labware_name)
+    second = papi.labware.get_labware_definition(labware_name.upper())
+    assert first is second
+
+
+def test_custom_definition_cache():
+    dfn = papi.labware.get_labware_definition(labware_name)
+    custom = dict(dfn)
+    custom['namespace'] = 'custom_beta'
+    custom['parameters'] = dict(dfn['parameters'], loadName='my_plate')
+    papi.labware.save_definition(custom)
+    loaded = papi.labware.get_labware_definition('my_plate')
+    assert loaded['parameters']['loadName'] == 'my_plate'
+    assert papi.labware.get_labware_definition('my_plate') is loaded
+
+    # Saving over a definition replaces the cached copy
+    custom['metadata'] = dict(dfn['metadata'], displayName='My Plate')
+    papi.labware.save_definition(custom, force=True)
+    reloaded = papi.labware.get_labware_definition('my_plate')
+    assert reloaded['metadata']['displayName'] == 'My Plate'
+
+    papi.labware.delete_all_custom_labware()
+    with pytest.raises(FileNotFoundError):
+        papi.labware.get_labware_definition('my_plate')
+
+
+def test_custom_definition_changed_on_disk():
+    dfn = papi.labware.get_labware_definition(labware_name)
+    custom = dict(dfn)
+    custom['namespace'] = 'custom_beta'
+    custom['parameters'] = dict(dfn['parameters'], loadName='my_plate')
+    papi.labware.save_definition(custom)
+    path = papi.labware._get_path_to_labware(
+        'my_plate', 'custom_beta', dfn['version'])
+    assert papi.labware.get_labware_definition('my_plate')
+
+    stat = path.stat()
+    custom['metadata'] = dict(dfn['metadata'], displayName='Edited')
+    path.write_text(json.dumps(custom))
+    os.utime(str(path), (stat.st_atime, stat.st_mtime + 10))
+    edited = papi.labware.get_labware_definition('my_plate')
+    assert edited['metadata']['displayName'] == 'Edited'
+
+    path.unlink()
+    with pytest.raises(FileNotFoundError):
+        papi.labware.get_labware_definition('my_plate')
@@ -0,0 +1,70 @@
+import pytest
+
+from opentrons.broker import Broker
+from opentrons.types import Mount
+from opentrons.protocol_api.simulation_pool import SimulationPool
+
+
+def test_checkout_reuses_reset_context(loop):
+    pool = SimulationPool()
+    broker = Broker()
+    published = []
+    broker.subscribe('command', published.append)
+
+    ctx = pool.checkout(loop=loop, broker=broker)
+    assert [slot for slot, lw in ctx.loaded_labwares.items() if lw] == [12]
+    tiprack = ctx.load_labware('opentrons_96_tiprack_300ul', 1)
+    instr = ctx.load_instrument('p300_single', Mount.RIGHT,
+                                tip_racks=[tiprack])
+    instr.pick_up_tip()
+    assert published
+    assert ctx.commands()
+    pool.checkin(ctx)
+    assert ctx.broker is not broker
+
+    again = pool.checkout(loop=loop)
+    assert again is ctx
+    assert [slot for slot, lw in again.loaded_labwares.items()
+            if lw] == [12]
+    assert again.loaded_instruments == {'left': None, 'right': None}
+    assert not again.commands()
+    # The tip picked up before checkin is gone
+    tiprack = again.load_labware('opentrons_96_tiprack_300ul', 1)
+    again.load_instrument('p300_single', Mount.RIGHT,
+                          tip_racks=[tiprack]).pick_up_tip()
+    pool.checkin(again)
+
+
+def test_checkout_by_hardware(loop):
+    pool = SimulationPool()
+    instrs = {Mount.LEFT: {'model': 'p10_single_v1.5', 'id': 'abc'}}
+    plain = pool.checkout(loop=loop)
+    pool.checkin(plain)
+    with_instr = pool.checkout(loop=loop, attached_instruments=instrs,
+                               strict_attached_instruments=False)
+    assert with_instr is not plain
+    hardware = with_instr._hw_manager.hardware
+    hardware.cache_instruments()
+    attached = hardware.attached_instruments
+    assert attached[Mount.LEFT]['model'] == 'p10_single_v1.5'
+    pool.checkin(with_instr)
+    assert pool.checkout(loop=loop) is plain
+
+
+def test_checkin_drops(loop):
+    pool = SimulationPool(size=1)
+    first = pool.checkout(loop=loop)
+    second = pool.checkout(loop=loop)
+    pool.checkin(first)
+    pool.checkin(second)
+    # Only the most recently checked in context is kept
+    assert pool.checkout(loop=loop) is second
+    assert pool.checkout(loop=loop) is not first
+
+    changed = pool.checkout(loop=loop)
+    changed.update_config(name='changed')
+    pool.checkin(changed)
+    assert pool.checkout(loop=loop) is not changed
+
+    with pytest.raises(ValueError):
+        SimulationPool().checkin(changed)
@@ -1,4 +1,5 @@
 """ Test the Transfer class and its functions """
+import numpy as np  # type: ignore
 import pytest
 import opentrons.protocol_api as papi
 from opentrons.types import Mount, TransferTipPolicy
@@ -676,3 +677,86 @@ def test_oversized_transfer(_instr_labware):
              'args': [200, lw1.wells_by_index()['C1'], 1.0], 'kwargs': {}},
             {'method': 'drop_tip', 'args': [], 'kwargs': {}}]
     assert xfer_plan_list == exp1
+
+
+def test_expand_for_volume_constraints():
+    def expand(volumes, max_volume):
+        for idx, volume in enumerate(volumes):
+            while volume > max_volume * 2:
+                yield max_volume, idx
+                volume -= max_volume
+            if volume > max_volume:
+                volume /= 2
+                yield volume, idx
+            yield volume, idx
+
+    volumes = [0, 10, 300, 301, 600, 601, 700, 900, 1234.5, 10000]
+    vols, idxs = tx.TransferPlan._expand_for_volume_constraints(
+        np.array(volumes, dtype=float), 300)
+    assert list(zip(vols.tolist(), idxs.tolist())) == list(expand(volumes,
+                                                                  300))
+
+
+def test_transfer_checks_volumes_up_front(_instr_labware, monkeypatch):
+    _instr_labware['ctx'].home()
+    lw1 = _instr_labware['lw1']
+    lw2 = _instr_labware['lw2']
+    instr = _instr_labware['instr']
+    hw_pipette = dict(instr.hw_pipette, ul_per_mm={
+        'aspirate': [[150, 0, 15]], 'dispense': [[300, 0, 15]]})
+    monkeypatch.setattr(type(instr), 'hw_pipette', hw_pipette)
+
+    xfer_plan = tx.TransferPlan(
+        [100, 200], lw1.columns()[0][:2], lw2.columns()[0][:2], instr,
+        max_volume=hw_pipette['working_volume'])
+    with pytest.raises(ValueError, match='aspirate 200'):
+        list(xfer_plan)
+
+    xfer_plan = tx.TransferPlan(
+        [100, 150], lw1.columns()[0][:2], lw2.columns()[0][:2], instr,
+        max_volume=hw_pipette['working_volume'])
+    assert len(list(xfer_plan)) == 6
+
+
+def test_gradient_transfer(_instr_labware):
+    _instr_labware['ctx'].home()
+    lw1 = _instr_labware['lw1']
+    lw2 = _instr_labware['lw2']
+
+    xfer_plan = tx.TransferPlan(
+        (100, 500), lw1.columns()[0][:5], lw2.columns()[0][:5],
+        _instr_labware['instr'],
+        max_volume=_instr_labware['instr'].hw_pipette['working_volume'])
+    aspirated = [(step['args'][0], step['args'][1]) for step in xfer_plan
+                 if step['method'] == 'aspirate']
+    col = lw1.columns()[0]
+    assert aspirated == [(100, col[0]), (200, col[1]), (300, col[2]),
+                         (200, col[3]), (200, col[3]),
+                         (250, col[4]), (250, col[4])]
+
+    options = tx.TransferOptions(
+        transfer=tx.Transfer(gradient_function=lambda x: x ** 2))
+    xfer_plan = tx.TransferPlan(
+        (10, 170), lw1.columns()[0][:5], lw2.columns()[0][:5],
+        _instr_labware['instr'],
+        max_volume=_instr_labware['instr'].hw_pipette['working_volume'],
+        options=options)
+    assert [step['args'][0] for step in xfer_plan
+            if step['method'] == 'aspirate'] == [10, 20, 50, 100, 170]
+
+
+def test_multichannel_well_filter(_instr_labware):
+    ctx = _instr_labware['ctx']
+    ctx.home()
+    lw1 = _instr_labware['lw1']
+    lw2 = _instr_labware['lw2']
+    multi = ctx.load_instrument('p300_multi', Mount.LEFT,
+                                tip_racks=[_instr_labware['tiprack']])
+
+    xfer_plan = tx.TransferPlan(
+        100, lw1.columns()[:2], lw2.columns()[:2], multi,
+        max_volume=multi.hw_pipette['working_volume'])
+    steps = [(step['method'], step['args'][1]) for step in xfer_plan
+             if step['method'] in ('aspirate', 'dispense')]
+    assert steps == [('aspirate', lw1['A1']), ('dispense', lw2['A1']),
+                     ('aspirate', lw1['A2']), ('dispense', lw2['A2'])]
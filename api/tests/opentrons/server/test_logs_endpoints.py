@@ -1,4 +1,13 @@
+import asyncio
 import json
+import math
+import sys
+import time
+import types
+
+import pytest
+from aiohttp import web
+
 from opentrons import config
 from opentrons.server import init
 
@@ -28,3 +37,184 @@ async def test_log_endpoints(
     a1 = await cli.get('/logs/api.log')
     a1body = await a1.text()
     assert json.loads(a1body) == data2
+
+
+class FakeReader:
+    """ Enough of systemd.journal.Reader to read a list of records.
+
+    The position is between records when it is a half-integer, and on a
+    record when it is a whole number, as in the journal. """
+    def __init__(self, records, flags=None):
+        self._all = records
+        self._records = records
+        self._position = -0.5
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.closed = True
+
+    def add_match(self, SYSLOG_IDENTIFIER):
+        self._records = _Matching(self._all, SYSLOG_IDENTIFIER)
+
+    def seek_tail(self):
+        self._position = len(self._records) - 0.5
+
+    def seek_cursor(self, cursor):
+        # The next record read is the one at the cursor
+        self._position = self._records.index_of(cursor) - 0.5
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, 0.01))
+
+    def get_next(self):
+        index = math.floor(self._position) + 1
+        if index >= len(self._records):
+            return {}
+        self._position = index
+        return self._records[index]
+
+    def get_previous(self):
+        index = math.ceil(self._position) - 1
+        if index < 0:
+            return {}
+        self._position = index
+        return self._records[index]
+
+
+class _Matching:
+    def __init__(self, records, ident):
+        self._records = records
+        self._ident = ident
+
+    def _matching(self):
+        return [r for r in self._records
+                if r['SYSLOG_IDENTIFIER'] == self._ident]
+
+    def __len__(self):
+        return len(self._matching())
+
+    def __getitem__(self, index):
+        return self._matching()[index]
+
+    def index_of(self, cursor):
+        return [r['__CURSOR'] for r in self._matching()].index(cursor)
+
+
+@pytest.fixture
+def journal(monkeypatch):
+    """ Records in a fake journal, which log_control reads """
+    records = []
+    fake = types.ModuleType('systemd.journal')
+    fake.SYSTEM_ONLY = 4
+    fake.readers = []
+
+    def reader(flags):
+        fake.readers.append(FakeReader(records, flags))
+        return fake.readers[-1]
+    fake.Reader = reader
+    systemd = types.ModuleType('systemd')
+    systemd.journal = fake
+    monkeypatch.setitem(sys.modules, 'systemd', systemd)
+    monkeypatch.setitem(sys.modules, 'systemd.journal', fake)
+    from opentrons.system import log_control
+    monkeypatch.setattr(log_control, 'journal', fake)
+    monkeypatch.setattr(log_control, 'FOLLOW_WAIT_SECS', 0.01)
+
+    def log(message, ident='opentrons-api'):
+        records.append({'SYSLOG_IDENTIFIER': ident,
+                        'MESSAGE': message,
+                        '__CURSOR': str(len(records))})
+    fake.log = log
+    return fake
+
+
+def _messages(records):
+    return [record['MESSAGE'] for record in records]
+
+
+async def test_get_records_from_tail(journal, loop):
+    from opentrons.system import log_control
+    for index in range(5):
+        journal.log(f'api {index}')
+        journal.log(f'serial {index}', 'opentrons-api-serial')
+
+    records = await log_control.get_records('opentrons-api', 3)
+    assert _messages(records) == ['api 2', 'api 3', 'api 4']
+    records = await log_control.get_records('opentrons-api', 10)
+    assert _messages(records) == [f'api {index}' for index in range(5)]
+    assert not await log_control.get_records('opentrons-api', 0)
+    assert all(reader.closed for reader in journal.readers)
+
+
+async def _next_messages(records, count):
+    return [(await records.__anext__())['MESSAGE'] for _ in range(count)]
+
+
+async def test_follow_records(journal, loop):
+    from opentrons.system import log_control
+    for index in range(3):
+        journal.log(f'old {index}')
+    records = log_control.follow_records('opentrons-api', 2)
+    assert await _next_messages(records, 2) == ['old 1', 'old 2']
+    # Records logged after the tail was read carry on from it
+    journal.log('new 0', 'opentrons-api-serial')
+    journal.log('new 1')
+    journal.log('new 2')
+    assert await _next_messages(records, 2) == ['new 1', 'new 2']
+    await records.aclose()
+
+    # With no earlier records, only new ones are followed
+    records = log_control.follow_records('opentrons-api', 0)
+    following = loop.create_task(_next_messages(records, 1))
+    await asyncio.sleep(0.05)
+    journal.log('newer')
+    assert await following == ['newer']
+    await records.aclose()
+
+
+async def test_follow_closes_reader(journal, loop):
+    from opentrons.system import log_control
+    journal.log('first')
+    records = log_control.follow_records_serializable('opentrons-api', 1)
+    assert (await records.__anext__())['message'] == 'first'
+    await records.aclose()
+    for _ in range(100):
+        if journal.readers[-1].closed:
+            break
+        await asyncio.sleep(0.01)
+    assert journal.readers[-1].closed
+
+
+def test_log_options(journal):
+    from opentrons.server.endpoints import logs
+    assert logs._get_options({}, 10)\
+        == {'format': 'text', 'records': 10, 'follow': False}
+    assert logs._get_options(
+        {'follow': 'true', 'records': '0', 'format': 'json'}, 10)\
+        == {'format': 'json', 'records': 0, 'follow': True}
+    assert logs._get_options({'follow': '1'}, 10)['follow']
+    assert not logs._get_options({'follow': 'no'}, 10)['follow']
+    # Only following may ask for no records
+    assert logs._get_options({'records': '0'}, 10)['records'] == 10
+
+
+async def test_follow_logs_endpoint(journal, loop, aiohttp_client):
+    from opentrons.server.endpoints import logs
+    app = web.Application()
+    app.router.add_get('/logs/{syslog_identifier}', logs.get_logs_by_id)
+    cli = await aiohttp_client(app)
+    journal.log('before')
+
+    resp = await cli.get('/logs/api.log?follow=true&format=json&records=1')
+    assert resp.status == 200
+    assert resp.headers['Content-Type'] == 'application/x-ndjson'
+    assert json.loads(await resp.content.readline())['message'] == 'before'
+    journal.log('after')
+    assert json.loads(await resp.content.readline())['message'] == 'after'
+    resp.close()
@@ -113,3 +113,28 @@ def test_ordered_dict():
                 'i': id(b),
                 't': type_id(b),
                 'v': {'b': 1}}}}
+
+
+def test_repeated_reference(instance):
+    root, a1, *_ = instance
+    pair = [a1, a1]
+    tree, refs = serialize.get_object_tree(pair)
+    assert tree[0]['v']['b'] == 1
+    assert tree[1] == {'i': id(a1), 't': type_id(a1), 'v': None}
+
+
+def test_diff():
+    old = {'i': 1, 't': 2, 'v': {'state': 'running', 'log': [1, 2],
+                                 'gone': None}}
+    new = {'i': 1, 't': 2, 'v': {'state': 'paused', 'log': [1, 2, 3],
+                                 'added': True}}
+    assert serialize.diff(old, old) == []
+    assert serialize.diff(old, new) == [
+        {'op': 'remove', 'path': ['v', 'gone']},
+        {'op': 'replace', 'path': ['v', 'state'], 'value': 'paused'},
+        {'op': 'replace', 'path': ['v', 'log'], 'value': [1, 2, 3]},
+        {'op': 'add', 'path': ['v', 'added'], 'value': True}]
+    assert serialize.diff([1, {'a': 1}], [1, {'a': 2}]) == [
+        {'op': 'replace', 'path': [1, 'a'], 'value': 2}]
+    assert serialize.diff(1, True) == [
+        {'op': 'replace', 'path': [], 'value': True}]
@@ -320,6 +320,49 @@ async def test_notifications(session, root):
         'data': 'Done!'}
 
 
+class StateTicker(TickTock):
+    def start(self):
+        # Keep the notifications alive so each has a distinct id
+        self.sent = [
+            {'topic': 'state', 'payload': {'count': i // 2, 'x': 'y'}}
+            for i in range(3)]
+        for notification in self.sent:
+            self.notifications.put(notification)
+            time.sleep(.1)
+        return "Done!"
+
+
+@pytest.mark.parametrize('root', [StateTicker()])
+async def test_diff_notifications(session, root):
+    await session.socket.receive_json()  # Skip init
+    await session.socket.send_json({'$': {'diff': True}})
+    await session.call(
+        id=id(root),
+        name='start',
+        args=[]
+    )
+    await session.socket.receive_json()  # Skip ack
+
+    # The first notification on a topic is sent whole
+    message = await session.socket.receive_json()
+    assert message['$'] == {'type': rpc.NOTIFICATION_MESSAGE}
+    assert message['data']['v']['payload']['v'] == {'count': 0, 'x': 'y'}
+
+    # Then only the changes are sent, ignoring new ids of the dicts
+    def changes(message):
+        assert message['$'] == {'type': rpc.NOTIFICATION_MESSAGE,
+                                'diff': True}
+        return [op for op in message['data'] if op['path'][-1] != 'i']
+
+    assert changes(await session.socket.receive_json()) == []
+    assert changes(await session.socket.receive_json()) == [
+        {'op': 'replace', 'path': ['v', 'payload', 'v', 'count'],
+         'value': 1}]
+
+    message = await session.socket.receive_json()
+    assert message['data'] == 'Done!'
+
+
 @pytest.mark.api1_only
 @pytest.mark.parametrize('root', [TickTock()])
 async def test_concurrent_calls(session, root):
@@ -436,3 +479,37 @@ def message_key(message):
     meta = message['$']
     data = message.get('data', '')
     return str(meta.get('type')) + meta.get('token', '') + str(data)
+
+
+async def test_client_queue(loop):
+    queue = rpc.ClientQueue(loop=loop, maxsize=4)
+
+    def snapshot(topic):
+        return rpc.Notification({'topic': topic, 'payload': Foo(0)}, None)
+
+    def event(topic):
+        return rpc.Notification({'topic': topic, 'payload': {}}, None)
+
+    first_session = snapshot('session')
+    calibration = snapshot('calibration')
+    light = event('session')
+    last_session = snapshot('session')
+    for message in (first_session, calibration, light, last_session):
+        queue.put(message)
+    # Only the latest snapshot on each topic is kept
+    assert await queue.get_batch() == [calibration, light, last_session]
+
+    # When full, snapshots are dropped, and other messages never are
+    results = [{'result': i} for i in range(3)]
+    queue.put(calibration)
+    queue.put(light)
+    for result in results:
+        queue.put(result)
+    assert len(queue) == 4
+    assert await queue.get_batch(window=0) == [light] + results
+    queue.put(light)
+    for result in results + [{'result': 3}]:
+        queue.put(result)
+    assert len(queue) == 5
+    assert await queue.get_batch(window=0)\
+        == [light] + results + [{'result': 3}]
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+import pytest
+
+import opentrons
+
+
+def test_import_is_lazy():
+    # Importing the package should not load the APIs, the labware database
+    # or the hardware, which take most of the startup time
+    script = '; '.join([
+        'import sys',
+        'import opentrons',
+        'loaded = [name for name in ("opentrons.legacy_api",'
+        ' "opentrons.protocol_api", "opentrons.hardware_control",'
+        ' "opentrons.data_storage") if name in sys.modules]',
+        'assert not loaded, loaded',
+    ])
+    proc = subprocess.run([sys.executable, '-c', script],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert proc.returncode == 0, proc.stderr.decode()
+
+
+def test_globals_built_on_use():
+    for name in ('containers', 'instruments', 'labware', 'robot', 'reset',
+                 'modules', 'hardware'):
+        assert getattr(opentrons, name) is not None
+    with pytest.raises(AttributeError):
+        opentrons.not_a_global
@@ -0,0 +1,79 @@
+import io
+
+import pytest
+
+import opentrons
+from opentrons import simulate
+
+PROTOCOL_V1 = '''
+from opentrons import instruments, labware
+
+tiprack = labware.load('opentrons_96_tiprack_300ul', '1')
+plate = labware.load('corning_96_wellplate_360ul_flat', '2')
+pipette = instruments.P300_Single(mount='right', tip_racks=[tiprack])
+
+pipette.pick_up_tip()
+pipette.aspirate(100, plate.wells('A1'))
+pipette.dispense(100, plate.wells('H12'))
+pipette.delay(seconds=30)
+pipette.drop_tip()
+'''
+
+
+def test_simulate_estimates_duration(virtual_smoothie_env):
+    opentrons.robot.reset()
+    runlog = simulate.simulate(io.StringIO(PROTOCOL_V1))
+    assert all(command['duration'] >= 0 for command in runlog)
+
+    by_name = {command['payload']['text'].split(' ')[0]: command
+               for command in runlog if command['level'] == 0}
+    assert by_name['Delaying']['duration'] == pytest.approx(30)
+    assert by_name['Aspirating']['duration'] > 0
+    assert by_name['Dispensing']['duration'] > 0
+
+    total = simulate.estimate_duration(runlog)
+    assert total == pytest.approx(sum(
+        command['duration'] for command in runlog
+        if command['level'] == 0))
+    assert total > 30
+
+
+def test_format_duration():
+    assert simulate._format_duration(0) == '0:00:00'
+    assert simulate._format_duration(3725.4) == '1:02:05'
+
+
+def test_simulate_batch(virtual_smoothie_env, tmpdir):
+    good = tmpdir.join('good.py')
+    good.write(PROTOCOL_V1)
+    bad = tmpdir.join('bad.py')
+    bad.write(PROTOCOL_V1.replace("plate.wells('H12')",
+                                  "plate.wells('Z99')"))
+
+    results = list(simulate.simulate_batch(
+        [str(good), str(bad), str(good)], workers=2))
+    assert [result.path for result in results]\
+        == [str(good), str(bad), str(good)]
+
+    assert results[0].error is None
+    assert [command['text'] for command in results[0].runlog]\
+        == [command['text'] for command in results[2].runlog]
+    assert results[0].estimated_duration\
+        == pytest.approx(results[2].estimated_duration)
+    assert results[0].runlog[1]['text'].startswith('Aspirating 100')
+    assert results[0].estimated_duration > 30
+    assert results[0].simulation_time > 0
+
+    assert 'ValueError' in results[1].error
+    # The commands before the error are kept
+    assert [command['text'].split(' ')[0]
+            for command in results[1].runlog] == ['Picking', 'Aspirating']
+
+
+def test_batch_rejects_stdin(monkeypatch, capsys):
+    monkeypatch.setattr(
+        'sys.argv', ['opentrons_simulate', 'protocol.py', '-'])
+    with pytest.raises(SystemExit) as exc:
+        simulate.main()
+    assert exc.value.code == 2
+    assert 'stdin' in capsys.readouterr().err
@@ -150,3 +150,28 @@ def test_change_base():
         .add('1-1', parent='1', point=Point(1, 0, 0))
 
     assert isclose(change_base(state, src='1-1'), (0.5, 0, 0)).all()
+
+
+def test_cached_transforms_follow_updates(state):
+    # Positions are cached, and must change with any ancestor
+    assert (change_base(state, src='1-1-1') == (12, 14, 16)).all()
+    assert max_z(state, ROOT) == 26.0
+    state = update(state, '1', Point(2, 2, 2))
+    assert (change_base(state, src='1-1-1') == (13, 14, 15)).all()
+    assert max_z(state, ROOT) == 25.0
+    relative = change_base(state, src='1-1-1', dst='2-1')
+    assert (relative == (25., 28., 31.)).all()
+
+    # Removed nodes can be added again, as can new nodes in their place
+    state = remove(state, '1-1')
+    state = add(state, '1-3', parent='1', point=Point(1, 1, 1))
+    assert descendants(state, '1') == [('1-2', 0), ('1-3', 0)]
+    assert (change_base(state, src='1-3') == (3, 3, 3)).all()
+
+
+def test_copy(state):
+    copied = state.copy()
+    state = update(state, '1', Point(2, 2, 2))
+    assert (change_base(copied, src='1-1') == (12, 14, 16)).all()
+    assert (change_base(state, src='1-1') == (13, 14, 15)).all()
+    assert copied != state
@@ -3,7 +3,8 @@
 
 This module has functions that actually accomplish the various tasks required
 for an update: unzipping update files, hashing rootfs, checking signatures,
-writing to root partitions
+writing to root partitions. :py:class:`UpdateStream` does all of these in
+one pass, while the update file is being received.
 """
 import binascii
 import contextlib
@@ -12,17 +13,22 @@ import hashlib
 import logging
 import os
 import re
+import struct
 import subprocess
 import tempfile
 from typing import (Callable, Dict, List, Mapping, NamedTuple,
                     Optional, Sequence, Tuple)
 import zipfile
+import zlib
 
 
 ROOTFS_SIG_NAME = 'rootfs.ext4.hash.sig'
 ROOTFS_HASH_NAME = 'rootfs.ext4.hash'
 ROOTFS_NAME = 'rootfs.ext4'
 UPDATE_FILES = [ROOTFS_NAME, ROOTFS_SIG_NAME, ROOTFS_HASH_NAME]
+#: The size of the writes to the root partition from :py:class:`UpdateStream`.
+#: A multiple of the SD card's erase block size.
+WRITE_BLOCK_SIZE = 4 * 1024 * 1024
 LOG = logging.getLogger(__name__)
 
 
@@ -355,6 +361,313 @@ def write_update(rootfs_filepath: str,
     return unused
 
 
+class _BlockWriter:
+    """ Writes to a file in blocks of a fixed size (except for the last) """
+    def __init__(self, path: str, block_size: int) -> None:
+        self._file = open(path, 'wb', buffering=0)
+        self._block = bytearray(block_size)
+        self._view = memoryview(self._block)
+        self._filled = 0
+
+    def write(self, data: bytes):
+        data_view = memoryview(data)
+        while data_view:
+            count = min(len(data_view), len(self._block) - self._filled)
+            self._view[self._filled:self._filled + count]\
+                = data_view[:count]
+            self._filled += count
+            data_view = data_view[count:]
+            if self._filled == len(self._block):
+                self._file.write(self._block)
+                self._filled = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            if self._filled:
+                self._file.write(self._block[:self._filled])
+                self._filled = 0
+            os.fsync(self._file.fileno())
+        finally:
+            self._file.close()
+
+
+class _Entry:
+    """ The member of the update zip being streamed """
+    def __init__(self, name: str, method: int, flags: int, crc: int,
+                 compressed_size: int, zip64: bool) -> None:
+        self.name = name
+        self.method = method
+        self.has_descriptor = bool(flags & 0x08)
+        self.crc = crc
+        #: The compressed bytes left to read, or ``None`` once the data has
+        #: been read and only the data descriptor is left
+        self.remaining: Optional[int] = compressed_size
+        self.zip64 = zip64
+        self.decompressor = zlib.decompressobj(-zlib.MAX_WBITS)\
+            if method == zipfile.ZIP_DEFLATED else None
+        self.running_crc = 0
+        self.size = 0
+
+
+class UpdateStream:
+    """ Unzip, hash and write an update in one pass as it is received.
+
+    The update zip is fed in with :py:meth:`feed` in the order it is
+    received. The members are read from their local headers as they arrive
+    (rather than from the central directory at the end of the zip), so that
+    ``rootfs.ext4`` can be decompressed, hashed and written to the unused
+    root partition without saving the zip or the rootfs anywhere else. The
+    hash and signature files are small, and are kept in memory.
+
+    Once the whole file has been fed in, :py:meth:`finish` checks that the
+    rootfs matches the packaged hash and, if required, that the hash is
+    signed. The new partition must not be committed unless it succeeds.
+
+    Errors in the zip are not raised from :py:meth:`feed`, which discards
+    any data after an error; they are raised from :py:meth:`finish`, so that
+    they are reported in the same way as the validation errors.
+
+    This is blocking, and should be used from an executor. It is not safe to
+    use from more than one thread at once.
+    """
+    _LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+    _LOCAL_HEADER_SIG = b'PK\x03\x04'
+    _DESCRIPTOR_SIG = b'PK\x07\x08'
+    _ZIP64_EXTRA_ID = 0x0001
+    _MAX_32 = 0xffffffff
+
+    def __init__(self, block_size: int = WRITE_BLOCK_SIZE,
+                 hash_algo: str = 'sha256') -> None:
+        """
+        :param block_size: The size of the writes to the root partition, and
+                           the most data decompressed in one go
+        :param hash_algo: The algorithm used to make the packaged hash. Can
+                          be anything used by :py:mod:`hashlib`
+        """
+        self._block_size = block_size
+        self._pending = bytearray()
+        self._entry: Optional[_Entry] = None
+        self._ended = False
+        self._error: Optional[Exception] = None
+        self._hasher = hashlib.new(hash_algo)
+        self._writer: Optional[_BlockWriter] = None
+        self._partition: Optional[RootPartitions] = None
+        self._contents: Dict[str, bytearray] = {}
+        self._complete: List[str] = []
+
+    def feed(self, data: bytes):
+        """ Process the next part of the update zip """
+        if self._error or self._ended:
+            return
+        self._pending += data
+        try:
+            self._process()
+        except Exception as e:
+            LOG.exception('Update stream: failed')
+            self._error = e
+            self._pending = bytearray()
+            self.close()
+
+    def close(self):
+        """ Flush and close the root partition, if it has been opened.
+
+        Called by :py:meth:`finish`; should be called if the stream is
+        abandoned before then.
+        """
+        if self._writer:
+            writer, self._writer = self._writer, None
+            writer.close()
+
+    def finish(self, cert_path: Optional[str]) -> RootPartitions:
+        """ Check the update once it has all been fed in.
+
+        :param cert_path: Path to an x.509 certificate to check the signature
+                          against. If ``None``, signature checking is
+                          disabled
+        :returns: The root partition that the rootfs was written to
+        :raises FileMissing: If a required file was not in the zip
+        :raises HashMismatch: If the rootfs does not match the packaged hash
+        :raises SignatureMismatch: If the signature does not verify
+        """
+        self.close()
+        if self._error:
+            raise self._error
+        if self._entry:
+            raise zipfile.BadZipFile(
+                f'Update file ended in the middle of {self._entry.name}')
+        required = [ROOTFS_NAME, ROOTFS_HASH_NAME]
+        if cert_path:
+            required.append(ROOTFS_SIG_NAME)
+        for name in required:
+            if name not in self._complete:
+                raise FileMissing(f'File {name} missing from zip')
+        assert self._partition
+
+        rootfs_hash = binascii.hexlify(self._hasher.digest())
+        packaged_hash = bytes(self._contents[ROOTFS_HASH_NAME]).strip()
+        if packaged_hash != rootfs_hash:
+            msg = f"Hash mismatch: calculated {rootfs_hash} != "\
+                f"packaged {packaged_hash}"
+            LOG.error(msg)
+            raise HashMismatch(msg)
+
+        if cert_path:
+            with tempfile.TemporaryDirectory() as check_dir:
+                paths = {}
+                for name in (ROOTFS_HASH_NAME, ROOTFS_SIG_NAME):
+                    paths[name] = os.path.join(check_dir, name)
+                    with open(paths[name], 'wb') as f:
+                        f.write(self._contents[name])
+                verify_signature(paths[ROOTFS_HASH_NAME],
+                                 paths[ROOTFS_SIG_NAME],
+                                 cert_path)
+        return self._partition
+
+    def _process(self):
+        while not self._ended:
+            if not self._entry:
+                if not self._read_header():
+                    return
+            elif self._entry.remaining is None:
+                if not self._read_descriptor():
+                    return
+            elif not self._read_data():
+                return
+
+    def _read_header(self) -> bool:
+        pending = self._pending
+        if len(pending) < 4:
+            return False
+        if pending[:4] != self._LOCAL_HEADER_SIG:
+            # The central directory: the members have all been read
+            self._ended = True
+            self._pending = bytearray()
+            return False
+        if len(pending) < self._LOCAL_HEADER.size:
+            return False
+        (_, _, flags, method, _, _, crc, compressed_size, _,
+         name_len, extra_len) = self._LOCAL_HEADER.unpack_from(pending)
+        header_len = self._LOCAL_HEADER.size + name_len + extra_len
+        if len(pending) < header_len:
+            return False
+        name_end = self._LOCAL_HEADER.size + name_len
+        name = bytes(pending[self._LOCAL_HEADER.size:name_end])\
+            .decode('utf-8' if flags & 0x800 else 'cp437')
+        extra = bytes(pending[name_end:header_len])
+        del pending[:header_len]
+
+        zip64, compressed_size = self._read_zip64_extra(extra,
+                                                        compressed_size)
+        if flags & 0x01:
+            raise zipfile.BadZipFile(f'{name} is encrypted')
+        if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise zipfile.BadZipFile(
+                f'{name} uses unsupported compression {method}')
+        entry = _Entry(name, method, flags, crc, compressed_size, zip64)
+        if entry.has_descriptor and not entry.decompressor:
+            raise zipfile.BadZipFile(
+                f'{name} is stored with no size and cannot be streamed')
+        self._start_entry(entry)
+        return True
+
+    def _start_entry(self, entry: _Entry):
+        name = entry.name
+        if name in self._complete:
+            raise zipfile.BadZipFile(f'{name} is in the update twice')
+        LOG.debug(f'Update stream: found {name}')
+        if name == ROOTFS_NAME:
+            self._partition = _find_unused_partition()
+            part_path = self._partition.value.path
+            LOG.info(f'Update stream: writing {name} to {part_path}')
+            self._writer = _BlockWriter(part_path, self._block_size)
+        elif name in UPDATE_FILES:
+            self._contents[name] = bytearray()
+        else:
+            LOG.debug(f'Update stream: ignoring {name}')
+        self._entry = entry
+
+    @classmethod
+    def _read_zip64_extra(cls, extra: bytes,
+                          compressed_size: int) -> Tuple[bool, int]:
+        """ Find whether an entry is zip64, and its compressed size if so """
+        zip64 = False
+        while len(extra) >= 4:
+            extra_id, size = struct.unpack_from('<HH', extra)
+            if extra_id == cls._ZIP64_EXTRA_ID:
+                zip64 = True
+                if compressed_size == cls._MAX_32 and size >= 16:
+                    compressed_size = struct.unpack_from('<Q', extra, 12)[0]
+            extra = extra[4 + size:]
+        return zip64, compressed_size
+
+    def _read_data(self) -> bool:
+        entry = self._entry
+        assert entry
+        if not entry.decompressor:
+            remaining = entry.remaining
+            assert remaining is not None
+            data = bytes(self._pending[:remaining])
+            del self._pending[:len(data)]
+            entry.remaining = remaining - len(data)
+            self._output(data)
+            if entry.remaining:
+                return False
+        else:
+            data = bytes(self._pending)
+            self._pending = bytearray()
+            decompressor = entry.decompressor
+            while data and not decompressor.eof:
+                self._output(decompressor.decompress(data, self._block_size))
+                data = decompressor.unconsumed_tail
+            if not decompressor.eof:
+                return False
+            self._pending = bytearray(decompressor.unused_data)
+        if entry.has_descriptor:
+            entry.remaining = None
+            return True
+        self._end_entry()
+        return True
+
+    def _read_descriptor(self) -> bool:
+        entry = self._entry
+        assert entry
+        if len(self._pending) < 4:
+            return False
+        # The descriptor's signature is optional
+        crc_at = 4 if self._pending[:4] == self._DESCRIPTOR_SIG else 0
+        size = crc_at + (20 if entry.zip64 else 12)
+        if len(self._pending) < size:
+            return False
+        entry.crc = struct.unpack_from('<I', self._pending, crc_at)[0]
+        del self._pending[:size]
+        self._end_entry()
+        return True
+
+    def _output(self, data: bytes):
+        entry = self._entry
+        assert entry
+        entry.running_crc = zlib.crc32(data, entry.running_crc)
+        entry.size += len(data)
+        if entry.name == ROOTFS_NAME:
+            self._hasher.update(data)
+            self._writer.write(data)  # type: ignore
+        elif entry.name in self._contents:
+            self._contents[entry.name] += data
+
+    def _end_entry(self):
+        entry = self._entry
+        if entry.running_crc != entry.crc:
+            raise zipfile.BadZipFile(f'Bad CRC-32 for {entry.name}')
+        if entry.name == ROOTFS_NAME:
+            self.close()
+        if entry.name in UPDATE_FILES:
+            self._complete.append(entry.name)
+        LOG.info(f'Update stream: read {entry.name} ({entry.size}B)')
+        self._entry = None
+
+
 def _mountpoint_root():
     """ provides mountpoint location for :py:meth:`mount_update`.
 
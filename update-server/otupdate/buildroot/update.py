@@ -7,10 +7,9 @@ This has endpoints like update session management, validation, and execution
 import asyncio
 import functools
 import logging
-import os
 from subprocess import CalledProcessError
 
-from typing import Optional
+from typing import Callable, Optional
 
 
 from aiohttp import web, BodyPartReader
@@ -20,6 +19,8 @@ from . import config, file_actions
 from .update_session import UpdateSession, Stages
 
 SESSION_VARNAME = APP_VARIABLE_PREFIX + 'session'
+#: The most data read from an upload at once
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 LOG = logging.getLogger(__name__)
 
 
@@ -76,50 +77,47 @@ async def status(request: web.Request, session: UpdateSession) -> web.Response:
         status=200)
 
 
-async def _save_file(part: BodyPartReader, path: str):
-    with open(os.path.join(path, part.name), 'wb') as write:
-        while not part.at_eof():
-            chunk = await part.read_chunk()
-            decoded = part.decode(chunk)
-            write.write(decoded)
-
-
-def _begin_write(session: UpdateSession,
-                 loop: asyncio.AbstractEventLoop,
-                 rootfs_file_path: str):
-    """ Start the write process. """
-    session.set_progress(0)
-    session.set_stage(Stages.WRITING)
-    write_future = asyncio.ensure_future(loop.run_in_executor(
-        None, file_actions.write_update, rootfs_file_path,
-        session.set_progress))
-
-    def write_done(fut):
-        exc = fut.exception()
-        if exc:
-            session.set_error(getattr(exc, 'short', str(type(exc))),
-                              str(exc))
-        else:
-            session.set_stage(Stages.DONE)
+async def _stream_file(part: BodyPartReader,
+                       stream: file_actions.UpdateStream,
+                       loop: asyncio.AbstractEventLoop,
+                       progress_callback: Callable[[int], None]):
+    """ Feed an uploaded update file into an update stream.
 
-    write_future.add_done_callback(write_done)
-
-
-def _begin_validation(
+    Each chunk is fed in an executor while the next one is received.
+    """
+    feeding: Optional[asyncio.Future] = None
+    received = 0
+    try:
+        while not part.at_eof():
+            chunk = part.decode(await part.read_chunk(UPLOAD_CHUNK_SIZE))
+            received += len(chunk)
+            if feeding:
+                await feeding
+            feeding = asyncio.ensure_future(
+                loop.run_in_executor(None, stream.feed, chunk))
+            progress_callback(received)
+        if feeding:
+            await feeding
+    except BaseException:
+        if feeding:
+            await asyncio.wait([feeding])
+        raise
+
+
+def _begin_stream_validation(
         session: UpdateSession,
         config: config.Config,
         loop: asyncio.AbstractEventLoop,
-        downloaded_update_path: str)\
+        stream: file_actions.UpdateStream)\
         -> asyncio.futures.Future:
-    """ Start the validation process. """
+    """ Start checking an update that has been written by a stream. """
+    session.set_progress(0)
     session.set_stage(Stages.VALIDATING)
     cert_path = config.update_cert_path\
         if config.signature_required else None
 
-    validation_future \
-        = asyncio.ensure_future(loop.run_in_executor(
-            None, file_actions.validate_update,
-            downloaded_update_path, session.set_progress, cert_path))
+    validation_future = asyncio.ensure_future(loop.run_in_executor(
+        None, stream.finish, cert_path))
 
     def validation_done(fut):
         exc = fut.exception()
@@ -127,11 +125,8 @@ def _begin_validation(
             session.set_error(getattr(exc, 'short', str(type(exc))),
                               str(exc))
         else:
-            rootfs_file = fut.result()
-            loop.call_soon_threadsafe(_begin_write,
-                                      session,
-                                      loop,
-                                      rootfs_file)
+            session.set_progress(1)
+            session.set_stage(Stages.DONE)
     validation_future.add_done_callback(validation_done)
     return validation_future
 
@@ -143,26 +138,48 @@ async def file_upload(
 
     Requires multipart (encoding doesn't matter) with a file field in the
     body called 'ot2-system.zip'.
+
+    The update is unzipped, hashed and written to the unused partition as it
+    is received (the session is in the writing stage meanwhile), and checked
+    against its hash and signature once it has all arrived.
     """
     if session.stage != Stages.AWAITING_FILE:
         return web.json_response(
             data={'error': 'file-already-uploaded',
                   'message': 'A file has already been sent for this update'},
             status=409)
-    reader = await request.multipart()
-    async for part in reader:
-        if part.name != 'ot2-system.zip':
-            LOG.warning(
-                f"Unknown field name {part.name} in file_upload, ignoring")
-            await part.release()
-        else:
-            await _save_file(part, session.download_path)
+    loop = asyncio.get_event_loop()
+    stream = file_actions.UpdateStream()
+    total = request.content_length
+
+    def upload_progress(received: int):
+        if total:
+            session.set_progress(min(received / total, 1.0))
 
-    _begin_validation(
+    session.set_progress(0)
+    session.set_stage(Stages.WRITING)
+    try:
+        reader = await request.multipart()
+        async for part in reader:
+            if part.name != 'ot2-system.zip':
+                LOG.warning(
+                    f"Unknown field name {part.name} in file_upload, "
+                    "ignoring")
+                await part.release()
+            else:
+                await _stream_file(part, stream, loop, upload_progress)
+    except BaseException:
+        # Nothing is committed until the stream is finished, so the file
+        # can be sent again
+        stream.close()
+        session.set_stage(Stages.AWAITING_FILE)
+        raise
+
+    _begin_stream_validation(
         session,
         config.config_from_request(request),
-        asyncio.get_event_loop(),
-        os.path.join(session.download_path, 'ot2-system.zip'))
+        loop,
+        stream)
 
     return web.json_response(data=session.state,
                              status=201)
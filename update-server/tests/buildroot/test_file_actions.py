@@ -4,6 +4,7 @@ Checks functionality and error cases for the update utility functions there
 """
 import binascii
 import hashlib
+import io
 import os
 import subprocess
 from unittest import mock
@@ -200,6 +201,88 @@ def test_write_update(extracted_update_file, testing_partition):
             'rb').read().strip()
 
 
+def _stream_update(zip_contents, chunk_size=1000):
+    stream = file_actions.UpdateStream(block_size=4096)
+    for offset in range(0, len(zip_contents), chunk_size):
+        stream.feed(zip_contents[offset:offset + chunk_size])
+    return stream
+
+
+def _repack(zip_path, compression, seekable):
+    """ Repack an update zip, writing data descriptors if not seekable """
+    class Unseekable:
+        def __init__(self):
+            self.contents = io.BytesIO()
+
+        def write(self, data):
+            return self.contents.write(data)
+
+        def flush(self):
+            pass
+
+    out = io.BytesIO() if seekable else Unseekable()
+    with zipfile.ZipFile(zip_path) as zf_in, \
+            zipfile.ZipFile(out, 'w', compression) as zf_out:
+        for info in zf_in.infolist():
+            zf_out.writestr(info.filename, zf_in.read(info))
+    return out.getvalue() if seekable else out.contents.getvalue()
+
+
+@pytest.mark.parametrize('compression,seekable', [
+    (zipfile.ZIP_STORED, True),
+    (zipfile.ZIP_DEFLATED, True),
+    (zipfile.ZIP_DEFLATED, False)])
+def test_update_stream(downloaded_update_file, testing_partition,
+                       testing_cert, compression, seekable):
+    zip_contents = _repack(downloaded_update_file, compression, seekable)
+    stream = _stream_update(zip_contents)
+    assert stream.finish(testing_cert).value.path == testing_partition
+
+    with zipfile.ZipFile(downloaded_update_file) as zf:
+        assert open(testing_partition, 'rb').read()\
+            == zf.read(file_actions.ROOTFS_NAME)
+
+
+@pytest.mark.bad_hash
+def test_update_stream_catches_bad_hash(downloaded_update_file,
+                                        testing_partition):
+    stream = _stream_update(open(downloaded_update_file, 'rb').read())
+    with pytest.raises(file_actions.HashMismatch):
+        stream.finish(None)
+
+
+@pytest.mark.bad_sig
+def test_update_stream_catches_bad_sig(downloaded_update_file,
+                                       testing_partition, testing_cert):
+    stream = _stream_update(open(downloaded_update_file, 'rb').read())
+    with pytest.raises(file_actions.SignatureMismatch):
+        stream.finish(testing_cert)
+
+
+@pytest.mark.exclude_rootfs_ext4_hash_sig
+def test_update_stream_catches_missing_sig(downloaded_update_file,
+                                           testing_partition, testing_cert):
+    zip_contents = open(downloaded_update_file, 'rb').read()
+    assert _stream_update(zip_contents).finish(None)
+    with pytest.raises(file_actions.FileMissing):
+        _stream_update(zip_contents).finish(testing_cert)
+
+
+def test_update_stream_catches_bad_zip(downloaded_update_file,
+                                       testing_partition):
+    zip_contents = open(downloaded_update_file, 'rb').read()
+    # Truncated in the middle of the rootfs
+    stream = _stream_update(zip_contents[:len(zip_contents)//2])
+    with pytest.raises(zipfile.BadZipFile):
+        stream.finish(None)
+    # Corrupted rootfs
+    corrupt = bytearray(zip_contents)
+    corrupt[1000] ^= 0xff
+    stream = _stream_update(bytes(corrupt))
+    with pytest.raises(zipfile.BadZipFile):
+        stream.finish(None)
+
+
 def test_commit_update(monkeypatch):
     unused = file_actions.RootPartitions.TWO
     new = file_actions.RootPartitions.TWO
@@ -1,6 +1,5 @@
 """ Tests for the update server state machine in otupdate.buildroot.update
 """
-import asyncio
 import binascii
 import hashlib
 import zipfile
@@ -60,42 +59,34 @@ async def test_commit_fails_wrong_state(test_cli, update_session):
     assert resp.status == 409
 
 
+def _streamed_update(update_file):
+    stream = file_actions.UpdateStream()
+    with open(update_file, 'rb') as f:
+        stream.feed(f.read())
+    return stream
+
+
 async def test_future_chain(otupdate_config, downloaded_update_file,
                             loop, testing_partition):
     conf = config.load_from_path(otupdate_config)
     session = UpdateSession(conf.download_storage_path)
-    fut = update._begin_validation(session,
-                                   conf,
-                                   loop,
-                                   downloaded_update_file)
+    fut = update._begin_stream_validation(
+        session, conf, loop, _streamed_update(downloaded_update_file))
     assert session.stage == Stages.VALIDATING
-    last_progress = 0.0
-    while session.stage == Stages.VALIDATING:
-        assert session.state['progress'] >= last_progress
-        assert session.state['stage'] == 'validating'
-        assert session.stage == Stages.VALIDATING
-        last_progress = session.state['progress']
-        await asyncio.sleep(0.01)
-    assert fut.done()
-    last_progress = 0.0
-    while session.stage == Stages.WRITING:
-        assert session.state['progress'] >= last_progress
-        last_progress = session.state['progress']
-        await asyncio.sleep(0.1)
+    assert session.state['stage'] == 'validating'
+    await fut
     assert session.stage == Stages.DONE, session.error
+    assert session.state['progress'] == 1
 
 
 @pytest.mark.exclude_rootfs_ext4
 async def test_session_catches_validation_fail(otupdate_config,
                                                downloaded_update_file,
-                                               loop):
+                                               loop, testing_partition):
     conf = config.load_from_path(otupdate_config)
     session = UpdateSession(conf.download_storage_path)
-    fut = update._begin_validation(
-        session,
-        conf,
-        loop,
-        downloaded_update_file)
+    fut = update._begin_stream_validation(
+        session, conf, loop, _streamed_update(downloaded_update_file))
     with pytest.raises(file_actions.FileMissing):
         await fut
     assert session.state['stage'] == 'error'